@@ -0,0 +1,53 @@
+"""
+Benchmark for core.backtest (no network).
+
+    python benchmarks/bench_backtest.py
+
+Writes 10 years of synthetic daily bars for 500 symbols into a throwaway bar
+store and times full backtests (load, every indicator on every bar, signals,
+positions, equity, fills and stats) for a few of the preset rules.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import backtest  # noqa: E402
+from core.bars import BarStore  # noqa: E402
+
+SYMBOLS = 500
+DAYS = backtest.PERIODS["10Y"] + backtest.WARMUP
+REPEAT = 3
+
+
+def write_bars(root, n, days=DAYS, seed=11):
+    rng = np.random.default_rng(seed)
+    ts = 1.2e9 + 86400 * np.arange(days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, size=(days, n)), axis=0))
+    opens = closes * np.exp(rng.normal(0, 0.005, size=(days, n)))
+    os.makedirs(os.path.join(root, "1d"), exist_ok=True)
+    symbols = [f"S{i:04d}" for i in range(n)]
+    for j, sym in enumerate(symbols):
+        c, o = closes[:, j], opens[:, j]
+        start = rng.integers(0, days // 2) if j % 10 == 0 else 0   # every 10th name lists mid-window
+        rows = np.column_stack([ts, o, np.maximum(o, c) * 1.01, np.minimum(o, c) * 0.99, c, np.full(days, 1e6)])[start:]
+        rows.astype("<f8").tofile(os.path.join(root, "1d", f"{sym}.f64"))
+    return symbols
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root:
+        symbols = write_bars(root, SYMBOLS)
+        store = BarStore(root)
+        for name in ("RSI 30/70 REVERSION", "MACD CROSS", "RSI DIP IN UPTREND"):
+            entry, exit = backtest.RULES[name]
+            times = []
+            for _ in range(REPEAT):
+                t = time.perf_counter()
+                res = backtest.run(entry, exit, symbols, store=store)
+                times.append(time.perf_counter() - t)
+            print(f"{name:<22} {SYMBOLS} symbols x {backtest.PERIODS['10Y']} days: {min(times):6.2f} s "
+                  f"({len(res.fills):,} fills, CAGR {res.stats['CAGR']:+.1%})")
@@ -0,0 +1,65 @@
+"""
+Benchmark for core.greeks (no network).
+
+    python benchmarks/bench_greeks.py
+
+Builds a synthetic SPY-sized chain (~10k contracts over 30 expiries) with a
+skewed vol surface, prices it with Black-Scholes, then times the full
+pipeline the page runs: IV solve from those prices, greeks, GEX by strike,
+and the zero-gamma flip search. Also reports the worst IV recovery error.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import greeks  # noqa: E402
+
+SPOT = 580.0
+EXPIRIES = 30
+STRIKES = 170
+REPEAT = 5
+
+
+def synthetic_chain(seed=5):
+    rng = np.random.default_rng(seed)
+    T = np.repeat(np.geomspace(2 / 365, 2.0, EXPIRIES), 2 * STRIKES)
+    K = np.tile(np.repeat(SPOT * np.linspace(0.6, 1.4, STRIKES), 2), EXPIRIES)
+    is_call = np.tile([True, False], EXPIRIES * STRIKES)
+    m = np.log(K / SPOT)
+    iv = 0.16 - 0.25 * m + 0.6 * m * m + 0.03 / np.sqrt(T * 12)
+    mid = greeks.price(SPOT, K, T, iv, is_call)
+    return pd.DataFrame({"strike": K, "tenor": T, "type": np.where(is_call, "CALL", "PUT"), "mid": mid,
+                         "openInterest": rng.integers(0, 50_000, len(K)), "true_iv": iv})
+
+
+def best(fn):
+    times = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t)
+    return min(times), out
+
+
+if __name__ == "__main__":
+    f = synthetic_chain()
+    K, T = f["strike"].to_numpy(), f["tenor"].to_numpy()
+    is_call = (f["type"] == "CALL").to_numpy()
+
+    t_iv, iv = best(lambda: greeks.implied_vol(f["mid"].to_numpy(), SPOT, K, T, is_call))
+    t_g, g = best(lambda: greeks.greeks(SPOT, K, T, iv, is_call))
+    priced = f.assign(iv=iv, **g)
+    t_gex, _ = best(lambda: greeks.gamma_exposure(priced, SPOT))
+    t_flip, (flip, _, _) = best(lambda: greeks.zero_gamma(priced, SPOT))
+    # A market shows time value to one tick at best; deep-ITM intrinsic is no IV information
+    otm_twin = greeks.price(SPOT, K, T, f["true_iv"].to_numpy(), K >= SPOT)
+    quoted = otm_twin >= 0.01
+    solved = np.isfinite(iv) & quoted
+    err = np.abs(iv[solved] - f["true_iv"].to_numpy()[solved]).max()
+    print(f"{len(f):,} contracts: IV {t_iv * 1e3:.1f} ms ({solved.sum() / quoted.sum():.1%} of quotable solved, "
+          f"max err {err:.1e}), "
+          f"greeks {t_g * 1e3:.1f} ms, GEX {t_gex * 1e3:.1f} ms, zero-gamma {t_flip * 1e3:.1f} ms (flip {flip})")
@@ -0,0 +1,34 @@
+"""
+Micro-benchmark for core.momentum.rank (compute only, no network).
+
+    python benchmarks/bench_momentum.py
+
+Synthetic 5-day close matrices at the S&P 500 size and a 3,000-name universe,
+with a sprinkling of NaNs to exercise the forward-fill path.
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import momentum  # noqa: E402
+
+DAYS = 5
+REPEAT = 50
+
+
+def make_closes(n, days=DAYS, seed=7):
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0, 0.02, size=(n, days))
+    closes = 100 * np.cumprod(1 + rets, axis=1)
+    closes[rng.random(closes.shape) < 0.01] = np.nan
+    return [f"S{i:05d}" for i in range(n)], closes
+
+
+if __name__ == "__main__":
+    for n in (500, 3000):
+        symbols, closes = make_closes(n)
+        t = timeit.timeit(lambda: momentum.rank(symbols, closes, k=10), number=REPEAT) / REPEAT
+        print(f"{n:>5} symbols x {DAYS} days: {t * 1e3:7.3f} ms / refresh")
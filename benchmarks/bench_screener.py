@@ -0,0 +1,59 @@
+"""
+Benchmark for core.screener (no network).
+
+    python benchmarks/bench_screener.py
+
+Writes synthetic daily bars for 1,000 and 5,000 symbols into a throwaway bar
+store (same on-disk layout BarStore uses), then times a full screen: stacking
+the cached bars into matrices, computing every indicator, evaluating the
+condition and ranking the hits. The compute-only time is reported separately.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import screener  # noqa: E402
+from core.bars import BarStore  # noqa: E402
+
+DAYS = 400
+REPEAT = 5
+CONDITION = "RSI < 30 and MACD_BULL_CROSS or CLOSE > SMA200 and GOLDEN_CROSS"
+
+
+def write_bars(root, n, days=DAYS, seed=7):
+    rng = np.random.default_rng(seed)
+    ts = 1.6e9 + 86400 * np.arange(days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(days, n)), axis=0))
+    os.makedirs(os.path.join(root, "1d"), exist_ok=True)
+    symbols = [f"S{i:05d}" for i in range(n)]
+    for j, sym in enumerate(symbols):
+        c = closes[:, j]
+        rows = np.column_stack([ts, c, c * 1.01, c * 0.99, c, np.full(days, 1e6)])
+        rows.astype("<f8").tofile(os.path.join(root, "1d", f"{sym}.f64"))
+    return symbols
+
+
+def best(fn):
+    times = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    for n in (1000, 5000):
+        with tempfile.TemporaryDirectory() as root:
+            symbols = write_bars(root, n)
+            store = BarStore(root)
+            screener.screen(CONDITION, symbols, store=store)   # first touch maps the files
+            total = best(lambda: screener.screen(CONDITION, symbols, store=store))
+            names, m = screener.load_matrices(symbols, store=store)
+            compute = best(lambda: screener.screen_matrices(CONDITION, names, m))
+            print(f"{n:>5} symbols x {screener.DEPTH} days: {total * 1e3:7.1f} ms / screen "
+                  f"({compute * 1e3:6.1f} ms compute)")
@@ -0,0 +1,26 @@
+"""
+YN CORE // shared data + compute engines for the terminal pages.
+
+Everything in here is process-wide: Streamlit imports these modules once per
+server process, so module-level state survives reruns and is shared by every
+session and page.
+"""
+import os
+
+CACHE_DIR = os.environ.get(
+    "YN_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".yn_cache"),
+)
+
+
+_made = set()   # parent folders already created this process
+
+
+def cache_path(*parts):
+    """Path under the local cache dir, creating the parent folder on demand."""
+    path = os.path.join(CACHE_DIR, *parts)
+    parent = os.path.dirname(path)
+    if parent not in _made:
+        os.makedirs(parent, exist_ok=True)
+        _made.add(parent)
+    return path
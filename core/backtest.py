@@ -0,0 +1,243 @@
+"""
+BACKTEST // replay cached daily bars through Trading_Simulator's accounting.
+
+Each symbol is a sleeve with an equal share of the starting cash. A rule is
+a pair of screener conditions (entry, exit) evaluated on every bar at once:
+
+    entry  RSI < 30 and CLOSE > SMA200
+    exit   RSI > 55
+
+A signal on bar t's close fills at bar t+1's open (no look-ahead). Fills are
+all-in / all-out market orders, so a sleeve's average cost is its entry fill
+and realized P&L is (exit - avg_price) * qty, minus `cost_bps` commission on
+each side, the same bookkeeping the live desk's ledger does per trade.
+
+Everything is a (days, symbols) matrix: the in-position mask comes from a
+forward-filled entry/exit state, per-bar sleeve returns from that mask, and
+equity from one cumulative product. Only the indicator recursions loop over
+time (vectorized over symbols); nothing loops over symbols or trades.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core import bars, indicators, screener, workers
+
+RULES = {
+    "RSI 30/70 REVERSION": ("RSI < 30", "RSI > 70"),
+    "RSI DIP IN UPTREND": ("RSI < 35 and CLOSE > SMA200", "RSI > 55 or CLOSE < SMA200"),
+    "MACD CROSS": ("MACD_BULL_CROSS", "MACD_BEAR_CROSS"),
+    "MACD CROSS ABOVE SMA200": ("MACD_BULL_CROSS and CLOSE > SMA200", "MACD_BEAR_CROSS"),
+    "GOLDEN / DEATH CROSS": ("GOLDEN_CROSS", "DEATH_CROSS"),
+    "BOLLINGER REVERSION": ("CLOSE < BB_LOWER", "CLOSE > BB_MID"),
+}
+PERIODS = {"1Y": 252, "2Y": 504, "5Y": 1260, "10Y": 2520}
+WARMUP = 200   # extra bars loaded ahead of the test window (SMA200)
+YEAR = 252
+
+
+class Result(NamedTuple):
+    equity: pd.DataFrame   # STRATEGY and BUY_HOLD account value per day
+    fills: pd.DataFrame    # one row per executed order
+    trades: pd.DataFrame   # one row per round trip (open trades marked at the last close)
+    stats: dict
+    symbols: list
+
+
+def warm(symbols, period="10y"):
+    """Make sure the bar store reaches back `period` and is current (io pool)."""
+    def one(s):
+        try:
+            return bars.store.backfill(s, "1d", period) + bars.store.update(s, "1d")
+        except Exception:
+            return 0
+    return sum(workers.io_pool.map(one, symbols))
+
+
+# --- 1. SIGNAL FIELDS (every screener field, on every bar) ---
+def _listed(close):
+    """Row of each column's first real bar; leading NaNs are back-filled with it."""
+    first = np.argmax(~np.isnan(close), axis=0)
+    rows = np.arange(len(close))[:, None]
+    return first, rows, np.where(rows < first, close[first, np.arange(close.shape[1])], close)
+
+
+def series_fields(m):
+    """
+    screener.FIELDS as (days, symbols) matrices. Columns that list inside the
+    window are back-filled before their first bar, and each indicator reads
+    NaN (so no condition fires) until it has warmed up on real bars.
+    """
+    first, rows, close = _listed(m["Close"])
+    high = np.where(np.isnan(m["High"]), close, m["High"])
+    low = np.where(np.isnan(m["Low"]), close, m["Low"])
+
+    def since(a, n):   # NaN until n real bars have been seen
+        return np.where(rows >= first + n - 1, a, np.nan)
+
+    rsi = since(indicators.wilder_rsi_matrix(close), 15)
+    line, sig, hist = (since(a, 34) for a in indicators.macd_matrix(close))
+    sma20, sma50, sma200 = (since(indicators.sma_matrix(close, n), n) for n in (20, 50, 200))
+    upper, mid, lower = (since(a, 20) for a in indicators.bollinger_matrix(close))
+    atr = since(indicators.wilder_atr_matrix(high, low, close), 14)
+    close = since(close, 1)
+
+    def prev(a):
+        return np.vstack([np.full((1, a.shape[1]), np.nan), a[:-1]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "CLOSE": close,
+            "CHG": (close / prev(close) - 1) * 100,
+            "VOLUME": m["Volume"],
+            "RSI": rsi,
+            "MACD": line, "SIGNAL": sig, "HIST": hist,
+            "SMA20": sma20, "SMA50": sma50, "SMA200": sma200,
+            "BB_UPPER": upper, "BB_MID": mid, "BB_LOWER": lower,
+            "BB_WIDTH": (upper - lower) / mid * 100,
+            "ATR": atr,
+            "MACD_BULL_CROSS": (prev(hist) <= 0) & (hist > 0),
+            "MACD_BEAR_CROSS": (prev(hist) >= 0) & (hist < 0),
+            "GOLDEN_CROSS": (prev(sma50) <= prev(sma200)) & (sma50 > sma200),
+            "DEATH_CROSS": (prev(sma50) >= prev(sma200)) & (sma50 < sma200),
+        }
+
+
+# --- 2. POSITIONS & EQUITY ---
+def positions(entry, exit):
+    """
+    In-position mask (days, symbols): held[t] means the sleeve is long over
+    bar t, i.e. a signal on t-1's close filled at t's open. Entry wins a tie.
+    """
+    state = np.where(entry, 1.0, np.where(exit, 0.0, np.nan))
+    state = pd.DataFrame(state).ffill().to_numpy()
+    held = np.zeros(entry.shape, dtype=bool)
+    held[1:] = state[:-1] == 1.0
+    return held
+
+
+def sleeve_growth(held, open_, close, cost):
+    """
+    Per-bar growth factor of each sleeve's equity (1.0 = flat / in cash):
+    close/prev close while holding, close/open on the entry bar, open/prev
+    close on the exit bar, with commission taken on each fill.
+    """
+    was = np.zeros_like(held)
+    was[1:] = held[:-1]
+    prev_close = np.vstack([close[:1], close[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = np.ones(held.shape)
+        g = np.where(held & was, close / prev_close, g)
+        g = np.where(held & ~was, (1 - cost) * close / open_, g)
+        g = np.where(~held & was, (1 - cost) * open_ / prev_close, g)
+    return np.where(np.isfinite(g), g, 1.0)
+
+
+# --- 3. RUN ---
+def run(entry_rule, exit_rule, symbols, days=PERIODS["10Y"], capital=100_000.0, cost_bps=5.0, store=None):
+    """Backtest one rule over `symbols` on the last `days` cached daily bars."""
+    store = store or bars.store
+    names, m = screener.load_matrices(symbols, "1d", depth=days + WARMUP, store=store,
+                                      fields=("Open", "High", "Low", "Close", "Volume"))
+    if not names:
+        raise ValueError("no cached daily bars for these symbols (warm the cache first)")
+    fields = series_fields(m)
+    live = ~np.isnan(fields["CLOSE"])
+    entry = screener.evaluate(entry_rule, fields) & live
+    exit = screener.evaluate(exit_rule, fields) | ~live
+
+    # Trim the warm-up rows, then any rows the store does not reach back to (NaN padding
+    # when less than `days` is cached); nobody starts the window in a position
+    live = live[WARMUP:]
+    rows = np.flatnonzero(np.isfinite(m["ts"][WARMUP:]) & live.any(axis=1))
+    if not len(rows):
+        raise ValueError("no cached daily bars inside the lookback window (warm the cache first)")
+    window = slice(WARMUP + rows[0], None)
+    live, entry, exit = live[rows[0]:], entry[window], exit[window]
+    _, _, close = _listed(m["Close"][window])
+    close = pd.DataFrame(close).ffill().to_numpy()       # symbols behind the common session hold their last close
+    open_ = np.where(np.isnan(m["Open"][window]) | (m["Open"][window] <= 0), close, m["Open"][window])
+    index = pd.to_datetime(m["ts"][window], unit="s", utc=True).tz_convert(store.tz(names[0], "1d")).normalize()
+
+    cost = cost_bps / 1e4
+    held = positions(entry, exit)
+    sleeve = capital / len(names)
+    growth = sleeve_growth(held, open_, close, cost)
+    value = sleeve * np.cumprod(growth, axis=0)              # (days, symbols) sleeve equity
+
+    first = np.argmax(live, axis=0)
+    bh = np.where(np.arange(len(close))[:, None] >= first, close / close[first, np.arange(len(names))], 1.0)
+    bh = np.where(np.isfinite(bh), bh, 1.0)                 # a sleeve with no bars in the window stays in cash
+    equity = pd.DataFrame({"STRATEGY": value.sum(axis=1), "BUY_HOLD": sleeve * bh.sum(axis=1)}, index=index)
+
+    fills, trades = _ledger(names, index, held, value, open_, close, cost)
+    return Result(equity, fills, trades, stats(equity["STRATEGY"], trades, held), names)
+
+
+def _ledger(names, index, held, value, open_, close, cost):
+    """Round trips and fills from the position mask (col-major, so trades pair 1:1)."""
+    days, n = held.shape
+    edge = np.diff(np.vstack([np.zeros((1, n), dtype=np.int8), held.astype(np.int8)]), axis=0)
+    sc, st = np.nonzero(edge.T == 1)           # entries: column, bar
+    ec, et = np.nonzero(edge.T == -1)          # exits
+    still = np.flatnonzero(held[-1])           # open at the end: virtual exit at the last close
+    ec = np.concatenate([ec, still])
+    et = np.concatenate([et, np.full(len(still), days)])
+    order = np.lexsort((et, ec))
+    ec, et = ec[order], et[order]
+
+    equity_before = value[st - 1, sc]          # sleeve is all cash the bar before it buys (held[0] is never set)
+    entry_px = open_[st, sc]
+    qty = equity_before * (1 - cost) / entry_px
+    closed = et < days
+    exit_px = np.where(closed, open_[np.minimum(et, days - 1), ec], close[-1, ec])
+    proceeds = qty * exit_px * np.where(closed, 1 - cost, 1.0)
+    pnl = proceeds - equity_before
+
+    sym = np.asarray(names)
+    trades = pd.DataFrame({
+        "SYMBOL": sym[sc],
+        "ENTRY": index[st],
+        "EXIT": pd.DatetimeIndex(index[np.minimum(et, days - 1)]).where(closed),
+        "QTY": qty,
+        "AVG_PRICE": entry_px,
+        "EXIT_PRICE": exit_px,
+        "PNL": pnl,
+        "RETURN": pnl / equity_before,
+        "BARS": et - st,
+        "OPEN": ~closed,
+    })
+    buys = pd.DataFrame({"DATE": index[st], "SYMBOL": sym[sc], "SIDE": "BUY", "QTY": qty,
+                         "PRICE": entry_px, "COMMISSION": equity_before * cost})
+    sells = pd.DataFrame({"DATE": index[et[closed]], "SYMBOL": sym[ec[closed]], "SIDE": "SELL", "QTY": qty[closed],
+                          "PRICE": exit_px[closed], "COMMISSION": qty[closed] * exit_px[closed] * cost})
+    fills = pd.concat([buys, sells], ignore_index=True).sort_values(["DATE", "SIDE"], kind="stable", ignore_index=True)
+    return fills, trades
+
+
+def stats(equity, trades, held):
+    """Headline numbers for an equity curve and its round trips."""
+    eq = equity.to_numpy()
+    r = np.diff(eq) / eq[:-1]
+    # Calendar span of the bars actually replayed (the window may be shorter than asked for)
+    years = max((equity.index[-1] - equity.index[0]).days / 365.25, 1 / YEAR)
+    sd = r.std(ddof=1) if len(r) > 1 else 0.0
+    down = r[r < 0]
+    closed = trades[~trades["OPEN"]]
+    wins, losses = closed["PNL"][closed["PNL"] > 0].sum(), -closed["PNL"][closed["PNL"] <= 0].sum()
+    return {
+        "TOTAL_RETURN": eq[-1] / eq[0] - 1,
+        "CAGR": (eq[-1] / eq[0]) ** (1 / years) - 1,
+        "VOL": sd * np.sqrt(YEAR),
+        "SHARPE": r.mean() / sd * np.sqrt(YEAR) if sd > 0 else 0.0,
+        "SORTINO": r.mean() / down.std(ddof=1) * np.sqrt(YEAR) if len(down) > 1 else 0.0,
+        "MAX_DD": float((1 - eq / np.maximum.accumulate(eq)).max()),
+        "TRADES": len(closed),
+        "WIN_RATE": (closed["PNL"] > 0).mean() if len(closed) else 0.0,
+        "AVG_TRADE": closed["RETURN"].mean() if len(closed) else 0.0,
+        "PROFIT_FACTOR": wins / losses if losses > 0 else float("inf"),
+        "EXPOSURE": held.mean(),
+        "DAYS": len(eq),
+        "YEARS": years,
+    }
@@ -0,0 +1,289 @@
+"""
+BAR STORE // persistent, incremental OHLCV cache keyed by (symbol, interval).
+
+Layout on disk: one raw little-endian float64 file per key with fixed-width
+rows [ts, open, high, low, close, volume] (ts = UTC epoch seconds), plus a tiny
+JSON sidecar holding the exchange timezone. Files are memory-mapped, so a
+read is a zero-copy slice of the page cache.
+
+Updates only ask Yahoo for bars from the last settled stored bar onwards. Rows
+that overlap the tail (the still-forming bar) are rewritten in place; newer
+rows are appended. Yahoo prices are split / dividend adjusted as of the day
+they are fetched, so the settled overlap bar is compared with what is stored:
+if it moved (a corporate action since the last fetch), or the stored tail is
+older than Yahoo keeps for the interval, the key is rebuilt from one fresh
+download instead of stitching differently adjusted rows together. Every
+rebuild bumps the key's epoch() so derived caches know to start over.
+backfill() replaces the file with one consistently adjusted deep download.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from core import cache_path
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+ROW = 1 + len(COLUMNS)
+DTYPE = np.dtype("<f8")
+
+# First download for a key we have never seen.
+BOOTSTRAP = {"1d": "2y", "1wk": "10y", "1h": "3mo", "30m": "1mo", "15m": "1mo", "5m": "5d", "1m": "5d"}
+
+# Minimum seconds between network checks for the same key.
+REFRESH_EVERY = {"1d": 300, "1wk": 3600, "1h": 120, "30m": 60, "15m": 60, "5m": 60, "1m": 30}
+
+PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 365, "2y": 730, "5y": 1826, "10y": 3652}
+
+# How far back Yahoo serves each intraday interval (days); older tails cannot be topped up.
+INTRADAY_LIMIT = {"1m": 7, "5m": 60, "15m": 60, "30m": 60, "1h": 730}
+
+# Relative close difference on a settled overlap bar that means the history was re-adjusted.
+ADJUST_TOL = 2e-4
+
+
+class BarStore:
+    def __init__(self, root=None):
+        self.root = root
+        self._locks = {}
+        self._maps = {}       # key -> (nrows, memmap)
+        self._checked = {}    # key -> epoch of last network check
+        self._dirs = set()
+        self._backfilled = set()
+        self._guard = threading.Lock()
+
+    # --- 1. PATHS & MAPS ---
+    def _path(self, symbol, interval, ext):
+        name = f"{symbol.upper().replace('/', '_')}.{ext}"
+        if self.root:
+            folder = os.path.join(self.root, interval)
+            if folder not in self._dirs:
+                os.makedirs(folder, exist_ok=True)
+                self._dirs.add(folder)
+            return os.path.join(folder, name)
+        return cache_path("bars", interval, name)
+
+    def _lock(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _map(self, symbol, interval):
+        """Memory-map the key's file, remapping only when it has grown."""
+        key = (symbol, interval)
+        path = self._path(symbol, interval, "f64")
+        try:
+            nrows = os.path.getsize(path) // (DTYPE.itemsize * ROW)
+        except OSError:
+            return np.empty((0, ROW), dtype=DTYPE)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == nrows:
+            return cached[1]
+        if nrows == 0:
+            return np.empty((0, ROW), dtype=DTYPE)
+        mm = np.memmap(path, dtype=DTYPE, mode="r", shape=(nrows, ROW))
+        self._maps[key] = (nrows, mm)
+        return mm
+
+    def _meta(self, symbol, interval):
+        try:
+            with open(self._path(symbol, interval, "json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def tz(self, symbol, interval):
+        return self._meta(symbol, interval).get("tz") or "UTC"
+
+    def epoch(self, symbol, interval):
+        """When the key's history was last rebuilt (0 if never): changes whenever stored rows are re-adjusted."""
+        return self._meta(symbol.upper(), interval).get("rebuilt", 0)
+
+    # --- 2. INCREMENTAL UPDATE ---
+    def update(self, symbol, interval="1d", force=False):
+        """Pull bars newer than the stored tail. Returns the number of rows written."""
+        symbol = symbol.upper()
+        key = (symbol, interval)
+        with self._lock(key):
+            now = time.time()
+            if not force and now - self._checked.get(key, 0) < REFRESH_EVERY.get(interval, 60):
+                return 0
+            self._checked[key] = now
+
+            stored = self._map(symbol, interval)
+            t = yf.Ticker(symbol)
+            limit = INTRADAY_LIMIT.get(interval)
+            if len(stored) and limit and now - stored[-1, 0] > (limit - 1) * 86400:
+                return self._rebuild(symbol, interval, stored)      # tail is past Yahoo's intraday window
+            if len(stored):
+                # From the last settled bar, so the overlap shows whether Yahoo re-adjusted
+                settled = float(stored[-2, 0] if len(stored) > 1 else stored[-1, 0])
+                start = pd.Timestamp(settled, unit="s", tz="UTC").normalize()
+                df = t.history(start=start, interval=interval)
+            else:
+                df = t.history(period=BOOTSTRAP.get(interval, "1y"), interval=interval)
+            rows = self._rows(symbol, interval, df)
+            if rows is not None and len(stored) > 1 and self._adjusted(stored[:-1], rows):
+                return self._rebuild(symbol, interval, stored)
+            return self._merge(symbol, interval, stored, rows)
+
+    def _adjusted(self, settled, rows):
+        """True if any stored settled bar came back with a different close (split / dividend since)."""
+        pos = np.searchsorted(settled[:, 0], rows[:, 0])
+        hit = pos < len(settled)
+        hit[hit] = settled[pos[hit], 0] == rows[hit, 0]
+        if not hit.any():
+            return False
+        old, new = settled[pos[hit], 4], rows[hit, 4]
+        return bool(np.any(np.abs(new - old) > ADJUST_TOL * np.abs(old)))
+
+    def _rebuild(self, symbol, interval, stored):
+        """Replace the key with one fresh download spanning what was stored (intraday: what Yahoo still has)."""
+        period = BOOTSTRAP.get(interval, "1y")
+        if interval not in INTRADAY_LIMIT and len(stored):
+            span = (time.time() - stored[0, 0]) / 86400
+            period = next((p for p, d in PERIOD_DAYS.items() if d >= span), "max")
+        rows = self._rows(symbol, interval, yf.Ticker(symbol).history(period=period, interval=interval))
+        if rows is None:
+            return 0
+        self._replace(symbol, interval, rows)
+        return len(rows)
+
+    def _replace(self, symbol, interval, rows):
+        """Atomically swap the key's file for `rows` and bump its epoch."""
+        key = (symbol, interval)
+        path = self._path(symbol, interval, "f64")
+        with open(path + ".tmp", "wb") as f:
+            f.write(np.ascontiguousarray(rows).tobytes())
+        os.replace(path + ".tmp", path)
+        self._maps.pop(key, None)
+        meta = self._meta(symbol, interval)
+        meta["rebuilt"] = time.time()
+        with open(self._path(symbol, interval, "json"), "w") as f:
+            json.dump(meta, f)
+
+    def backfill(self, symbol, interval="1d", period="10y"):
+        """
+        Extend stored history back to `period` (for backtests deeper than the
+        bootstrap). One full download replaces the stored rows it covers (it is
+        adjusted as of today, unlike rows stored earlier), and the file is
+        swapped in atomically. Checked once per process.
+        """
+        symbol = symbol.upper()
+        key = (symbol, interval)
+        with self._lock(key):
+            if key in self._backfilled:
+                return 0
+            stored = self._map(symbol, interval)
+            want = time.time() - PERIOD_DAYS.get(period, 365) * 86400
+            if len(stored) and stored[0, 0] <= want + 7 * 86400:   # slack for weekends / holidays
+                self._backfilled.add(key)
+                return 0
+            rows = self._rows(symbol, interval, yf.Ticker(symbol).history(period=period, interval=interval))
+            self._backfilled.add(key)
+            if rows is None:
+                return 0
+            added = int(np.sum(rows[:, 0] < stored[0, 0])) if len(stored) else len(rows)
+            if not added:
+                return 0
+            newer = stored[stored[:, 0] > rows[-1, 0]] if len(stored) else stored
+            self._replace(symbol, interval, np.vstack([rows, newer]))
+            return added
+
+    def _rows(self, symbol, interval, df):
+        """yfinance frame -> (n, ROW) rows, or None if it holds no closes."""
+        if df is None or df.empty:
+            return None
+        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
+        df = df[COLUMNS].dropna(subset=["Close"])
+        if df.empty:
+            return None
+
+        idx = df.index
+        if idx.tz is None:
+            idx = idx.tz_localize("UTC")
+        else:
+            self._write_meta(symbol, interval, str(idx.tz))
+        rows = np.empty((len(df), ROW), dtype=DTYPE)
+        rows[:, 0] = idx.tz_convert("UTC").as_unit("ns").asi8 // 10**9
+        rows[:, 1:] = df.to_numpy(dtype=DTYPE, na_value=0.0)
+        return rows
+
+    def _merge(self, symbol, interval, stored, rows):
+        if rows is None:
+            return 0
+
+        path = self._path(symbol, interval, "f64")
+        n_old = len(stored)
+        rewritten = 0
+        if n_old:
+            last_ts = stored[-1, 0]
+            overlap = rows[rows[:, 0] <= last_ts]
+            fresh = rows[rows[:, 0] > last_ts]
+            if len(overlap):
+                # Rewrite the forming tail bars in place.
+                tail_from = int(np.searchsorted(stored[:, 0], overlap[0, 0]))
+                pos = tail_from + np.searchsorted(stored[tail_from:, 0], overlap[:, 0])
+                hit = (pos < n_old)
+                hit[hit] = stored[pos[hit], 0] == overlap[hit, 0]
+                if hit.any():
+                    rw = np.memmap(path, dtype=DTYPE, mode="r+", shape=(n_old, ROW))
+                    rw[pos[hit]] = overlap[hit]
+                    rw.flush()
+                    del rw
+                    rewritten = int(hit.sum())
+        else:
+            fresh = rows
+
+        if len(fresh):
+            with open(path, "ab") as f:
+                f.write(np.ascontiguousarray(fresh).tobytes())
+        return len(fresh) + rewritten
+
+    def _write_meta(self, symbol, interval, tz):
+        path = self._path(symbol, interval, "json")
+        if os.path.exists(path):
+            return
+        with open(path, "w") as f:
+            json.dump({"tz": tz}, f)
+
+    # --- 3. READ PATH ---
+    def bars(self, symbol, interval="1d", start=None, refresh=True):
+        """Zero-copy (n, 6) view of stored rows with ts >= `start` (epoch seconds)."""
+        symbol = symbol.upper()
+        if refresh:
+            try:
+                self.update(symbol, interval)
+            except Exception:
+                pass  # serve whatever is on disk
+        arr = self._map(symbol, interval)
+        if start is not None and len(arr):
+            arr = arr[int(np.searchsorted(arr[:, 0], start)):]
+        return arr
+
+    def history(self, symbol, interval="1d", period="1y", refresh=True):
+        """
+        Drop-in for yf.Ticker(symbol).history(period=..., interval=...) restricted to
+        OHLCV columns. `period` is anchored on the last stored bar's session, so
+        period="1d" on intraday bars means "the latest session".
+        """
+        symbol = symbol.upper()
+        arr = self.bars(symbol, interval, refresh=refresh)
+        tz = self.tz(symbol, interval)
+        if len(arr):
+            last_day = pd.Timestamp(arr[-1, 0], unit="s", tz="UTC").tz_convert(tz).normalize()
+            first = last_day - pd.Timedelta(days=PERIOD_DAYS.get(period, 365) - 1)
+            arr = arr[int(np.searchsorted(arr[:, 0], first.timestamp())):]
+        index = pd.DatetimeIndex(pd.to_datetime(arr[:, 0], unit="s", utc=True)).tz_convert(tz)
+        index.name = "Date" if interval in ("1d", "1wk") else "Datetime"
+        return pd.DataFrame(arr[:, 1:], index=index, columns=COLUMNS, copy=False)
+
+
+store = BarStore()
+
+
+def history(symbol, interval="1d", period="1y"):
+    return store.history(symbol, interval=interval, period=period)
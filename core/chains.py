@@ -0,0 +1,174 @@
+"""
+OPTION CHAINS // every expiration fetched at once, cached as one columnar frame.
+
+load(symbol) pulls stock.options, then every expiry's option_chain on a small
+bounded pool (Yahoo throttles wide fan-outs), and concatenates them into one
+frame sorted by (expiry, type, strike). The row range of each expiry is kept,
+so switching expiries in the UI is an iloc slice, not a network round-trip.
+Snapshots live in memory for CHAIN_TTL; concurrent loads of the same symbol
+share one fetch.
+
+Columns: Yahoo's own (contractSymbol, strike, lastPrice, bid, ask, change,
+percentChange, volume, openInterest, impliedVolatility, inTheMoney) plus
+expiry, type ("CALL"/"PUT"), tenor (years to the 16:00 New York close),
+mid, moneyness (strike / spot) and log_moneyness.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from core import quotes
+
+CHAIN_TTL = 300         # seconds a snapshot is served without refetching
+CONCURRENCY = 8         # simultaneous option_chain requests per load
+YEAR_SECONDS = 365.0 * 86400
+MIN_TENOR = 1.0 / (365 * 24)     # an hour: keeps same-day expiries finite
+
+# IV surface grid (strike / spot) and the sanity band for quoted vols
+MONEYNESS = np.round(np.arange(0.70, 1.3001, 0.025), 3)
+IV_BAND = (0.01, 5.0)
+
+YAHOO_COLUMNS = ["contractSymbol", "strike", "lastPrice", "bid", "ask", "change", "percentChange",
+                 "volume", "openInterest", "impliedVolatility", "inTheMoney"]
+
+_pool = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="yn-chain")
+_cache = {}             # SYMBOL -> Chain
+_locks = {}
+_guard = threading.Lock()
+
+
+class Chain(NamedTuple):
+    symbol: str
+    spot: float
+    fetched: float
+    expiries: list          # "YYYY-MM-DD", ascending
+    frame: pd.DataFrame
+    bounds: dict            # expiry -> (first row, end row) in frame
+
+    def expiry(self, date):
+        """All contracts of one expiry (a view-like iloc slice)."""
+        lo, hi = self.bounds.get(date, (0, 0))
+        return self.frame.iloc[lo:hi]
+
+    def calls_puts(self, date):
+        part = self.expiry(date)
+        return part[part["type"] == "CALL"], part[part["type"] == "PUT"]
+
+
+# --- 1. FETCH ---
+def _one(stock, expiry):
+    try:
+        oc = stock.option_chain(expiry)
+    except Exception:
+        return expiry, None, None, {}
+    return expiry, oc.calls, oc.puts, getattr(oc, "underlying", None) or {}
+
+
+def _normalize(parts, spot, now):
+    frames = []
+    for expiry, calls, puts in parts:
+        close = pd.Timestamp(expiry).tz_localize("America/New_York") + pd.Timedelta(hours=16)
+        tenor = max((close.timestamp() - now) / YEAR_SECONDS, MIN_TENOR)
+        for kind, df in (("CALL", calls), ("PUT", puts)):
+            if df is None or df.empty:
+                continue
+            df = df.reindex(columns=YAHOO_COLUMNS).sort_values("strike")
+            df.insert(0, "type", kind)
+            df.insert(0, "expiry", expiry)
+            df["tenor"] = tenor
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["expiry", "type"] + YAHOO_COLUMNS + ["tenor", "mid", "moneyness", "log_moneyness"])
+    frame = pd.concat(frames, ignore_index=True)
+    for col in ("strike", "lastPrice", "bid", "ask", "change", "percentChange", "impliedVolatility"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype(float)
+    for col in ("volume", "openInterest"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").fillna(0).astype(np.int64)
+    bid, ask = frame["bid"].to_numpy(), frame["ask"].to_numpy()
+    frame["mid"] = np.where((bid > 0) & (ask >= bid), (bid + ask) / 2, frame["lastPrice"].to_numpy())
+    frame["moneyness"] = frame["strike"] / spot if spot > 0 else np.nan
+    frame["log_moneyness"] = np.log(frame["moneyness"])
+    return frame
+
+
+def fetch(symbol):
+    """Network path: every expiry concurrently -> one normalized Chain."""
+    symbol = symbol.upper()
+    stock = yf.Ticker(symbol)
+    expiries = list(stock.options or ())
+    results = list(_pool.map(lambda e: _one(stock, e), expiries))
+    spot = next((u.get("regularMarketPrice") for _, _, _, u in results if u.get("regularMarketPrice")), None)
+    spot = float(spot or quotes.price(symbol) or 0.0)
+    now = time.time()
+    parts = [(e, c, p) for e, c, p, _ in results if c is not None or p is not None]
+    frame = _normalize(parts, spot, now)
+    # Row range per expiry (frame is already grouped by expiry, then type, then strike)
+    codes = frame["expiry"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+    ends = np.r_[starts[1:], len(codes)]
+    bounds = {codes[s]: (int(s), int(e)) for s, e in zip(starts, ends)}
+    return Chain(symbol, spot, now, [e for e in expiries if e in bounds], frame, bounds)
+
+
+def load(symbol, max_age=CHAIN_TTL):
+    """Cached Chain for `symbol`; refetches (once, for all callers) when older than max_age."""
+    symbol = symbol.upper()
+    with _guard:
+        lock = _locks.setdefault(symbol, threading.Lock())
+    with lock:
+        chain = _cache.get(symbol)
+        if chain is None or time.time() - chain.fetched > max_age:
+            chain = _cache[symbol] = fetch(symbol)
+        return chain
+
+
+# --- 2. IV SURFACE ---
+def otm(chain, iv_col="impliedVolatility"):
+    """Out-of-the-money wing of every expiry (puts below spot, calls at/above), with a usable IV."""
+    f = chain.frame
+    iv = f[iv_col].to_numpy(dtype=float)
+    below = f["strike"].to_numpy() < chain.spot
+    keep = np.where(below, f["type"].to_numpy() == "PUT", f["type"].to_numpy() == "CALL")
+    keep &= (iv > IV_BAND[0]) & (iv < IV_BAND[1])
+    return f[keep]
+
+
+def surface(chain, iv_col="impliedVolatility", grid=MONEYNESS):
+    """
+    IV on a (moneyness x expiry) grid: each expiry's OTM smile interpolated
+    linearly onto `grid` (NaN outside its quoted strikes).
+    """
+    wing = otm(chain, iv_col)
+    out = {}
+    for expiry, g in wing.groupby("expiry", sort=True):
+        m, iv = g["moneyness"].to_numpy(), g[iv_col].to_numpy(dtype=float)
+        order = np.argsort(m)
+        m, iv = m[order], iv[order]
+        if len(m) >= 2:
+            out[expiry] = np.interp(grid, m, iv, left=np.nan, right=np.nan)
+    return pd.DataFrame(out, index=pd.Index(grid, name="moneyness"))
+
+
+def smile(chain, expiry, iv_col="impliedVolatility"):
+    """One expiry's OTM smile (the skew slice), sorted by strike."""
+    part = chain.expiry(expiry)
+    wing = otm(chain._replace(frame=part), iv_col)
+    return wing.sort_values("strike")[["strike", "moneyness", "type", iv_col]]
+
+
+def term_structure(chain, iv_col="impliedVolatility", wings=(0.9, 1.1)):
+    """Per expiry: tenor, ATM IV and the put-minus-call wing skew at `wings` moneyness."""
+    surf = surface(chain, iv_col, np.array([wings[0], 1.0, wings[1]]))
+    tenor = chain.frame.groupby("expiry", sort=True)["tenor"].first()
+    ts = pd.DataFrame({
+        "tenor": tenor.reindex(surf.columns),
+        "atm_iv": surf.loc[1.0],
+        "skew": surf.loc[wings[0]] - surf.loc[wings[1]],
+    })
+    ts.index.name = "expiry"
+    return ts
@@ -0,0 +1,171 @@
+"""
+CHART DATA LAYER // decimate to a pixel budget before anything reaches Plotly.
+
+A chart a few hundred pixels wide can't show more than a couple of points per
+pixel, so every trace is reduced first:
+
+  * lines   -> LTTB (largest-triangle-three-buckets), keeps the visual shape
+  * bars    -> per-bucket min/max, keeps spikes
+  * candles -> per-bucket OHLC aggregation (first / max / min / last)
+
+Payload size and browser render time are bounded by the budget, not by how
+much history the bar store has accumulated. Traces that still carry more than
+GL_THRESHOLD points are drawn with WebGL (Scattergl) instead of SVG.
+
+Zooming re-fetches. window_picker() maps a preset window to the finest bar
+interval worth fetching for it. Plotly's own wheel / drag zoom is client-side
+and never reaches the server, so a box selection on the chart is the zoom
+gesture Python can see: zoom_range() reads its x-range, zoom_window() picks
+the finest interval Yahoo still serves that far back, and the page
+re-fetches and decimates just that slice.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from core.bars import INTRADAY_LIMIT, PERIOD_DAYS
+
+PIXEL_BUDGET = 2000    # points per line trace
+CANDLE_BUDGET = 600    # candles are several pixels wide each
+GL_THRESHOLD = 1500    # rendered points above which lines switch to Scattergl
+
+# Visible window -> (bars.history period, finest interval worth fetching for it)
+WINDOWS = {
+    "1D": ("1d", "1m"),
+    "5D": ("5d", "5m"),
+    "1M": ("1mo", "30m"),
+    "3M": ("3mo", "1h"),
+    "1Y": ("1y", "1d"),
+    "2Y": ("2y", "1d"),
+    "10Y": ("10y", "1wk"),
+}
+
+# Zoom intervals, finest first: (interval, seconds per bar)
+ZOOM_INTERVALS = [("1m", 60), ("5m", 300), ("30m", 1800), ("1h", 3600), ("1d", 86400), ("1wk", 7 * 86400)]
+ZOOM_MAX_BARS = 4 * CANDLE_BUDGET     # finest interval whose bar count over the range stays under this
+
+
+# --- 1. DECIMATION ---
+def lttb_indices(x, y, n):
+    """Indices of the `n` points LTTB keeps (always includes first and last)."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)   # n-2 buckets over the interior
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the triangle's third vertex
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else size)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y, n):
+    """Per-bucket argmin and argmax (in time order): about `n` points, spikes intact."""
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    y = np.asarray(y, dtype=float)
+    buckets = max(n // 2, 1)
+    edges = np.linspace(0, size, buckets + 1).astype(int)
+    width = int(np.diff(edges).max())
+    # Pad every bucket to the same width so min/max is one reshape away
+    pos = edges[:-1, None] + np.arange(width)
+    valid = pos < edges[1:, None]
+    pos = np.where(valid, pos, edges[:-1, None])
+    vals = y[pos]
+    lo = np.where(valid, vals, np.inf).argmin(axis=1)
+    hi = np.where(valid, vals, -np.inf).argmax(axis=1)
+    rows = np.arange(buckets)
+    return np.unique(np.concatenate([pos[rows, lo], pos[rows, hi]]))
+
+
+def decimate_ohlc(df, n=CANDLE_BUDGET):
+    """Aggregate an OHLC(V) frame into at most `n` candles."""
+    size = len(df)
+    if n >= size:
+        return df
+    starts = np.linspace(0, size, n + 1).astype(int)[:-1]
+    out = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[np.append(starts[1:] - 1, size - 1)],
+    }
+    if "Volume" in df:
+        out["Volume"] = np.add.reduceat(df["Volume"].to_numpy(), starts)
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+# --- 2. TRACES ---
+def _clean(x, y):
+    y = pd.Series(np.asarray(y, dtype=float), index=x).dropna()
+    return y.index, y.to_numpy()
+
+
+def line(x, y, budget=PIXEL_BUDGET, **kwargs):
+    """Scatter (or Scattergl above GL_THRESHOLD) of y over x, LTTB-decimated."""
+    x, y = _clean(x, y)
+    if len(y) > budget:
+        ts = x.asi8 if isinstance(x, pd.DatetimeIndex) else np.asarray(x, dtype=float)
+        idx = lttb_indices(ts, y, budget)
+        x, y = x[idx], y[idx]
+    trace = go.Scattergl if len(y) > GL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+def bars(x, y, budget=PIXEL_BUDGET, **kwargs):
+    """Bar trace of y over x, min/max-decimated (bars have no WebGL variant)."""
+    x, y = _clean(x, y)
+    if len(y) > budget:
+        idx = minmax_indices(y, budget)
+        x, y = x[idx], y[idx]
+    return go.Bar(x=x, y=y, **kwargs)
+
+
+def candles(df, budget=CANDLE_BUDGET, **kwargs):
+    d = decimate_ohlc(df, budget)
+    return go.Candlestick(x=d.index, open=d["Open"], high=d["High"], low=d["Low"], close=d["Close"], **kwargs)
+
+
+# --- 3. ZOOM ---
+def window_picker(key, default="1Y", options=None, label="WINDOW"):
+    """Horizontal window selector; returns (period, interval) for bars.history()."""
+    options = list(options or WINDOWS)
+    choice = st.radio(label, options, index=options.index(default), horizontal=True, key=key)
+    return WINDOWS[choice]
+
+
+def zoom_range(key):
+    """(start, end) x-range of the box selection on chart `key`, or None."""
+    event = st.session_state.get(key)
+    boxes = (event or {}).get("selection", {}).get("box") or []
+    xs = [x for box in boxes for x in box.get("x", [])]
+    if len(xs) < 2:
+        return None
+    start, end = pd.Timestamp(min(xs)), pd.Timestamp(max(xs))
+    return (start, end) if end > start else None
+
+
+def zoom_window(start, end, now=None):
+    """(period, interval) covering [start, end] at the finest interval Yahoo serves that far back."""
+    now = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+    start, end = (t.tz_localize(None) if t.tzinfo else t for t in (start, end))
+    now = now.tz_localize(None) if now.tzinfo else now
+    back = max((now - start).total_seconds() / 86400, 1)
+    span = (end - start).total_seconds()
+    for interval, seconds in ZOOM_INTERVALS:
+        limit = INTRADAY_LIMIT.get(interval)
+        if (limit is None or back < limit - 1) and span / seconds <= ZOOM_MAX_BARS:
+            break
+    period = next((p for p, d in PERIOD_DAYS.items() if d >= back), "10y")
+    return period, interval
@@ -0,0 +1,73 @@
+"""
+WATCHLIST DOSSIER // RealIntelEngine's maths, vectorized across a panel.
+
+Inputs are wide frames (dates x symbols). Every metric is a column-wise
+operation over the whole frame, so 300 names cost about the same as a
+handful of single-ticker runs: two batched downloads plus one pass.
+Semantics match RealIntelEngine._calc_real_flow / _calc_real_regime /
+_calc_real_liquidity for a single column.
+"""
+import numpy as np
+import pandas as pd
+
+from core import workers
+from core.fundamentals import get_info
+from core.indicators import wilder_rsi_matrix
+from core.panel import download_panel
+
+
+def batch_flow(intra):
+    """Buy/sell pressure % from candle colour x volume on the latest session."""
+    o, c, v = intra["Open"], intra["Close"], intra["Volume"].fillna(0)
+    buy = v.where(c > o, 0).sum()
+    sell = v.where(c < o, 0).sum()
+    both = (buy + sell).replace(0, np.nan)
+    out = pd.DataFrame({"BUY%": buy / both * 100, "SELL%": sell / both * 100}).fillna(0.0)
+    out["NET"] = np.where(out["BUY%"] > out["SELL%"], "ACCUM", "DISTRIB")
+    return out
+
+
+def batch_regime(close):
+    """RSI(14), SMA20 and the regime label for every column of `close`."""
+    # Same Wilder RSI as core.indicators, so batch rows match the single dossier
+    rsi = pd.Series(wilder_rsi_matrix(close.ffill().to_numpy())[-1], index=close.columns).fillna(50)
+
+    sma20 = close.rolling(20).mean().iloc[-1].fillna(close.mean())
+    last = close.ffill().iloc[-1]
+    state = np.select(
+        [rsi > 70, rsi < 30, last > sma20, last < sma20],
+        ["OVERBOUGHT", "OVERSOLD", "BULLISH TREND", "BEARISH TREND"],
+        default="NEUTRAL",
+    )
+    prev = close.ffill().iloc[-2] if len(close) > 1 else last
+    return pd.DataFrame({
+        "LAST": last, "CHG%": (last / prev - 1) * 100,
+        "RSI": rsi, "SMA20": sma20, "STATE": state,
+    })
+
+
+def batch_liquidity(symbols):
+    """Float vs locked % from cached fundamentals, fetched concurrently."""
+    infos = dict(zip(symbols, workers.io_pool.map(lambda s: get_info(s, ("ownership",)), symbols)))
+    shares = pd.Series({s: infos[s].get("sharesOutstanding") for s in symbols}, dtype=float)
+    floats = pd.Series({s: infos[s].get("floatShares") for s in symbols}, dtype=float)
+    locked = ((shares - floats) / shares * 100).clip(0, 100).fillna(0).round(1)
+    return pd.DataFrame({"FLOAT%": (100 - locked).round(1), "LOCKED%": locked})
+
+
+def build(symbols, with_float=True):
+    """Sortable dossier table, one row per symbol that returned daily bars."""
+    symbols = [s.strip().upper() for s in symbols if s.strip()]
+    # A year of dailies so the Wilder RSI has converged past its seed window
+    daily = download_panel(symbols, period="1y", interval="1d", fields=("Close",))["Close"]
+    if daily.empty:
+        return pd.DataFrame()
+    intra = download_panel(list(daily.columns), period="1d", interval="5m", fields=("Open", "Close", "Volume"))
+
+    table = batch_regime(daily)
+    if not intra["Close"].empty:
+        table = table.join(batch_flow(intra))
+    if with_float:
+        table = table.join(batch_liquidity(list(table.index)))
+    table.index.name = "SYMBOL"
+    return table.sort_values("CHG%", ascending=False)
@@ -0,0 +1,196 @@
+"""
+INTEL FEEDS // hedged social/news fetch on a long-lived event loop.
+
+One asyncio loop runs forever on a daemon thread and owns the authenticated
+twikit Client, so neither is rebuilt on every Streamlit rerun. A feed request
+fires X, Stocktwits and Yahoo news concurrently under one deadline instead of
+trying them one after another.
+
+Every source is normalized to the same dict shape:
+    {"id", "source", "ts", "user": {"name", "screen_name", "profile_image_url_https"}, "text"}
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+from twikit import Client
+
+from core import net
+
+COOKIES_FILE = "cookies.json"
+SOURCES = ("twitter", "stocktwits", "news")   # priority order
+NEWS_HANDLES = ["@MarketWire", "@Bloomberg", "@Reuters", "@CNBC", "@WSJ"]
+
+# --- 1. BACKGROUND LOOP ---
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="yn-feed-loop", daemon=True).start()
+    return _loop
+
+
+def run(coro, timeout=None):
+    """Run a coroutine on the shared loop from synchronous (Streamlit) code."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+
+# --- 2. X / TWIKIT (client reused across reruns) ---
+_client = None
+
+
+def _load_cookies():
+    with open(COOKIES_FILE, "r") as f:
+        raw = json.load(f)
+    return {c["name"]: c["value"] for c in raw} if isinstance(raw, list) else raw
+
+
+def _twitter_client():
+    global _client
+    if _client is None:
+        client = Client("en-US")
+        client.set_cookies(_load_cookies())
+        _client = client
+    return _client
+
+
+def _epoch(value):
+    """Best-effort epoch seconds from an ISO string / unix int / datetime; now() if unknown."""
+    if value in (None, ""):
+        return time.time()
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        return pd.Timestamp(value).timestamp()
+    except (ValueError, TypeError):
+        return time.time()
+
+
+def _tweet_to_item(t):
+    return {
+        "id": str(t.id),
+        "source": "X",
+        "ts": _epoch(getattr(t, "created_at_datetime", None)),
+        "user": {
+            "name": t.user.name,
+            "screen_name": t.user.screen_name,
+            "profile_image_url_https": getattr(t.user, "profile_image_url", "") or "",
+        },
+        "text": t.text,
+    }
+
+
+async def search_tweets(symbol, count=10, since_id=None):
+    global _client
+    if not os.path.exists(COOKIES_FILE):
+        return []
+    query = f"${symbol} filter:verified"
+    if since_id:
+        query += f" since_id:{since_id}"
+    try:
+        tweets = await _twitter_client().search_tweet(query, "Latest", count=count)
+    except Exception:
+        _client = None   # stale session; rebuild on the next call
+        raise
+    return [_tweet_to_item(t) for t in tweets]
+
+
+# --- 3. STOCKTWITS / YAHOO NEWS (blocking, run in the loop's executor) ---
+def fetch_stocktwits(symbol, count=10, since_id=None):
+    url = f"https://api.stocktwits.com/api/2/streams/symbol/{symbol}.json"
+    params = {"since": since_id} if since_id else None
+    r = net.get(url, params=params, timeout=(3.05, 5), retries=1)
+    if r.status_code != 200:
+        return []
+    tweets = []
+    for msg in r.json()['messages'][:count]:
+        tweets.append({
+            "id": str(msg['id']),
+            "source": "Stocktwits",
+            "ts": _epoch(msg.get('created_at')),
+            "user": {"name": msg['user']['username'], "screen_name": msg['user']['username'], "profile_image_url_https": msg['user']['avatar_url']},
+            "text": msg['body'],
+        })
+    return tweets
+
+
+def fetch_yahoo_news(symbol, count=10, since_id=None):
+    # Yahoo news has no since cursor; the message store dedupes instead.
+    news = yf.Ticker(symbol).news or []
+    tweets = []
+    for i, n in enumerate(news[:count]):
+        content = n.get('content', n)
+        handle = NEWS_HANDLES[i % len(NEWS_HANDLES)]
+        tweets.append({
+            "id": str(n.get('id') or n.get('uuid') or content.get('title')),
+            "source": "News Wire",
+            "ts": _epoch(content.get('pubDate') or n.get('providerPublishTime')),
+            "user": {"name": handle, "screen_name": handle.replace("@", "")},
+            "text": content.get('title', ''),
+        })
+    return tweets
+
+
+# --- 4. HEDGED FETCH ---
+async def _hedged(symbol, deadline, grace, merge, count, since):
+    loop = asyncio.get_running_loop()
+    since = since or {}
+    tasks = {
+        "twitter": asyncio.ensure_future(search_tweets(symbol, count, since.get("twitter"))),
+        "stocktwits": loop.run_in_executor(None, fetch_stocktwits, symbol, count, since.get("stocktwits")),
+        "news": loop.run_in_executor(None, fetch_yahoo_news, symbol, count, since.get("news")),
+    }
+    results = {}
+    pending = set(tasks.values())
+    end = loop.time() + deadline
+    cutoff = end   # pulled in once any source has answered
+
+    while pending:
+        remaining = min(end, cutoff) - loop.time()
+        if remaining <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for name, task in tasks.items():
+            if task in done and not task.cancelled() and task.exception() is None and task.result():
+                results[name] = task.result()
+        if results and not merge:
+            best = next(s for s in SOURCES if s in results or not tasks[s].done())
+            if best in results:
+                break
+            # A higher-priority source is still in flight; give it a short grace window.
+            cutoff = min(cutoff, loop.time() + grace)
+
+    for task in pending:
+        task.cancel()
+
+    if merge:
+        merged = []
+        for name in SOURCES:
+            merged.extend(results.get(name, []))
+        return merged
+    for name in SOURCES:
+        if name in results:
+            return results[name]
+    return []
+
+
+def get_feed(symbol, deadline=6.0, grace=1.0, merge=False, count=10, since=None):
+    """
+    Query every source at once and return within `deadline` seconds.
+
+    Default: the highest-priority source that answered with data, waiting at most
+    `grace` seconds past the first answer for a better-ranked one. merge=True
+    returns everything that arrived in time, in priority order. `since` maps a
+    source name to the highest message id already seen, so only newer messages
+    are requested.
+    """
+    return run(_hedged(symbol, deadline, grace, merge, count, since), timeout=deadline + 1)
@@ -0,0 +1,220 @@
+"""
+FUNDAMENTALS PROVIDER // process-wide cache for yf.Ticker(...).info
+
+Two tiers: memory (dict) -> disk (one JSON snapshot per ticker). Each field
+family has its own TTL; a page asks only for the families it reads, so a
+page showing analyst targets is not forced to refetch because the live quote
+fields went stale.
+
+Stale-while-revalidate: once a snapshot is past its TTL but still inside
+MAX_STALE it is served immediately and a refresh is queued on a background
+thread. Only a cold ticker (or one older than MAX_STALE) blocks the render.
+
+An empty .info (Yahoo throttling or a failed call) is never cached as a
+snapshot: a good snapshot keeps being served, and a cold ticker is only
+remembered as empty in memory for EMPTY_TTL before the next attempt.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yfinance as yf
+
+from core import cache_path
+
+# --- 1. FIELD FAMILIES & TTLS (seconds) ---
+FIELD_FAMILIES = {
+    "quote": (
+        "currentPrice", "regularMarketPrice", "previousClose", "open", "dayHigh", "dayLow",
+        "volume", "marketCap", "fiftyTwoWeekHigh", "fiftyTwoWeekLow",
+    ),
+    "estimates": (
+        "targetMeanPrice", "targetHighPrice", "targetLowPrice", "recommendationKey",
+        "numberOfAnalystOpinions", "forwardPE", "forwardEps",
+    ),
+    "short": ("shortRatio", "sharesShort", "shortPercentOfFloat", "sharesShortPriorMonth"),
+    "ownership": (
+        "sharesOutstanding", "floatShares", "heldPercentInstitutions", "heldPercentInsiders",
+    ),
+    "financials": (
+        "debtToEquity", "quickRatio", "currentRatio", "profitMargins", "totalRevenue",
+        "trailingPE", "beta", "returnOnEquity",
+    ),
+    "dividends": ("dividendYield", "dividendRate", "payoutRatio", "exDividendDate"),
+    "profile": ("sector", "industry", "longName", "country", "longBusinessSummary"),
+}
+
+FAMILY_TTL = {
+    "quote": 60,
+    "estimates": 6 * 3600,
+    "short": 12 * 3600,
+    "ownership": 24 * 3600,
+    "financials": 12 * 3600,
+    "dividends": 24 * 3600,
+    "profile": 7 * 24 * 3600,
+}
+
+# Past this age a snapshot is too old to show, even while refreshing.
+MAX_STALE = 7 * 24 * 3600
+# A cold ticker whose fetch came back empty is retried after this long.
+EMPTY_TTL = 60
+
+# --- 2. STATE ---
+_lock = threading.Lock()
+_memory = {}        # TICKER -> {"fetched": epoch, "info": dict}
+_inflight = set()   # tickers with a refresh already queued
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yn-info")
+_stats = {
+    "memory_hits": 0, "disk_hits": 0, "stale_served": 0,
+    "misses": 0, "refreshes": 0, "errors": 0,
+}
+
+
+def _bump(key):
+    with _lock:
+        _stats[key] += 1
+
+
+def _disk_file(ticker):
+    return cache_path("fundamentals", f"{ticker}.json")
+
+
+def _load_disk(ticker):
+    try:
+        with open(_disk_file(ticker), "r") as f:
+            entry = json.load(f)
+        if isinstance(entry.get("info"), dict):
+            return entry
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _save_disk(ticker, entry):
+    path = _disk_file(ticker)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _ttl_for(families):
+    if not families:
+        return min(FAMILY_TTL.values())
+    return min(FAMILY_TTL.get(f, FAMILY_TTL["quote"]) for f in families)
+
+
+# --- 3. FETCH ---
+def _fetch(ticker):
+    """Blocking Yahoo round-trip. Publishes the new snapshot to both tiers."""
+    info = yf.Ticker(ticker).info or {}
+    if not any(info.get(k) is not None for fields in FIELD_FAMILIES.values() for k in fields):
+        with _lock:
+            if ticker not in _memory or _memory[ticker].get("empty"):
+                _memory[ticker] = {"fetched": time.time(), "info": {}, "empty": True}
+        raise ValueError(f"empty .info for {ticker}")
+    entry = {"fetched": time.time(), "info": dict(info)}
+    with _lock:
+        _memory[ticker] = entry
+        _stats["refreshes"] += 1
+    _save_disk(ticker, entry)
+    return entry
+
+
+def _refresh_job(ticker):
+    try:
+        _fetch(ticker)
+    except Exception:
+        _bump("errors")
+    finally:
+        with _lock:
+            _inflight.discard(ticker)
+
+
+def _revalidate(ticker):
+    with _lock:
+        if ticker in _inflight:
+            return
+        _inflight.add(ticker)
+    _pool.submit(_refresh_job, ticker)
+
+
+def _lookup(ticker):
+    with _lock:
+        entry = _memory.get(ticker)
+    if entry is not None:
+        _bump("memory_hits")
+        return entry
+    entry = _load_disk(ticker)
+    if entry is not None:
+        with _lock:
+            _memory.setdefault(ticker, entry)
+        _bump("disk_hits")
+    return entry
+
+
+# --- 4. PUBLIC API ---
+def get_info(ticker, families=None):
+    """
+    Cached equivalent of yf.Ticker(ticker).info.
+
+    `families` names the FIELD_FAMILIES the caller actually reads; the
+    snapshot is considered fresh for the tightest TTL among them. Returns a
+    shallow copy so callers can mutate freely. Returns {} when Yahoo is down
+    and nothing is cached.
+    """
+    ticker = ticker.upper()
+    entry = _lookup(ticker)
+
+    if entry is not None and entry.get("empty"):
+        if time.time() - entry["fetched"] <= EMPTY_TTL:
+            return {}
+        entry = None    # retry like a cold ticker
+    if entry is not None:
+        age = time.time() - entry["fetched"]
+        if age <= _ttl_for(families):
+            return dict(entry["info"])
+        if age <= MAX_STALE:
+            _bump("stale_served")
+            _revalidate(ticker)
+            return dict(entry["info"])
+
+    _bump("misses")
+    try:
+        entry = _fetch(ticker)
+    except Exception:
+        _bump("errors")
+        if entry is None:
+            return {}
+    return dict(entry["info"])
+
+
+def snapshot_age(ticker):
+    """Seconds since the cached snapshot for `ticker` was fetched, or None."""
+    with _lock:
+        entry = _memory.get(ticker.upper())
+    return None if entry is None else time.time() - entry["fetched"]
+
+
+def invalidate(ticker=None):
+    """Drop the memory tier for one ticker (or all). Disk snapshots are kept."""
+    with _lock:
+        if ticker is None:
+            _memory.clear()
+        else:
+            _memory.pop(ticker.upper(), None)
+
+
+def stats():
+    """Hit/miss counters plus the derived hit rate."""
+    with _lock:
+        out = dict(_stats)
+        out["cached_tickers"] = len(_memory)
+    served = out["memory_hits"] + out["disk_hits"] + out["misses"]
+    out["hit_rate"] = (out["memory_hits"] + out["disk_hits"]) / served if served else 0.0
+    return out
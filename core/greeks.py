@@ -0,0 +1,194 @@
+"""
+GREEKS // vectorized Black-Scholes-Merton over a whole option chain.
+
+Every function takes NumPy arrays (one element per contract) and does no
+per-contract Python work:
+
+  implied_vol   safeguarded Newton on vega; any step that leaves the running
+                [lo, hi] bracket (or meets a vanishing vega) is replaced by a
+                bisection step, so every contract converges or is NaN
+  greeks        delta, gamma, vega (per 1.00 vol), theta (per year)
+  gamma_exposure / zero_gamma
+                dealer GEX by strike (dealers long calls, short puts: the
+                usual street convention) and the spot level where total GEX
+                changes sign, from a vectorized spot x contract grid
+
+The normal CDF is West's double-precision rational approximation (Hart
+5666), so no SciPy is needed.
+"""
+import numpy as np
+import pandas as pd
+
+RATE = 0.04                 # default risk-free rate (continuous)
+IV_BOUNDS = (1e-4, 5.0)
+TOL = 1e-8                  # price tolerance, relative to the price
+MAX_ITER = 60
+CONTRACT = 100              # shares per contract
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+# --- 1. NORMAL DISTRIBUTION ---
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def norm_cdf(x):
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+    num = ((((((0.0352624965998911 * z + 0.700383064443688) * z + 6.37396220353165) * z + 33.912866078383) * z
+             + 112.079291497871) * z + 221.213596169931) * z + 220.206867912376)
+    den = (((((((0.0883883476483184 * z + 1.75566716318264) * z + 16.064177579207) * z + 86.7807322029461) * z
+              + 296.564248779674) * z + 637.333633378831) * z + 793.826512519948) * z + 440.413735824752)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail = e / (z + 1 / (z + 2 / (z + 3 / (z + 4 / (z + 0.65))))) / _SQRT_2PI
+    c = np.where(z < 7.07106781186547, e * num / den, tail)
+    c = np.where(z > 37, 0.0, c)
+    return np.where(x > 0, 1 - c, c)
+
+
+# --- 2. PRICE & GREEKS ---
+def _d1d2(S, K, T, sigma, r, q):
+    vt = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / vt
+    return d1, d1 - vt
+
+
+def price(S, K, T, sigma, is_call, r=RATE, q=0.0):
+    d1, d2 = _d1d2(S, K, T, sigma, r, q)
+    fs, dk = S * np.exp(-q * T), K * np.exp(-r * T)
+    call = fs * norm_cdf(d1) - dk * norm_cdf(d2)
+    return np.where(is_call, call, call - fs + dk)        # put-call parity
+
+
+def greeks(S, K, T, sigma, is_call, r=RATE, q=0.0):
+    """{"delta", "gamma", "vega", "theta"}; vega per 1.00 of vol, theta per year."""
+    d1, d2 = _d1d2(S, K, T, sigma, r, q)
+    dq, dr, pdf, sq = np.exp(-q * T), np.exp(-r * T), norm_pdf(d1), np.sqrt(T)
+    n1, n2 = norm_cdf(d1), norm_cdf(d2)
+    decay = -S * dq * pdf * sigma / (2 * sq)
+    call_theta = decay - r * K * dr * n2 + q * S * dq * n1
+    put_theta = decay + r * K * dr * (1 - n2) - q * S * dq * (1 - n1)
+    return {
+        "delta": np.where(is_call, dq * n1, dq * (n1 - 1)),
+        "gamma": dq * pdf / (S * sigma * sq),
+        "vega": S * dq * pdf * sq,
+        "theta": np.where(is_call, call_theta, put_theta),
+    }
+
+
+# --- 3. IMPLIED VOL ---
+def implied_vol(prices, S, K, T, is_call, r=RATE, q=0.0, tol=TOL, max_iter=MAX_ITER):
+    """
+    IV for every contract at once. NaN where the price is outside the
+    no-arbitrage bounds or the solver did not converge within max_iter.
+    """
+    p = np.asarray(prices, dtype=float)
+    K, T = np.broadcast_to(K, p.shape).astype(float), np.broadcast_to(T, p.shape).astype(float)
+    is_call = np.broadcast_to(is_call, p.shape)
+    fs, dk = S * np.exp(-q * T), K * np.exp(-r * T)
+    # Solve in-the-money contracts as their out-of-the-money twin (put-call parity):
+    # an ITM price is mostly intrinsic value and pins sigma down far less precisely.
+    itm = np.where(is_call, dk < fs, dk > fs)
+    p = np.where(itm, np.where(is_call, p - fs + dk, p + fs - dk), p)
+    is_call = is_call ^ itm
+    upper = np.where(is_call, fs, dk)
+    iv = np.full(p.shape, np.nan)
+    ok = np.isfinite(p) & (p > 0) & (p < upper) & (T > 0) & (K > 0)
+    idx = np.flatnonzero(ok)
+    if not len(idx):
+        return iv
+
+    # Active set only: converged contracts drop out of every later iteration
+    p, K, T, c = p[idx], K[idx], T[idx], is_call[idx]
+    lo, hi = np.full(len(idx), IV_BOUNDS[0]), np.full(len(idx), IV_BOUNDS[1])
+    # Brenner-Subrahmanyam start, clipped into the bracket
+    sigma = np.clip(np.sqrt(2 * np.pi / T) * p / S, 0.05, 2.0)
+    eps = np.maximum(tol * p, 1e-14)
+    for _ in range(max_iter):
+        d1, _ = _d1d2(S, K, T, sigma, r, q)
+        diff = price(S, K, T, sigma, c, r, q) - p
+        done = np.abs(diff) < eps
+        if done.any():
+            iv[idx[done]] = sigma[done]
+            keep = ~done
+            idx, p, K, T, c, sigma, lo, hi, eps, diff, d1 = (a[keep] for a in (idx, p, K, T, c, sigma, lo, hi, eps, diff, d1))
+            if not len(idx):
+                break
+        # Price is increasing in sigma: tighten the bracket, then try Newton
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff < 0, sigma, lo)
+        vega = S * np.exp(-q * T) * norm_pdf(d1) * np.sqrt(T)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = sigma - diff / vega
+        bad = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        sigma = np.where(bad, 0.5 * (lo + hi), step)
+    return iv
+
+
+# --- 4. CHAIN ---
+_priced = {}    # (symbol, fetched, r, q) -> frame; one entry per symbol
+
+
+def price_chain(chain, r=RATE, q=0.0):
+    """
+    chain.frame plus iv (solved from mid), delta, gamma, vega, theta.
+    Cached per chain snapshot, so reruns on the same snapshot are free.
+    """
+    key = (chain.symbol, chain.fetched, r, q)
+    hit = _priced.get(chain.symbol)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    f = chain.frame
+    K, T = f["strike"].to_numpy(dtype=float), f["tenor"].to_numpy(dtype=float)
+    is_call = (f["type"] == "CALL").to_numpy()
+    iv = implied_vol(f["mid"].to_numpy(dtype=float), chain.spot, K, T, is_call, r, q)
+    g = greeks(chain.spot, K, T, iv, is_call, r, q)
+    out = f.assign(iv=iv, **g)
+    _priced[chain.symbol] = (key, out)
+    return out
+
+
+def gamma_exposure(frame, spot):
+    """Dealer GEX ($ per 1% move) by strike: +calls, -puts, gamma * OI * 100 * S^2 * 1%."""
+    sign = np.where(frame["type"].to_numpy() == "CALL", 1.0, -1.0)
+    gex = sign * np.nan_to_num(frame["gamma"].to_numpy()) * frame["openInterest"].to_numpy() * CONTRACT * spot * spot * 0.01
+    return pd.Series(gex, index=frame["strike"].to_numpy()).groupby(level=0).sum().rename("gex")
+
+
+def gamma_profile(frame, spots, r=RATE, q=0.0):
+    """Total dealer GEX at each hypothetical spot in `spots` (IVs held fixed)."""
+    live = frame[np.isfinite(frame["iv"].to_numpy()) & (frame["openInterest"].to_numpy() > 0)]
+    K, T, iv = (live[c].to_numpy(dtype=float) for c in ("strike", "tenor", "iv"))
+    w = np.where(live["type"].to_numpy() == "CALL", 1.0, -1.0) * live["openInterest"].to_numpy() * CONTRACT
+    S = np.asarray(spots, dtype=float)[:, None]                         # (spots, contracts)
+    d1, _ = _d1d2(S, K, T, iv, r, q)
+    gamma = np.exp(-q * T) * norm_pdf(d1) / (S * iv * np.sqrt(T))
+    return (gamma @ w) * S[:, 0] ** 2 * 0.01
+
+
+def zero_gamma(frame, spot, width=0.2, points=41, r=RATE, q=0.0, iters=30):
+    """
+    Spot level where total dealer GEX crosses zero within +/- width of spot:
+    the sign change nearest spot on a coarse profile, refined by bisection
+    (one vectorized pass over the chain per step).
+    Returns (level or None, spots, profile).
+    """
+    spots = np.linspace(spot * (1 - width), spot * (1 + width), points)
+    prof = gamma_profile(frame, spots, r, q)
+    cross = np.flatnonzero(np.sign(prof[:-1]) * np.sign(prof[1:]) < 0)
+    if not len(cross):
+        return None, spots, prof
+    i = cross[np.argmin(np.abs(spots[cross] - spot))]
+    lo, hi, f_lo = spots[i], spots[i + 1], prof[i]
+    for _ in range(iters):
+        mid = 0.5 * (lo + hi)
+        f_mid = gamma_profile(frame, [mid], r, q)[0]
+        if np.sign(f_mid) == np.sign(f_lo):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+        if hi - lo < 1e-4 * spot:
+            break
+    return float(0.5 * (lo + hi)), spots, prof
@@ -0,0 +1,50 @@
+"""
+HOLDINGS // the session's portfolios as {symbol: weight}, plus aligned closes.
+
+Two pages keep a portfolio in st.session_state:
+  Beginner_Home      portfolio_df  (Asset, Weight in %)
+  Trading_Simulator  portfolio     {ticker: {qty, avg_price}}
+
+Both are read here so the risk and simulation pages agree on what "the
+portfolio" is. Functions take the session-state mapping instead of importing
+streamlit.
+"""
+import pandas as pd
+
+from core import bars, workers
+
+CRYPTO_ALIASES = {"BTC": "BTC-USD", "ETH": "ETH-USD", "SOL": "SOL-USD"}
+SOURCES = ("BEGINNER_HOME ALLOCATION", "TRADING_SIM POSITIONS")
+
+
+def allocation_weights(state):
+    """Beginner_Home's allocation (weights in %)."""
+    pdf = state.get("portfolio_df")
+    if pdf is None or pdf.empty:
+        return {}
+    return {CRYPTO_ALIASES.get(a, a): float(w) for a, w in zip(pdf["Asset"], pdf["Weight"]) if w > 0}
+
+
+def position_weights(state):
+    """Trading_Simulator's open positions, weighted by market value (last stored close)."""
+    weights = {}
+    for t, d in state.get("portfolio", {}).items():
+        last = bars.store.bars(t) if d.get("qty", 0) > 0 else ()
+        if len(last):
+            weights[t] = d["qty"] * float(last[-1, 4])
+    return weights
+
+
+def weights(state, source):
+    return allocation_weights(state) if source == SOURCES[0] else position_weights(state)
+
+
+def aligned_closes(symbols, period="2y"):
+    """(days x symbols) daily closes on the calendar days every symbol traded."""
+    series = workers.io_pool.map(lambda s: bars.history(s, period=period)["Close"], symbols)
+    cols = {}
+    for s, c in zip(symbols, series):
+        if len(c):
+            c.index = c.index.tz_localize(None).normalize()   # crypto (UTC) and equities (NY) share calendar days
+            cols[s] = c[~c.index.duplicated(keep="last")]
+    return pd.DataFrame(cols).dropna()
@@ -0,0 +1,399 @@
+"""
+STREAMING INDICATORS // incremental Wilder RSI, EMA/MACD, SMA, Bollinger, ATR.
+
+Each indicator keeps O(1) state (a few floats, or a fixed-length window) and
+consumes one bar at a time, so a render only pays for the bars that arrived
+since the last one. Only that state (plus the bar count, the last committed
+timestamp and the bar store's epoch) is checkpointed to disk per (symbol,
+interval), so a checkpoint is constant-size, and it is revalidated against
+the bar store on load. The full indicator history a chart needs lives only
+in memory: frame() builds it once from the bar store with the matrix forms
+below (same definitions and seeding), then extends it bar by bar from a copy
+of the streaming state as bars are appended. The matrix pass runs again only
+when the store's epoch changes (history re-adjusted or rebuilt).
+
+Closed bars are committed to the state; the newest bar is treated as still
+forming and evaluated on a throwaway copy, so an intraday update of today's
+daily bar never corrupts the committed state.
+
+Technical_Analysis and Street Intelligence both read from here, so they show
+the same RSI / SMA numbers.
+"""
+import copy
+import math
+import os
+import pickle
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core import bars, cache_path
+
+NAN = float("nan")
+
+
+# --- 1. O(1) INDICATOR STATES ---
+class EMA:
+    """EMA seeded with the SMA of the first n inputs (pandas_ta convention)."""
+    def __init__(self, n):
+        self.n, self.alpha = n, 2.0 / (n + 1)
+        self.value, self._sum, self._count = None, 0.0, 0
+
+    def update(self, x):
+        if self.value is None:
+            self._sum += x
+            self._count += 1
+            if self._count == self.n:
+                self.value = self._sum / self.n
+        else:
+            self.value += self.alpha * (x - self.value)
+        return NAN if self.value is None else self.value
+
+
+class SMA:
+    def __init__(self, n):
+        self.n, self.window, self.total = n, deque(maxlen=n), 0.0
+
+    def update(self, x):
+        if len(self.window) == self.n:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / self.n if len(self.window) == self.n else NAN
+
+
+class WilderRSI:
+    def __init__(self, n=14):
+        self.n, self.prev = n, None
+        self.avg_gain = self.avg_loss = None
+        self._g = self._l = 0.0
+        self._count = 0
+
+    def update(self, close):
+        if self.prev is None:
+            self.prev = close
+            return NAN
+        delta, self.prev = close - self.prev, close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if self.avg_gain is None:
+            self._g += gain
+            self._l += loss
+            self._count += 1
+            if self._count < self.n:
+                return NAN
+            self.avg_gain, self.avg_loss = self._g / self.n, self._l / self.n
+        else:
+            self.avg_gain = (self.avg_gain * (self.n - 1) + gain) / self.n
+            self.avg_loss = (self.avg_loss * (self.n - 1) + loss) / self.n
+        if self.avg_loss == 0:
+            return 50.0 if self.avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class MACD:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+
+    def update(self, close):
+        f, s = self.fast.update(close), self.slow.update(close)
+        if math.isnan(s):
+            return NAN, NAN, NAN
+        line = f - s
+        sig = self.signal.update(line)
+        return line, sig, line - sig
+
+
+class Bollinger:
+    """Middle = SMA(n); bands at k population standard deviations."""
+    def __init__(self, n=20, k=2.0):
+        self.sma, self.k = SMA(n), k
+
+    def update(self, close):
+        mid = self.sma.update(close)
+        if math.isnan(mid):
+            return NAN, NAN, NAN
+        w = self.sma.window
+        sd = math.sqrt(max(sum((x - mid) ** 2 for x in w) / len(w), 0.0))
+        return mid + self.k * sd, mid, mid - self.k * sd
+
+
+class WilderATR:
+    def __init__(self, n=14):
+        self.n, self.prev_close, self.value = n, None, None
+        self._sum, self._count = 0.0, 0
+
+    def update(self, high, low, close):
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        if self.value is None:
+            self._sum += tr
+            self._count += 1
+            if self._count == self.n:
+                self.value = self._sum / self.n
+        else:
+            self.value = (self.value * (self.n - 1) + tr) / self.n
+        return NAN if self.value is None else self.value
+
+
+# --- 2. PER-SYMBOL BUNDLE ---
+OUTPUTS = ("RSI", "MACD", "MACD_SIGNAL", "MACD_HIST", "SMA20", "SMA50", "SMA200",
+           "BB_UPPER", "BB_MID", "BB_LOWER", "ATR")
+
+
+class IndicatorSet:
+    def __init__(self):
+        self.rsi = WilderRSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.sma = {n: SMA(n) for n in (20, 50, 200)}
+        self.bb = Bollinger(20, 2.0)
+        self.atr = WilderATR(14)
+
+    def update(self, high, low, close):
+        """Consume one bar; returns a tuple aligned with OUTPUTS."""
+        rsi = self.rsi.update(close)
+        line, sig, hist = self.macd.update(close)
+        smas = tuple(self.sma[n].update(close) for n in (20, 50, 200))
+        upper, mid, lower = self.bb.update(close)
+        atr = self.atr.update(high, low, close)
+        return (rsi, line, sig, hist) + smas + (upper, mid, lower, atr)
+
+
+class _Track:
+    """Committed state through bar `n - 1` (O(1) size: no per-bar outputs)."""
+    def __init__(self, epoch=0):
+        self.n = 0
+        self.last_ts = None
+        self.epoch = epoch          # bar store epoch the state was built on
+        self.state = IndicatorSet()
+
+
+def history_matrix(high, low, close):
+    """{output: array} for every bar at once (matrix forms, same values as IndicatorSet)."""
+    h, l, c = (np.asarray(a, dtype=float)[:, None] for a in (high, low, close))
+    cols = (wilder_rsi_matrix(c),) + macd_matrix(c) + tuple(sma_matrix(c, n) for n in (20, 50, 200)) \
+        + bollinger_matrix(c) + (wilder_atr_matrix(h, l, c),)
+    return {k: a[:, 0] for k, a in zip(OUTPUTS, cols)}
+
+
+class _History:
+    """In-memory indicator history for the first `n` bars, and a state copy advanced through them."""
+    def __init__(self, epoch, n, state, cols, ts):
+        self.epoch, self.n, self.state = epoch, n, state
+        self.cols, self.ts = cols, np.asarray(ts, dtype=float)
+        self.last_ts = float(self.ts[-1]) if n else None
+
+
+# --- 3. ENGINE ---
+class IndicatorEngine:
+    def __init__(self, store=None, root=None):
+        self.store = store or bars.store
+        self.root = root
+        self._tracks = {}
+        self._history = {}      # key -> _History (committed outputs + the state that produced them)
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _path(self, symbol, interval):
+        name = f"{symbol.replace('/', '_')}.pkl"
+        if self.root:
+            path = os.path.join(self.root, interval, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return path
+        return cache_path("indicators", interval, name)
+
+    def _lock(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load(self, symbol, interval):
+        try:
+            with open(self._path(symbol, interval), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _save(self, symbol, interval, track):
+        path = self._path(symbol, interval)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(track, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def sync(self, symbol, interval="1d", refresh=True):
+        """
+        Bring the committed state up to the newest closed bar and evaluate the
+        forming bar on a copy. Returns (bar_array, track, forming_outputs).
+        """
+        symbol = symbol.upper()
+        key = (symbol, interval)
+        arr = self.store.bars(symbol, interval, refresh=refresh)
+        epoch = self.store.epoch(symbol, interval)
+        with self._lock(key):
+            track = self._tracks.get(key) or self._load(symbol, interval)
+            # Checkpoint must still line up with the bar store (it may have been rebuilt or re-adjusted).
+            if (track is None or getattr(track, "epoch", None) != epoch or track.n > len(arr)
+                    or (track.n and arr[track.n - 1, 0] != track.last_ts)):
+                track = _Track(epoch)
+
+            closed = len(arr) - 1
+            if closed > track.n:
+                for row in arr[track.n:closed]:
+                    track.state.update(row[2], row[3], row[4])
+                track.n = closed
+                track.last_ts = float(arr[closed - 1, 0])
+                self._save(symbol, interval, track)
+            self._tracks[key] = track
+
+            forming = None
+            if len(arr):
+                last = arr[-1]
+                forming = copy.deepcopy(track.state).update(last[2], last[3], last[4])
+        return arr, track, forming
+
+    def _committed(self, symbol, interval, arr, track):
+        """Outputs for every closed bar: extended from the cached history when bars were only appended."""
+        key = (symbol, interval)
+        hist = self._history.get(key)
+        if (hist is None or hist.epoch != track.epoch or hist.n > track.n
+                or (hist.n and arr[hist.n - 1, 0] != hist.last_ts)):
+            # First build or re-adjusted history: one matrix pass over the closed bars
+            closed = arr[:track.n]
+            cols = history_matrix(closed[:, 2], closed[:, 3], closed[:, 4])
+            hist = _History(track.epoch, track.n, copy.deepcopy(track.state), cols, closed[:, 0])
+        elif hist.n < track.n:
+            new = arr[hist.n:track.n]
+            rows = np.array([hist.state.update(r[2], r[3], r[4]) for r in new], dtype=float).reshape(len(new), -1)
+            hist.cols = {k: np.concatenate([v, rows[:, i]]) for i, (k, v) in enumerate(hist.cols.items())}
+            hist.ts = np.concatenate([hist.ts, new[:, 0]])
+            hist.n = track.n
+        hist.last_ts = float(hist.ts[-1]) if hist.n else None
+        self._history[key] = hist
+        return hist
+
+    def frame(self, symbol, interval="1d", period=None, refresh=True):
+        """Indicator history (committed + forming bar) indexed like bars.history()."""
+        symbol = symbol.upper()
+        arr, track, forming = self.sync(symbol, interval, refresh=refresh)
+        with self._lock((symbol, interval)):
+            hist = self._committed(symbol, interval, arr, track)
+            cols, ts = hist.cols, hist.ts
+        if forming is not None:
+            cols = {k: np.append(v, forming[i]) for i, (k, v) in enumerate(cols.items())}
+            ts = np.append(ts, arr[-1, 0])
+        tz = self.store.tz(symbol, interval)
+        index = pd.DatetimeIndex(pd.to_datetime(ts, unit="s", utc=True)).tz_convert(tz)
+        df = pd.DataFrame(cols, index=index)
+        if period is not None and len(df):
+            first = df.index[-1].normalize() - pd.Timedelta(days=bars.PERIOD_DAYS.get(period, 365) - 1)
+            df = df[df.index >= first]
+        return df
+
+    def latest(self, symbol, interval="1d", refresh=True):
+        """{output: value} for the newest (possibly forming) bar."""
+        _, track, forming = self.sync(symbol, interval, refresh=refresh)
+        if forming is None:
+            return {k: NAN for k in OUTPUTS}
+        return dict(zip(OUTPUTS, forming))
+
+
+engine = IndicatorEngine()
+
+
+def frame(symbol, interval="1d", period=None, refresh=True):
+    return engine.frame(symbol, interval, period, refresh)
+
+
+def latest(symbol, interval="1d", refresh=True):
+    return engine.latest(symbol, interval, refresh)
+
+
+# --- 4. MATRIX FORM (same definitions, vectorized across symbols) ---
+def wilder_rsi_matrix(close, n=14):
+    """
+    Wilder RSI for a (days, symbols) close matrix, seeded exactly like
+    WilderRSI. Loops over time only; every step is vectorized over symbols.
+    Returns a (days, symbols) array (NaN during warm-up).
+    """
+    close = np.asarray(close, dtype=float)
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] <= n:
+        return out
+    delta = np.diff(close, axis=0)
+    gain, loss = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    # Only the smoothing recursion is sequential; RSI itself is one vector op at the end
+    avg_g, avg_l = np.empty_like(gain[n - 1:]), np.empty_like(loss[n - 1:])
+    avg_g[0], avg_l[0] = gain[:n].mean(axis=0), loss[:n].mean(axis=0)
+    for i, t in enumerate(range(n, delta.shape[0]), start=1):
+        avg_g[i] = (avg_g[i - 1] * (n - 1) + gain[t]) / n
+        avg_l[i] = (avg_l[i - 1] * (n - 1) + loss[t]) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_g / avg_l)
+    out[n:] = np.where(avg_l == 0, np.where(avg_g == 0, 50.0, 100.0), rsi)
+    return out
+
+
+def ema_matrix(x, n, start=0):
+    """
+    Column-wise EMA seeded like EMA: the SMA of the first n rows from `start`
+    (rows before `start` are warm-up NaNs of an upstream indicator).
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    seed = start + n - 1
+    if x.shape[0] <= seed:
+        return out
+    alpha = 2.0 / (n + 1)
+    out[seed] = x[start:seed + 1].mean(axis=0)
+    for t in range(seed + 1, x.shape[0]):
+        out[t] = out[t - 1] + alpha * (x[t] - out[t - 1])
+    return out
+
+
+def macd_matrix(close, fast=12, slow=26, signal=9):
+    """(line, signal, hist) matrices matching MACD."""
+    line = ema_matrix(close, fast) - ema_matrix(close, slow)
+    sig = ema_matrix(line, signal, start=slow - 1)
+    return line, sig, line - sig
+
+
+def sma_matrix(x, n):
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] < n:
+        return out
+    c = np.cumsum(np.vstack([np.zeros((1,) + x.shape[1:]), x]), axis=0)
+    out[n - 1:] = (c[n:] - c[:-n]) / n
+    return out
+
+
+def bollinger_matrix(close, n=20, k=2.0):
+    """(upper, mid, lower) with population std, matching Bollinger."""
+    close = np.asarray(close, dtype=float)
+    mid = sma_matrix(close, n)
+    # Centre on the column mean first so the E[x^2] - E[x]^2 form keeps its precision
+    centred = close - np.nanmean(close, axis=0)
+    var = sma_matrix(centred ** 2, n) - sma_matrix(centred, n) ** 2
+    sd = np.sqrt(np.clip(var, 0, None))
+    return mid + k * sd, mid, mid - k * sd
+
+
+def wilder_atr_matrix(high, low, close, n=14):
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] < n:
+        return out
+    tr = high - low
+    prev = close[:-1]
+    tr[1:] = np.maximum(np.maximum(tr[1:], np.abs(high[1:] - prev)), np.abs(low[1:] - prev))
+    out[n - 1] = tr[:n].mean(axis=0)
+    for t in range(n, close.shape[0]):
+        out[t] = (out[t - 1] * (n - 1) + tr[t]) / n
+    return out
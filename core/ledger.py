@@ -0,0 +1,232 @@
+"""
+TRADE LEDGER // durable, append-only account history in SQLite (WAL).
+
+Every cash or trade event is appended to `events` and never rewritten. Cash
+and positions are a fold over those events, kept materialized in memory and
+updated one event at a time. Every COMPACT_EVERY events the fold is written
+to `snapshots`, so opening an account reads one snapshot row plus the short
+tail of events after it instead of replaying the whole history.
+
+State: {"cash", "start", "realized", "positions": {symbol: {"qty", "avg_price"}}}
+
+Subscribers (performance analytics) receive every appended event as
+(account, seq, ts, kind, symbol, qty, price), after the ledger lock is released.
+They can checkpoint their own fold in `analytics` (one row per account, with
+the seq it covers) and reopen from it plus events(account, after=seq).
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from core import cache_path
+
+START_CASH = 100_000.0
+COMPACT_EVERY = 500   # events between snapshots
+MARKER_LIMIT = 500    # most recent trades drawn on the chart
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    symbol TEXT,
+    qty REAL,
+    price REAL
+);
+CREATE INDEX IF NOT EXISTS ix_events_account ON events(account, seq);
+CREATE INDEX IF NOT EXISTS ix_events_kind ON events(account, kind, seq);
+CREATE TABLE IF NOT EXISTS snapshots (
+    account TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analytics (
+    account TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+
+def empty_state(cash=START_CASH):
+    return {"cash": float(cash), "start": float(cash), "realized": 0.0, "positions": {}}
+
+
+def apply(state, kind, symbol, qty, price):
+    """Fold one event into `state` (in place). RESET replaces the account."""
+    if kind == "RESET":
+        state.clear()
+        state.update(empty_state(price))
+    elif kind == "BUY":
+        pos = state["positions"].setdefault(symbol, {"qty": 0.0, "avg_price": 0.0})
+        new_qty = pos["qty"] + qty
+        pos["avg_price"] = (pos["avg_price"] * pos["qty"] + price * qty) / new_qty
+        pos["qty"] = new_qty
+        state["cash"] -= price * qty
+    elif kind == "SELL":
+        pos = state["positions"][symbol]
+        pos["qty"] -= qty
+        state["cash"] += price * qty
+        state["realized"] += (price - pos["avg_price"]) * qty
+        if pos["qty"] <= 1e-12:
+            del state["positions"][symbol]
+    return state
+
+
+class Ledger:
+    def __init__(self, path=None):
+        self._db = sqlite3.connect(path or cache_path("ledger.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._live = {}   # account -> [last seq folded, state, events since last snapshot]
+        self._subscribers = []
+
+    # --- 1. LOAD (snapshot + tail) ---
+    def _load(self, account):
+        row = self._db.execute("SELECT seq, state FROM snapshots WHERE account=?", (account,)).fetchone()
+        seq, state = (row[0], json.loads(row[1])) if row else (0, None)
+        tail = self._db.execute(
+            "SELECT seq, kind, symbol, qty, price FROM events WHERE account=? AND seq>? ORDER BY seq", (account, seq)
+        ).fetchall()
+        if state is None:
+            state = empty_state()
+        for seq, kind, symbol, qty, price in tail:
+            apply(state, kind, symbol, qty, price)
+        live = [seq, state, len(tail)]
+        self._live[account] = live
+        return live
+
+    def _get(self, account):
+        return self._live.get(account) or self._load(account)
+
+    def state(self, account):
+        """Deep-enough copy of the materialized account state."""
+        with self._lock:
+            _, st, _ = self._get(account)
+            return {**st, "positions": {s: dict(p) for s, p in st["positions"].items()}}
+
+    # --- 2. APPEND ---
+    def _append(self, account, kind, symbol=None, qty=0.0, price=0.0):
+        live = self._get(account)
+        ts, qty, price = time.time(), float(qty), float(price)
+        with self._db:
+            cur = self._db.execute(
+                "INSERT INTO events (account, ts, kind, symbol, qty, price) VALUES (?,?,?,?,?,?)",
+                (account, ts, kind, symbol, qty, price),
+            )
+        live[0] = cur.lastrowid
+        live[2] += 1
+        apply(live[1], kind, symbol, qty, price)
+        if live[2] >= COMPACT_EVERY:
+            self._compact(account, live)
+        return account, cur.lastrowid, ts, kind, symbol, qty, price
+
+    def _notify(self, event):
+        for fn in list(self._subscribers):
+            fn(*event)
+
+    def subscribe(self, fn):
+        """Call fn(account, seq, ts, kind, symbol, qty, price) for every appended event."""
+        if fn not in self._subscribers:
+            self._subscribers.append(fn)
+
+    def _compact(self, account, live):
+        with self._db:
+            self._db.execute(
+                "INSERT INTO snapshots (account, seq, state) VALUES (?,?,?) "
+                "ON CONFLICT(account) DO UPDATE SET seq=excluded.seq, state=excluded.state",
+                (account, live[0], json.dumps(live[1])),
+            )
+        live[2] = 0
+
+    def buy(self, account, symbol, qty, price):
+        """Append a BUY if cash allows. Raises ValueError otherwise."""
+        with self._lock:
+            cash = self._get(account)[1]["cash"]
+            if price <= 0 or qty <= 0:
+                raise ValueError("no valid price / quantity")
+            if cash < price * qty:
+                raise ValueError(f"insufficient cash (${cash:,.2f} < ${price * qty:,.2f})")
+            event = self._append(account, "BUY", symbol, qty, price)
+        self._notify(event)
+
+    def sell(self, account, symbol, qty, price):
+        """Append a SELL if the position covers it. Raises ValueError otherwise."""
+        with self._lock:
+            held = self._get(account)[1]["positions"].get(symbol, {}).get("qty", 0.0)
+            if price <= 0 or qty <= 0:
+                raise ValueError("no valid price / quantity")
+            if held < qty:
+                raise ValueError(f"position too small ({held:g} < {qty:g})")
+            event = self._append(account, "SELL", symbol, qty, price)
+        self._notify(event)
+
+    def reset(self, account, cash=START_CASH):
+        with self._lock:
+            event = self._append(account, "RESET", price=cash)
+            self._compact(account, self._live[account])
+        self._notify(event)
+
+    # --- 3. HISTORY ---
+    def events(self, account, after=0):
+        """
+        Every event from the last RESET on (oldest first), as (seq, ts, kind,
+        symbol, qty, price), limited to seq > `after`.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT seq, ts, kind, symbol, qty, price FROM events WHERE account=? AND seq>? "
+                "AND seq >= COALESCE((SELECT MAX(seq) FROM events WHERE account=? AND kind='RESET'), 0) "
+                "ORDER BY seq",
+                (account, after, account),
+            ).fetchall()
+
+    def analytics(self, account):
+        """(seq, state) of the account's analytics checkpoint, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT seq, state FROM analytics WHERE account=?", (account,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def save_analytics(self, account, seq, state):
+        """Checkpoint a subscriber's fold of the events through `seq`."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO analytics (account, seq, state) VALUES (?,?,?) "
+                "ON CONFLICT(account) DO UPDATE SET seq=excluded.seq, state=excluded.state",
+                (account, seq, json.dumps(state)),
+            )
+
+    def trades(self, account, limit=MARKER_LIMIT):
+        """Most recent trades since the last reset, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ts, kind, symbol, qty, price FROM events WHERE account=? AND kind IN ('BUY','SELL') "
+                "AND seq > COALESCE((SELECT MAX(seq) FROM events WHERE account=? AND kind='RESET'), 0) "
+                "ORDER BY seq DESC LIMIT ?",
+                (account, account, limit),
+            ).fetchall()
+        return [{"ts": ts, "kind": k, "symbol": s, "qty": q, "price": p} for ts, k, s, q, p in reversed(rows)]
+
+    def markers(self, account, symbol=None, limit=MARKER_LIMIT):
+        """Chart arrows in the shape Trading_Simulator's widget expects."""
+        out = []
+        for t in self.trades(account, limit):
+            if symbol and t["symbol"] != symbol:
+                continue
+            buy = t["kind"] == "BUY"
+            out.append({
+                "time": datetime.fromtimestamp(t["ts"]).strftime("%Y-%m-%d"),
+                "position": "belowBar" if buy else "aboveBar",
+                "color": "#0088ff" if buy else "#ff4b4b",
+                "shape": "arrowUp" if buy else "arrowDown",
+                "text": t["kind"],
+            })
+        return out
+
+
+ledger = Ledger()
@@ -0,0 +1,61 @@
+"""
+MARKET DATASETS // HUD scan + momentum ranks for terminal.py.
+
+Both datasets are refreshed by the background refresher a little ahead of the
+old st.cache_data TTLs (60 s / 300 s), so a render never waits on yf.download.
+"""
+import pandas as pd
+import yfinance as yf
+
+from core import momentum, universe
+from core.scheduler import refresher
+
+GLOBAL_SYMBOLS = {
+    "ES_FUT": "ES=F", "NQ_FUT": "NQ=F", "10Y_YIELD": "^TNX",
+    "VIX": "^VIX", "DXY": "DX-Y.NYB", "OIL": "CL=F",
+    "GOLD": "GC=F", "EURO": "EURUSD=X", "BTC": "BTC-USD", "ETH": "ETH-USD"
+}
+
+RANK_DEPTH = 10
+
+SCAN_EVERY = 45
+RANKS_EVERY = 240
+
+
+def fetch_global_scan():
+    df = yf.download(list(GLOBAL_SYMBOLS.values()), period="5d", interval="1d", progress=False)
+    closes = df['Close'] if isinstance(df.columns, pd.MultiIndex) else df
+
+    data = {}
+    for k, v in GLOBAL_SYMBOLS.items():
+        series = closes[v].dropna() if v in closes.columns else pd.Series(dtype=float)
+        if len(series) >= 2:
+            curr = series.iloc[-1]
+            prev = series.iloc[-2]
+            chg = ((curr - prev) / prev) * 100
+            fmt = f"{curr:,.0f}" if "BTC" in k or "ETH" in k else f"{curr:,.2f}"
+            data[k] = {"price": fmt, "chg": float(chg)}
+        else:
+            data[k] = {"price": "N/A", "chg": 0.0}
+    return data
+
+
+def get_alpha_ranks():
+    """Full S&P 500 momentum ranks: chunked batch download + one vectorized pass."""
+    symbols, closes = momentum.download_closes(universe.sp500(), period="5d")
+    if not symbols:
+        raise ValueError("no closes returned for the S&P 500 universe")
+    return momentum.rank(symbols, closes, k=RANK_DEPTH)
+
+
+refresher.register("global_scan", fetch_global_scan, SCAN_EVERY)
+refresher.register("alpha_ranks", get_alpha_ranks, RANKS_EVERY)
+
+
+def global_scan():
+    """Snapshot of the HUD scan; value is None only if the very first fetch failed."""
+    return refresher.get("global_scan")
+
+
+def alpha_ranks():
+    return refresher.get("alpha_ranks")
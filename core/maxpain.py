@@ -0,0 +1,122 @@
+"""
+MAX PAIN & OI DISTRIBUTION // every expiry of a chain snapshot in one pass.
+
+Open interest is summed per (expiry, strike) for calls and puts and sorted
+once. With strikes K ascending, the total payout to option holders if the
+underlying settles at K_i is
+
+    calls  K_i * sum_{j<=i} C_j  -  sum_{j<=i} C_j K_j
+    puts   sum_{j>=i} P_j K_j   -  K_i * sum_{j>=i} P_j
+
+so segmented prefix / suffix sums give every strike's payout in O(n) after
+the O(n log n) sort, instead of the O(n^2) strike-by-strike payout loop.
+Max pain is the strike with the smallest payout.
+
+Results are cached per chain snapshot, so every expiry is ready as soon as
+the chain loads and switching expiries reads a precomputed row.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+CONTRACT = 100
+
+
+class OIReport(NamedTuple):
+    summary: pd.DataFrame    # per expiry: max pain, OI / volume put-call ratios, walls
+    profile: pd.DataFrame    # per (expiry, strike): OI, cumulative OI, holder payout
+
+
+_reports = {}   # symbol -> ((symbol, fetched), OIReport)
+
+
+def _segment_cumsum(x, starts):
+    """Cumulative sum restarting at each segment start (segments are contiguous)."""
+    c = np.cumsum(x)
+    offset = np.repeat(c[starts] - x[starts], np.diff(np.r_[starts, len(x)]))
+    return c - offset
+
+
+def profile(frame):
+    """(expiry, strike) rows with call / put OI and volume, cumulative OI and payout."""
+    f = frame[["expiry", "type", "strike", "openInterest", "volume"]]
+    calls = f["type"].to_numpy() == "CALL"
+    g = pd.DataFrame({
+        "expiry": f["expiry"].to_numpy(), "strike": f["strike"].to_numpy(dtype=float),
+        "call_oi": np.where(calls, f["openInterest"].to_numpy(), 0),
+        "put_oi": np.where(calls, 0, f["openInterest"].to_numpy()),
+        "call_vol": np.where(calls, f["volume"].to_numpy(), 0),
+        "put_vol": np.where(calls, 0, f["volume"].to_numpy()),
+    }).groupby(["expiry", "strike"], sort=True).sum().reset_index()
+    if g.empty:
+        return g.assign(cum_call=[], cum_put=[], payout=[])
+
+    exp = g["expiry"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, exp[1:] != exp[:-1]])
+    k = g["strike"].to_numpy()
+    c, p = g["call_oi"].to_numpy(dtype=float), g["put_oi"].to_numpy(dtype=float)
+
+    cum_c, cum_ck = _segment_cumsum(c, starts), _segment_cumsum(c * k, starts)
+    # Suffix sums = segment total - prefix sum up to the previous strike
+    ends = np.r_[starts[1:], len(k)] - 1
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(k)]))
+    pre_p, pre_pk = _segment_cumsum(p, starts), _segment_cumsum(p * k, starts)
+    suf_p = pre_p[ends][seg] - pre_p + p
+    suf_pk = pre_pk[ends][seg] - pre_pk + p * k
+
+    g["cum_call"] = cum_c
+    g["cum_put"] = suf_p                      # put OI at or above this strike
+    g["payout"] = (k * cum_c - cum_ck + suf_pk - k * suf_p) * CONTRACT
+    return g
+
+
+def _wall(prof, col):
+    if prof.empty:
+        return pd.Series(dtype=float)
+    return prof.loc[prof.groupby("expiry")[col].idxmax()].set_index("expiry")["strike"]
+
+
+def summarize(prof, spot):
+    """One row per expiry from a profile()."""
+    if prof.empty:
+        return pd.DataFrame(columns=["max_pain", "min_payout", "call_oi", "put_oi", "pc_oi", "pc_volume",
+                                     "call_wall", "put_wall"])
+    by = prof.groupby("expiry", sort=True)
+    pain = prof.loc[by["payout"].idxmin(), ["expiry", "strike", "payout"]].set_index("expiry")
+    totals = by[["call_oi", "put_oi", "call_vol", "put_vol"]].sum()
+    out = pd.DataFrame({
+        "max_pain": pain["strike"],
+        "min_payout": pain["payout"],
+        "call_oi": totals["call_oi"],
+        "put_oi": totals["put_oi"],
+        "pc_oi": totals["put_oi"] / totals["call_oi"].replace(0, np.nan),
+        "pc_volume": totals["put_vol"] / totals["call_vol"].replace(0, np.nan),
+        # Walls: heaviest call OI at/above spot (resistance), heaviest put OI at/below (support)
+        "call_wall": _wall(prof[prof["strike"] >= spot], "call_oi"),
+        "put_wall": _wall(prof[prof["strike"] <= spot], "put_oi"),
+    })
+    out.index.name = "expiry"
+    return out
+
+
+def analyze(chain):
+    """OIReport for every expiry of `chain`, cached per snapshot."""
+    key = (chain.symbol, chain.fetched)
+    hit = _reports.get(chain.symbol)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    prof = profile(chain.frame)
+    report = OIReport(summarize(prof, chain.spot), prof)
+    _reports[chain.symbol] = (key, report)
+    return report
+
+
+def max_pain_naive(strikes, call_oi, put_oi):
+    """Reference O(n^2) payout loop (benchmarks only)."""
+    best, best_k = None, None
+    for s in strikes:
+        total = sum(c * max(s - k, 0) + p * max(k - s, 0) for k, c, p in zip(strikes, call_oi, put_oi))
+        if best is None or total < best:
+            best, best_k = total, s
+    return best_k
@@ -0,0 +1,66 @@
+"""
+TTL MEMO // per-component memoization with versioned entries.
+
+Each entry remembers when it was loaded and a version number. Raw components
+expire on their own TTL; derived components are keyed on the versions of the
+inputs they were computed from, so they are recomputed only when one of those
+inputs was actually reloaded. A value can be stored with its own shorter
+`ttl` (e.g. an empty or failed load) so it is retried soon instead of being
+served for the component's full TTL.
+
+Memos are registered by name at module level so they survive page reruns.
+"""
+import itertools
+import threading
+import time
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class TTLMemo:
+    def __init__(self, max_keys=512):
+        self.max_keys = max_keys
+        self._entries = {}     # key -> (value, loaded_at, version, deps, ttl cap or None)
+        self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+        self.hits = 0
+        self.misses = 0
+
+    def fresh(self, key, ttl):
+        """(value, version) if `key` was loaded less than `ttl` seconds ago, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] < min(ttl, entry[4] or ttl):
+                self.hits += 1
+                return entry[0], entry[2]
+            self.misses += 1
+        return None
+
+    def matching(self, key, deps):
+        """(value, version) if `key` was derived from exactly these input versions."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] == deps:
+                self.hits += 1
+                return entry[0], entry[2]
+            self.misses += 1
+        return None
+
+    def put(self, key, value, deps=None, ttl=None):
+        """Store a value (fresh for at most `ttl` seconds, if given); returns its new version."""
+        with self._lock:
+            version = next(self._versions)
+            self._entries[key] = (value, time.time(), version, deps, ttl)
+            if len(self._entries) > self.max_keys:
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+        return version
+
+
+def shared(name, **kwargs):
+    """Process-wide TTLMemo registered under `name`."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = TTLMemo(**kwargs)
+        return _registry[name]
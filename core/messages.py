@@ -0,0 +1,171 @@
+"""
+MESSAGE STORE // local SQLite log of social + news messages per symbol.
+
+Polls ask each source only for messages newer than the highest id already
+stored (X `since_id:`, Stocktwits `since=`). Rows are keyed by
+(symbol, source, id), and a per-symbol hash of the normalized text drops the
+same headline or post arriving through a second source. A retention window
+and a per-symbol cap bound the table. Renders read from the store, so a feed
+can show far more history than one poll returns.
+
+Only a cold feed (nothing stored for it yet) polls inline, and after an inline
+poll that still leaves it empty (source down, no results, no X cookies) that
+feed backs off inline polls exponentially and is served empty while the
+background poller keeps trying.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import cache_path, feeds
+
+POLL_EVERY = 60             # seconds between polls per symbol
+RETENTION = 3 * 24 * 3600   # drop messages older than this
+MAX_PER_SYMBOL = 500
+COLD_BACKOFF_CAP = 30 * 60  # longest wait between inline polls of a feed that stays empty
+
+# feeds task name -> stored source label, for sources with monotonic numeric ids
+SINCE_SOURCES = {"twitter": "X", "stocktwits": "Stocktwits"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    symbol TEXT NOT NULL,
+    source TEXT NOT NULL,
+    id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    name TEXT,
+    handle TEXT,
+    avatar TEXT,
+    text TEXT,
+    text_hash TEXT NOT NULL,
+    PRIMARY KEY (symbol, source, id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_messages_text ON messages(symbol, text_hash);
+CREATE INDEX IF NOT EXISTS ix_messages_ts ON messages(symbol, ts DESC);
+"""
+
+
+def _text_hash(text):
+    norm = " ".join((text or "").lower().split())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:16]
+
+
+class MessageStore:
+    def __init__(self, path=None):
+        self._db = sqlite3.connect(path or cache_path("messages.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._last_poll = {}
+        self._polling = set()
+        self._cold = {}          # (symbol, sources) -> (empty inline polls, next inline poll allowed at)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yn-msg")
+
+    # --- 1. WRITE PATH ---
+    def since_ids(self, symbol):
+        """{feeds source name: highest numeric id stored} for cursor-capable sources."""
+        out = {}
+        with self._lock:
+            for name, label in SINCE_SOURCES.items():
+                row = self._db.execute(
+                    "SELECT MAX(CAST(id AS INTEGER)) FROM messages WHERE symbol=? AND source=?",
+                    (symbol, label),
+                ).fetchone()
+                if row and row[0]:
+                    out[name] = row[0]
+        return out
+
+    def add(self, symbol, items):
+        """Insert normalized feed items; duplicates (by id or text) are ignored. Returns rows added."""
+        rows = [
+            (
+                symbol, it["source"], str(it["id"]), float(it.get("ts") or time.time()),
+                it["user"].get("name", ""), it["user"].get("screen_name", ""),
+                it["user"].get("profile_image_url_https", ""), it.get("text", ""), _text_hash(it.get("text")),
+            )
+            for it in items
+        ]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO messages VALUES (?,?,?,?,?,?,?,?,?)", rows)
+            added = self._db.total_changes - before
+            self._prune(symbol)
+            self._db.commit()
+        return added
+
+    def _prune(self, symbol):
+        self._db.execute("DELETE FROM messages WHERE ts < ?", (time.time() - RETENTION,))
+        self._db.execute(
+            "DELETE FROM messages WHERE symbol=? AND rowid NOT IN "
+            "(SELECT rowid FROM messages WHERE symbol=? ORDER BY ts DESC LIMIT ?)",
+            (symbol, symbol, MAX_PER_SYMBOL),
+        )
+
+    def poll(self, symbol):
+        """One incremental round across every source. Returns rows added."""
+        try:
+            items = feeds.get_feed(symbol, merge=True, count=30, since=self.since_ids(symbol))
+            return self.add(symbol, items)
+        finally:
+            with self._lock:
+                self._last_poll[symbol] = time.time()
+                self._polling.discard(symbol)
+
+    # --- 2. READ PATH ---
+    def latest(self, symbol, limit=20, sources=None):
+        sql = "SELECT source, id, ts, name, handle, avatar, text FROM messages WHERE symbol=?"
+        args = [symbol]
+        if sources:
+            sql += f" AND source IN ({','.join('?' * len(sources))})"
+            args.extend(sources)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [
+            {"source": src, "id": mid, "ts": ts, "text": text,
+             "user": {"name": name, "screen_name": handle, "profile_image_url_https": avatar}}
+            for src, mid, ts, name, handle, avatar, text in rows
+        ]
+
+    def feed(self, symbol, limit=20, sources=None):
+        """
+        Render entry point. Polls when due: in the background if the store
+        already has something to show for `symbol`, inline on a cold symbol.
+        """
+        symbol = symbol.upper()
+        key = (symbol, tuple(sources or ()))
+        now = time.time()
+        with self._lock:
+            due = now - self._last_poll.get(symbol, 0) >= POLL_EVERY and symbol not in self._polling
+            if due:
+                self._polling.add(symbol)
+            misses, retry_at = self._cold.get(key, (0, 0.0))
+        cached = self.latest(symbol, limit, sources)
+        if due:
+            if cached or now < retry_at:
+                self._pool.submit(self._poll_quietly, symbol)
+            else:
+                self._poll_quietly(symbol)
+                cached = self.latest(symbol, limit, sources)
+                with self._lock:
+                    if cached:
+                        self._cold.pop(key, None)
+                    else:
+                        self._cold[key] = (misses + 1, time.time() + min(POLL_EVERY * 2 ** misses, COLD_BACKOFF_CAP))
+        return cached
+
+    def _poll_quietly(self, symbol):
+        try:
+            self.poll(symbol)
+        except Exception:
+            pass
+
+
+store = MessageStore()
+
+
+def feed(symbol, limit=20, sources=None):
+    return store.feed(symbol, limit=limit, sources=sources)
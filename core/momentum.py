@@ -0,0 +1,61 @@
+"""
+MOMENTUM RANKER // one NumPy pass over a symbols x days close matrix.
+
+score = |1-day % change| * (daily return volatility in %), same definition the
+terminal panel always used, but computed for the whole universe at once and
+reduced to the top k with argpartition instead of a full sort.
+"""
+import numpy as np
+
+from core.panel import download_panel
+
+
+def download_closes(symbols, period="5d", interval="1d"):
+    """Batch-download closes in chunks; returns (symbols, closes[n_sym, n_days])."""
+    wide = download_panel(symbols, period=period, interval=interval, fields=("Close",))["Close"]
+    if wide.empty:
+        return [], np.empty((0, 0))
+    return list(wide.columns), wide.to_numpy(dtype=float).T
+
+
+def _ffill_rows(m):
+    """Forward-fill NaNs along axis 1 without a Python loop."""
+    mask = np.isnan(m)
+    idx = np.where(mask, 0, np.arange(m.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return m[np.arange(m.shape[0])[:, None], idx]
+
+
+def rank(symbols, closes, k=10):
+    """
+    Top-k momentum rows from a (n_symbols, n_days) close matrix.
+    Returns a list of {"sym", "chg", "vol", "score"} sorted by score desc.
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim != 2 or closes.shape[1] < 2 or closes.shape[0] == 0:
+        return []
+    c = _ffill_rows(closes)
+
+    prev, last = c[:, -2], c[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chg = (last - prev) / prev * 100
+        rets = np.diff(c, axis=1) / c[:, :-1]
+        # NaN-aware sample std (ddof=1, like pandas .std()) without nanstd's warnings
+        ok = np.isfinite(rets)
+        n = ok.sum(axis=1)
+        mean = np.where(ok, rets, 0.0).sum(axis=1) / n
+        var = np.where(ok, (rets - mean[:, None]) ** 2, 0.0).sum(axis=1) / (n - 1)
+        vol = np.sqrt(var) * 100
+        score = np.abs(chg) * vol
+
+    valid = np.isfinite(score)
+    score = np.where(valid, score, -np.inf)
+    k = min(k, int(valid.sum()))
+    if k == 0:
+        return []
+    top = np.argpartition(score, -k)[-k:]
+    top = top[np.argsort(score[top])[::-1]]
+    return [
+        {"sym": symbols[i], "chg": float(chg[i]), "vol": float(vol[i]), "score": float(score[i])}
+        for i in top
+    ]
@@ -0,0 +1,204 @@
+"""
+MONTE CARLO // vectorized price-path simulation with a streaming percentile fan.
+
+Paths are generated a chunk at a time (one NumPy call per chunk), so memory
+is bounded by `chunk x days` no matter how many paths are requested. Per-day
+percentiles are accumulated in fixed histograms over standardized log-moves
+(one bincount per chunk) instead of keeping every path around; only the
+terminal prices are kept exactly.
+
+Return models:
+  gbm        log-returns ~ N(mean, std) of the historical daily log-returns
+  bootstrap  daily log-returns resampled with replacement from history
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+FAN = (5, 25, 50, 75, 95)
+MODELS = ("gbm", "bootstrap")
+
+BINS = 4001        # histogram resolution per day
+Z_RANGE = 10.0     # bins cover +/- Z_RANGE standard deviations of the day's move
+
+
+class Fan(NamedTuple):
+    bands: dict          # percentile -> price per day (index 0 = today)
+    terminal: np.ndarray # exact terminal price of every path
+    paths: int
+    model: str
+    seed: object
+
+
+def log_returns(close):
+    close = np.asarray(close, dtype=float)
+    close = close[~np.isnan(close)]
+    return np.diff(np.log(close))
+
+
+def _chunk(rng, r, model, n, days):
+    if model == "bootstrap":
+        return r[rng.integers(0, len(r), size=(n, days))]
+    return rng.normal(r.mean(), r.std(ddof=1), size=(n, days))
+
+
+def simulate(close, days=252, paths=100_000, model="gbm", seed=None, chunk=20_000, fan=FAN):
+    """
+    Simulate `paths` price paths `days` ahead from the history in `close`.
+    Same seed + same arguments -> identical output.
+    """
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}")
+    close = np.asarray(close, dtype=float)
+    close = close[~np.isnan(close)]
+    r = log_returns(close)
+    if len(r) < 2:
+        raise ValueError("need at least 3 closes to estimate returns")
+    last = float(close[-1])
+    rng = np.random.default_rng(seed)
+
+    # Day t's cumulative log-move is binned on z = (x - mu*t) / (sd*sqrt(t))
+    mu, sd = r.mean(), max(r.std(ddof=1), 1e-12)
+    t = np.arange(1, days + 1)
+    centre, scale = mu * t, sd * np.sqrt(t)
+    width = 2 * Z_RANGE / (BINS - 1)
+    # bin = x * a + b  (centre/scale folded into one multiply-add per sample)
+    a = 1.0 / (scale * width)
+    b = (Z_RANGE - centre / scale) / width + 0.5
+    offsets = np.arange(days) * BINS
+
+    counts = np.zeros(days * BINS, dtype=np.int64)
+    terminal = np.empty(paths)
+    done = 0
+    while done < paths:
+        n = min(chunk, paths - done)
+        cum = np.cumsum(_chunk(rng, r, model, n, days), axis=1)
+        terminal[done:done + n] = last * np.exp(cum[:, -1])
+        cum *= a
+        cum += b
+        np.clip(cum, 0, BINS - 1, out=cum)
+        z = cum.astype(np.int64)
+        z += offsets
+        counts += np.bincount(z.ravel(), minlength=days * BINS)
+        done += n
+
+    # Percentile per day from the cumulative histogram
+    cdf = np.cumsum(counts.reshape(days, BINS), axis=1)
+    bands = {}
+    for q in fan:
+        idx = (cdf < q / 100 * paths).sum(axis=1)
+        z = idx * width - Z_RANGE
+        bands[q] = np.concatenate([[last], last * np.exp(centre + z * scale)])
+    return Fan(bands, terminal, paths, model, seed)
+
+
+# --- PORTFOLIO (correlated multi-asset) ---
+class PortfolioSim(NamedTuple):
+    terminal: np.ndarray      # portfolio value multiple at the horizon (1.0 = start)
+    max_drawdown: np.ndarray  # worst peak-to-trough fraction along each path
+    assets: list
+    weights: np.ndarray
+    shrinkage: float
+    paths: int
+    seed: object
+
+
+def shrunk_covariance(returns):
+    """
+    Ledoit-Wolf covariance of a (days, assets) return matrix, shrunk towards
+    a scaled identity. Returns (covariance, shrinkage intensity in [0, 1]).
+    """
+    x = np.asarray(returns, dtype=float)
+    t, n = x.shape
+    x = x - x.mean(axis=0)
+    s = x.T @ x / t
+    mu = np.trace(s) / n
+    target = mu * np.eye(n)
+    d2 = ((s - target) ** 2).sum()
+    # sum_t ||x_t x_t' - S||^2 = sum_t |x_t|^4 - T ||S||^2
+    b2 = ((x ** 2).sum(axis=1) ** 2).sum() / t ** 2 - (s ** 2).sum() / t
+    shrink = 0.0 if d2 == 0 else float(np.clip(b2 / d2, 0.0, 1.0))
+    return shrink * target + (1 - shrink) * s, shrink
+
+
+def _cholesky(cov):
+    jitter = 0.0
+    for _ in range(6):
+        try:
+            return np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            jitter = max(jitter * 10, 1e-12 * np.trace(cov) / len(cov))
+    raise ValueError("covariance matrix is not positive definite")
+
+
+def _portfolio_chunk(mu, chol, weights, days, n, seed):
+    """Worker: n buy-and-hold paths -> (terminal multiples, max drawdowns). Top-level so it pickles."""
+    rng = np.random.default_rng(seed)
+    # Antithetic pairs (z, -z): half the draws, lower variance. Cumulating before
+    # the Cholesky map is equivalent (both are linear) and lets the pair share it.
+    z = rng.standard_normal(((n + 1) // 2, days, len(mu)), dtype=np.float32)
+    np.cumsum(z, axis=1, out=z)
+    shock = z @ chol.T.astype(np.float32)
+    drift = (np.arange(1, days + 1)[:, None] * mu).astype(np.float32)
+    half = len(shock)
+    x = np.empty((2 * half, days, len(mu)), dtype=np.float32)
+    np.add(drift, shock, out=x[:half])
+    np.subtract(drift, shock, out=x[half:])
+    x = x[:n]
+    np.exp(x, out=x)
+    value = x @ weights.astype(np.float32)           # (n, days)
+    peak = np.maximum(np.maximum.accumulate(value, axis=1), 1.0)
+    drawdown = (1.0 - value / peak).max(axis=1)
+    return value[:, -1].astype(float), np.clip(drawdown, 0, None).astype(float)
+
+
+def simulate_portfolio(closes, weights, days=252, paths=250_000, seed=None, chunk=1024, pool=None):
+    """
+    Correlated buy-and-hold simulation of a portfolio.
+
+    `closes` is a (dates x assets) DataFrame of aligned daily closes and
+    `weights` maps asset -> weight (normalized here). Daily log-returns are
+    drawn as mu + L z with L the Cholesky factor of the shrunk covariance
+    (antithetic z pairs).
+    Chunks are seeded from one SeedSequence, so results do not depend on how
+    many workers ran them; `pool` (an Executor) spreads chunks across cores.
+    """
+    assets = [a for a in closes.columns if weights.get(a, 0) > 0]
+    if not assets:
+        raise ValueError("no weighted assets with price history")
+    w = np.array([weights[a] for a in assets], dtype=float)
+    w /= w.sum()
+    r = np.diff(np.log(closes[assets].dropna().to_numpy(dtype=float)), axis=0)
+    if len(r) < len(assets) + 2:
+        raise ValueError("not enough overlapping history to estimate covariance")
+    cov, shrink = shrunk_covariance(r)
+    chol, mu = _cholesky(cov), r.mean(axis=0)
+
+    sizes = [min(chunk, paths - i) for i in range(0, paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(mu, chol, w, days, n, s) for n, s in zip(sizes, seeds)]
+    if pool is None:
+        parts = [_portfolio_chunk(*a) for a in args]
+    else:
+        parts = list(pool.map(_portfolio_chunk, *zip(*args), chunksize=max(1, len(args) // 64)))
+    terminal = np.concatenate([p[0] for p in parts])
+    drawdown = np.concatenate([p[1] for p in parts])
+    return PortfolioSim(terminal, drawdown, assets, w, shrink, paths, seed)
+
+
+def portfolio_stats(sim, capital=1.0):
+    """Headline numbers for the terminal-value and drawdown distributions."""
+    tv = sim.terminal * capital
+    p5 = np.percentile(tv, 5)
+    return {
+        "MEAN": tv.mean(),
+        "MEDIAN": np.median(tv),
+        "P5": p5,
+        "P95": np.percentile(tv, 95),
+        "P(LOSS)": (sim.terminal < 1.0).mean(),
+        "VAR95": capital - p5,
+        "CVAR95": capital - tv[tv <= p5].mean(),
+        "MEDIAN_DD": np.median(sim.max_drawdown),
+        "P95_DD": np.percentile(sim.max_drawdown, 95),
+        "P(DD>20%)": (sim.max_drawdown > 0.20).mean(),
+    }
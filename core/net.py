@@ -0,0 +1,147 @@
+"""
+SHARED HTTP CLIENT // pooled keep-alive session with hard timeouts, retries
+and ETag / Last-Modified revalidation.
+
+Use net.get(...) instead of bare requests.get: a bare call has no timeout, so a
+single hung socket can pin a Streamlit worker forever. Every call also has a
+total `deadline` across attempts and backoff sleeps, so retries cannot stack
+up into a minute-long rerun; page-facing callers pass retries=PAGE_RETRIES.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+DEFAULT_TIMEOUT = (3.05, 10)      # (connect, read) seconds
+DEFAULT_DEADLINE = 20.0           # total seconds per get(), attempts and backoff included
+PAGE_RETRIES = 1                  # retries for calls made on a page's render path
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+VALIDATOR_CACHE_SIZE = 256
+
+# --- 1. POOLED SESSION ---
+# urllib3 keeps one connection pool per host under the adapter, so every
+# caller in the process shares keep-alive sockets to the same host.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=16, max_retries=0)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+_session.headers.update(DEFAULT_HEADERS)
+
+# --- 2. CONDITIONAL GET CACHE (url -> last 200 response) ---
+_validators = OrderedDict()
+_lock = threading.Lock()
+_stats = {"requests": 0, "not_modified": 0, "retries": 0, "failures": 0}
+
+
+def _bump(key):
+    with _lock:
+        _stats[key] += 1
+
+
+def _cache_key(url, params):
+    if not params:
+        return url
+    return url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def _remember(key, resp):
+    if not (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+        return
+    with _lock:
+        _validators[key] = resp
+        _validators.move_to_end(key)
+        while len(_validators) > VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+
+
+def _backoff(attempt, retry_after=None):
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    # Full jitter: uniform(0, base * 2^attempt), capped.
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+# --- 3. PUBLIC API ---
+def _clip(timeout, remaining):
+    """Per-attempt timeout no longer than the time left before the deadline."""
+    if isinstance(timeout, tuple):
+        return tuple(min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, retries=3, conditional=True,
+        deadline=DEFAULT_DEADLINE):
+    """
+    GET with pooling, a hard timeout, jittered exponential backoff on
+    connection errors / 429 / 5xx, and conditional revalidation. A 304 returns
+    the previously cached 200 response (with `resp.from_cache = True`).
+    No retry starts (or backoff sleep begins) that would run past `deadline`
+    seconds from the call. Raises the last error if every attempt fails.
+    """
+    key = _cache_key(url, params)
+    req_headers = dict(headers or {})
+    cached = None
+    if conditional:
+        with _lock:
+            cached = _validators.get(key)
+        if cached is not None:
+            if cached.headers.get("ETag"):
+                req_headers["If-None-Match"] = cached.headers["ETag"]
+            if cached.headers.get("Last-Modified"):
+                req_headers["If-Modified-Since"] = cached.headers["Last-Modified"]
+
+    start = time.monotonic()
+
+    def wait(attempt, retry_after=None):
+        """Sleep before the next attempt; False if there is no next attempt within the deadline."""
+        if attempt >= retries:
+            return False
+        pause = _backoff(attempt, retry_after)
+        if time.monotonic() - start + pause >= deadline:
+            return False
+        time.sleep(pause)
+        return True
+
+    last_error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            _bump("retries")
+        _bump("requests")
+        try:
+            remaining = max(deadline - (time.monotonic() - start), 0.1)
+            resp = _session.get(url, params=params, headers=req_headers, timeout=_clip(timeout, remaining))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            last_error = e
+            if not wait(attempt):
+                break
+            continue
+
+        if resp.status_code == 304 and cached is not None:
+            _bump("not_modified")
+            cached.from_cache = True
+            return cached
+        if resp.status_code in RETRY_STATUS and wait(attempt, resp.headers.get("Retry-After")):
+            last_error = requests.HTTPError(f"{resp.status_code} from {url}", response=resp)
+            continue
+
+        resp.from_cache = False
+        if conditional and resp.status_code == 200:
+            _remember(key, resp)
+        return resp
+
+    _bump("failures")
+    raise last_error
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
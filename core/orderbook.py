@@ -0,0 +1,238 @@
+"""
+ORDER BOOK // resting limit, stop and bracket orders, matched on every quote.
+
+Per symbol, resting orders sit on four sides, one per trigger direction:
+
+  buy_limit   fills when last <= price   best (highest) level first
+  sell_limit  fills when last >= price   best (lowest) level first
+  buy_stop    fires when last >= price   nearest (lowest) level first
+  sell_stop   fires when last <= price   nearest (highest) level first
+
+Each side is a heap of price levels plus a FIFO deque per level, so a quote
+pops exactly the crossed levels (O(log levels) each) and drains them in time
+order; orders that are not crossed are never looked at. Cancels are lazy: the
+order is flagged and skipped when its level drains.
+
+Triggered orders fill at the quote through the trade ledger (which enforces
+cash and position limits, and makes the fill durable). A bracket is an entry
+buy plus a take-profit limit and a stop-loss stop that go live when the entry
+fills and cancel each other (OCO). Resting orders live for the process, like
+the quote cache.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from core import quotes
+from core.ledger import ledger as _ledger
+
+TICK = 1e-4          # price levels are rounded to this
+HISTORY = 500        # finished orders kept for display
+
+# side name -> (order side, kind, direction): direction +1 fires on last >= level, -1 on last <= level
+SIDES = {
+    "sell_stop": ("SELL", "STOP", -1),     # sells first: they free cash before buys are checked
+    "sell_limit": ("SELL", "LIMIT", +1),
+    "buy_stop": ("BUY", "STOP", +1),
+    "buy_limit": ("BUY", "LIMIT", -1),
+}
+_SIDE_OF = {(side, kind): name for name, (side, kind, _) in SIDES.items()}
+
+
+class Order:
+    def __init__(self, oid, account, symbol, side, kind, qty, price, parent=None):
+        self.id = oid
+        self.account = account
+        self.symbol = symbol
+        self.side = side            # BUY / SELL
+        self.kind = kind            # LIMIT / STOP
+        self.qty = qty
+        self.price = price
+        self.parent = parent        # bracket entry id (children wait for it)
+        self.children = ()          # bracket legs (entry order only)
+        self.oco = None             # sibling leg cancelled when this one fills
+        self.status = "PENDING" if parent else "OPEN"
+        self.created = time.time()
+        self.fill_price = None
+        self.note = ""
+
+    def row(self):
+        return {"ID": self.id, "SYMBOL": self.symbol, "SIDE": self.side, "TYPE": self.kind, "QTY": self.qty,
+                "PRICE": self.price, "STATUS": self.status, "FILL": self.fill_price, "NOTE": self.note,
+                "PARENT": self.parent}
+
+
+class _Levels:
+    """One trigger direction: heap of level keys and a FIFO queue per level."""
+
+    def __init__(self, direction):
+        self.dir = direction
+        self.heap = []      # direction * price, so the top is the first level a move would cross
+        self.queues = {}    # price -> deque[Order]
+
+    def add(self, order):
+        q = self.queues.get(order.price)
+        if q is None:
+            q = self.queues[order.price] = deque()
+            heapq.heappush(self.heap, self.dir * order.price)
+        q.append(order)
+
+    def crossed(self, last):
+        """Pop every level `last` has crossed; their live orders in price-time order."""
+        out = []
+        while self.heap:
+            price = self.heap[0] * self.dir
+            if self.dir * (last - price) < 0:
+                break
+            heapq.heappop(self.heap)
+            out.extend(o for o in self.queues.pop(price) if o.status == "OPEN")
+        return out
+
+    def __len__(self):
+        return sum(len(q) for q in self.queues.values())
+
+
+class OrderBook:
+    def __init__(self, ledger=None):
+        self.ledger = ledger or _ledger
+        self._lock = threading.RLock()
+        self._books = {}                    # symbol -> {side name: _Levels}
+        self._orders = {}                   # id -> Order (open or pending only)
+        self._last = {}                     # symbol -> last quote seen
+        self._ids = itertools.count(1)
+        self.history = deque(maxlen=HISTORY)
+
+    # --- 1. PLACE / CANCEL ---
+    def _book(self, symbol):
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = {name: _Levels(d) for name, (_, _, d) in SIDES.items()}
+        return book
+
+    def _rest(self, order):
+        order.status = "OPEN"
+        self._book(order.symbol)[_SIDE_OF[(order.side, order.kind)]].add(order)
+
+    def _new(self, account, symbol, side, kind, qty, price, parent=None):
+        if side not in ("BUY", "SELL") or kind not in ("LIMIT", "STOP"):
+            raise ValueError(f"unsupported order {side} {kind}")
+        if qty <= 0 or price <= 0:
+            raise ValueError("quantity and price must be positive")
+        order = Order(next(self._ids), account, symbol.upper(), side, kind, float(qty),
+                      round(float(price) / TICK) * TICK, parent)
+        self._orders[order.id] = order
+        return order
+
+    def place(self, account, symbol, side, kind, qty, price):
+        """Rest a LIMIT or STOP order; it fills at once if the last quote already crosses it."""
+        with self._lock:
+            order = self._new(account, symbol, side, kind, qty, price)
+            self._rest(order)
+            self._match(order.symbol)
+            return order
+
+    def bracket(self, account, symbol, qty, entry, take_profit, stop_loss):
+        """Buy limit at `entry`; on fill, sell limit at `take_profit` and sell stop at `stop_loss` (OCO)."""
+        if not stop_loss < entry < take_profit:
+            raise ValueError("bracket needs stop_loss < entry < take_profit")
+        with self._lock:
+            parent = self._new(account, symbol, "BUY", "LIMIT", qty, entry)
+            tp = self._new(account, symbol, "SELL", "LIMIT", qty, take_profit, parent=parent.id)
+            sl = self._new(account, symbol, "SELL", "STOP", qty, stop_loss, parent=parent.id)
+            tp.oco, sl.oco = sl, tp
+            parent.children = (tp, sl)
+            self._rest(parent)
+            self._match(parent.symbol)
+            return parent
+
+    def _finish(self, order, status, note=""):
+        order.status, order.note = status, note
+        self._orders.pop(order.id, None)
+        self.history.append(order)
+
+    def cancel(self, oid):
+        """Cancel an open or pending order (and a bracket entry's legs). False if already finished."""
+        with self._lock:
+            order = self._orders.get(oid)
+            if order is None:
+                return False
+            self._finish(order, "CANCELLED")
+            for leg in order.children:
+                if leg.status in ("OPEN", "PENDING"):
+                    self._finish(leg, "CANCELLED", "entry cancelled")
+            if order.oco is not None and order.oco.status in ("OPEN", "PENDING"):
+                self._finish(order.oco, "CANCELLED", "bracket leg cancelled")
+            return True
+
+    # --- 2. MATCH ---
+    def on_quotes(self, prices):
+        """Feed {symbol: last}; returns the orders that filled or were rejected."""
+        done = []
+        with self._lock:
+            for symbol, last in prices.items():
+                self._last[symbol] = last
+                if symbol in self._books:
+                    done.extend(self._match(symbol))
+        return done
+
+    def _match(self, symbol):
+        last = self._last.get(symbol)
+        if last is None:
+            return []
+        done = []
+        book = self._book(symbol)
+        # A fill can arm bracket legs that the same quote already crosses, so repeat until quiet
+        while True:
+            triggered = [o for levels in book.values() for o in levels.crossed(last)]
+            if not triggered:
+                return done
+            for order in triggered:
+                if order.status == "OPEN":      # an earlier fill in this batch may have cancelled it (OCO)
+                    self._fill(order, last)
+                    done.append(order)
+
+    def _fill(self, order, last):
+        try:
+            (self.ledger.buy if order.side == "BUY" else self.ledger.sell)(order.account, order.symbol, order.qty, last)
+        except ValueError as e:
+            self._finish(order, "REJECTED", str(e))
+            for leg in order.children:
+                if leg.status == "PENDING":
+                    self._finish(leg, "CANCELLED", "entry rejected")
+            if order.oco is not None and order.oco.status == "OPEN":
+                self._finish(order.oco, "CANCELLED", f"OCO: #{order.id} rejected")
+            return
+        order.fill_price = last
+        self._finish(order, "FILLED")
+        for leg in order.children:
+            if leg.status == "PENDING":
+                self._rest(leg)
+        if order.oco is not None and order.oco.status == "OPEN":
+            self._finish(order.oco, "CANCELLED", f"OCO: #{order.id} filled")
+
+    # --- 3. VIEWS ---
+    def symbols(self):
+        """Symbols with live orders (worth quoting)."""
+        with self._lock:
+            return sorted({o.symbol for o in self._orders.values()})
+
+    def open_orders(self, account=None):
+        with self._lock:
+            return [o for o in self._orders.values() if account is None or o.account == account]
+
+    def recent(self, account=None, limit=50):
+        with self._lock:
+            done = [o for o in reversed(self.history) if account is None or o.account == account]
+        return done[:limit]
+
+    def depth(self, symbol):
+        """{side name: resting order count} (including lazily cancelled entries)."""
+        with self._lock:
+            book = self._books.get(symbol.upper(), {})
+            return {name: len(book[name]) if name in book else 0 for name in SIDES}
+
+
+book = OrderBook()
+quotes.subscribe(book.on_quotes)
@@ -0,0 +1,37 @@
+"""
+WIDE PANELS // chunked multi-symbol downloads as symbols-as-columns frames.
+
+yf.download returns a (field, symbol) MultiIndex for a list of tickers; this
+splits it into one wide DataFrame per OHLCV field so downstream maths can run
+column-wise across the whole universe in one pass.
+"""
+import pandas as pd
+import yfinance as yf
+
+CHUNK = 100   # symbols per yf.download call
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def download_panel(symbols, period="1mo", interval="1d", fields=FIELDS, chunk=CHUNK):
+    """{field: DataFrame[dates x symbols]} for every symbol Yahoo returned data for."""
+    parts = {f: [] for f in fields}
+    for i in range(0, len(symbols), chunk):
+        batch = list(symbols[i:i + chunk])
+        df = yf.download(batch, period=period, interval=interval, progress=False, threads=True, group_by="column")
+        if df is None or df.empty:
+            continue
+        for f in fields:
+            if isinstance(df.columns, pd.MultiIndex):
+                if f not in df.columns.get_level_values(0):
+                    continue
+                parts[f].append(df[f])
+            elif f in df.columns:
+                parts[f].append(df[[f]].set_axis(batch[:1], axis=1))
+    out = {}
+    for f, frames in parts.items():
+        if frames:
+            wide = pd.concat(frames, axis=1).sort_index()
+            out[f] = wide.loc[:, ~wide.columns.duplicated()].dropna(axis=1, how="all")
+        else:
+            out[f] = pd.DataFrame()
+    return out
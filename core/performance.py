@@ -0,0 +1,254 @@
+"""
+PERFORMANCE // incremental account analytics, updated per fill and per mark.
+
+One Tracker per account folds ledger events and quote marks into running
+totals. Every update and every summary is O(1) (attribution is O(symbols)),
+so nothing is rebuilt from the trade history on a rerun. Every COMPACT_EVERY
+folded events the tracker is checkpointed next to the ledger's own snapshot,
+so opening an account in a new process loads that checkpoint and folds only
+the events after it. Past marks are not stored, so that tail marks each
+symbol at its fills.
+
+  realized / unrealized   running cost basis and market value
+  TWR                     invested sleeve (positions only): sub-period returns
+                          between fills, chain-linked; buys and sells are the
+                          flows in and out of the sleeve
+  MWR                     Modified Dietz on the same flows (sum F and sum F*t
+                          kept, so any horizon evaluates in O(1))
+  max drawdown            running peak of account equity (cash + marks)
+  Sharpe / Sortino        daily account returns, Welford mean / variance and
+                          downside second moment, annualized with sqrt(252)
+"""
+import math
+import threading
+import time
+from datetime import date, datetime
+
+from core import quotes
+from core.ledger import COMPACT_EVERY, ledger as _ledger
+
+YEAR = 252
+
+
+class _Position:
+    FIELDS = ("qty", "avg", "mark", "realized")
+
+    def __init__(self):
+        self.qty = 0.0
+        self.avg = 0.0
+        self.mark = 0.0
+        self.realized = 0.0
+
+
+class Tracker:
+    def __init__(self, cash, ts):
+        self.start = self.cash = float(cash)
+        self.t0 = ts
+        self.seq = 0
+        self.positions = {}     # symbol -> _Position (kept after close for attribution)
+        self.mv = 0.0           # market value of open positions
+        self.basis = 0.0        # their cost basis
+        self.realized = 0.0
+        # TWR: link of closed sub-periods, sleeve value right after the last flow
+        self.link, self.base = 1.0, 0.0
+        # MWR: sum of flows and of flow * time
+        self.flows, self.flow_t = 0.0, 0.0
+        # Equity path
+        self.equity = self.peak = self.start
+        self.max_dd = 0.0
+        self.day, self.day_close = None, self.start
+        self.n, self.mean, self.m2, self.down2 = 0, 0.0, 0.0, 0.0
+        self.saved = 0          # seq of the last checkpoint
+
+    # --- 0. CHECKPOINT ---
+    SCALARS = ("start", "cash", "t0", "seq", "mv", "basis", "realized", "link", "base", "flows", "flow_t",
+               "equity", "peak", "max_dd", "day_close", "n", "mean", "m2", "down2")
+
+    def dump(self):
+        """JSON-ready state (running totals and per-symbol attribution, no history)."""
+        out = {k: getattr(self, k) for k in self.SCALARS}
+        out["day"] = self.day.isoformat() if self.day else None
+        out["positions"] = {s: [getattr(p, f) for f in _Position.FIELDS] for s, p in self.positions.items()}
+        return out
+
+    @classmethod
+    def restore(cls, d):
+        t = cls(d["start"], d["t0"])
+        for k in cls.SCALARS:
+            setattr(t, k, d[k])
+        t.day = date.fromisoformat(d["day"]) if d["day"] else None
+        for s, vals in d["positions"].items():
+            pos = t.positions[s] = _Position()
+            for f, v in zip(_Position.FIELDS, vals):
+                setattr(pos, f, v)
+        t.saved = t.seq
+        return t
+
+    # --- 1. UPDATES ---
+    def _observe(self, ts):
+        equity = self.cash + self.mv
+        day = datetime.fromtimestamp(ts).date()
+        if self.day is not None and day != self.day:
+            # Close the previous day with its last equity
+            r = self.equity / self.day_close - 1 if self.day_close > 0 else 0.0
+            self.n += 1
+            delta = r - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (r - self.mean)
+            self.down2 += min(r, 0.0) ** 2
+            self.day_close = self.equity
+        self.day = day
+        self.equity = equity
+        self.peak = max(self.peak, equity)
+        if self.peak > 0:
+            self.max_dd = max(self.max_dd, 1 - equity / self.peak)
+
+    def mark(self, symbol, price, ts):
+        pos = self.positions.get(symbol)
+        if pos is None or price <= 0:
+            return
+        if pos.qty > 0:
+            self.mv += pos.qty * (price - pos.mark)
+        pos.mark = price
+        self._observe(ts)
+
+    def fill(self, kind, symbol, qty, price, ts):
+        pos = self.positions.setdefault(symbol, _Position())
+        if pos.qty > 0:
+            self.mv += pos.qty * (price - pos.mark)
+        pos.mark = price
+        if self.base > 0:   # close the TWR sub-period at the pre-flow value
+            self.link *= self.mv / self.base
+        flow = qty * price
+        if kind == "BUY":
+            pos.avg = (pos.avg * pos.qty + flow) / (pos.qty + qty)
+            pos.qty += qty
+            self.cash -= flow
+            self.mv += flow
+            self.basis += flow
+        else:
+            pnl = (price - pos.avg) * qty
+            pos.realized += pnl
+            self.realized += pnl
+            pos.qty -= qty
+            self.cash += flow
+            self.mv -= flow
+            self.basis -= pos.avg * qty
+            flow = -flow
+            if pos.qty <= 1e-12:
+                pos.qty = 0.0
+        self.flows += flow
+        self.flow_t += flow * (ts - self.t0)
+        self.base = self.mv
+        self._observe(ts)
+
+    # --- 2. READ ---
+    def summary(self, now=None):
+        now = now or time.time()
+        span = max(now - self.t0, 1.0)
+        twr = self.link * (self.mv / self.base if self.base > 0 else 1.0) - 1
+        dietz = self.flows - self.flow_t / span      # sum F_i * (1 - t_i / T)
+        sd = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+        down = math.sqrt(self.down2 / self.n) if self.n else 0.0
+        return {
+            "EQUITY": self.equity,
+            "CASH": self.cash,
+            "MARKET_VALUE": self.mv,
+            "REALIZED": self.realized,
+            "UNREALIZED": self.mv - self.basis,
+            "TOTAL_PNL": self.equity - self.start,
+            "RETURN": self.equity / self.start - 1,
+            "TWR": twr,
+            "MWR": (self.mv - self.flows) / dietz if dietz > 1e-9 else 0.0,
+            "MAX_DD": self.max_dd,
+            "SHARPE": self.mean / sd * math.sqrt(YEAR) if sd > 0 else 0.0,
+            "SORTINO": self.mean / down * math.sqrt(YEAR) if down > 0 else 0.0,
+            "DAYS": self.n,
+        }
+
+    def attribution(self):
+        """Per-symbol P&L and contribution to the account return (one row per symbol ever traded)."""
+        rows = []
+        for s, p in self.positions.items():
+            unreal = p.qty * (p.mark - p.avg)
+            rows.append({"SYMBOL": s, "QTY": p.qty, "AVG_PRICE": p.avg if p.qty else None, "MARK": p.mark,
+                         "MARKET_VALUE": p.qty * p.mark, "REALIZED": p.realized, "UNREALIZED": unreal,
+                         "TOTAL": p.realized + unreal, "CONTRIB": (p.realized + unreal) / self.start})
+        return sorted(rows, key=lambda r: -abs(r["TOTAL"]))
+
+
+class Performance:
+    def __init__(self, ledger=None):
+        self.ledger = ledger or _ledger
+        self._lock = threading.RLock()
+        self._trackers = {}     # account -> Tracker
+        self._holders = {}      # symbol -> accounts that have traded it
+        self.ledger.subscribe(self.on_event)
+        quotes.subscribe(self.on_quotes)
+
+    def _load(self, account):
+        """Last checkpoint (if it is not older than the last reset) plus the events after it."""
+        saved = self.ledger.analytics(account)
+        tracker = Tracker.restore(saved[1]) if saved else None
+        events = self.ledger.events(account, after=tracker.seq if tracker else 0)
+        if tracker is None:
+            tracker = Tracker(self.ledger.state(account)["start"], events[0][1] if events else time.time())
+        else:
+            for symbol in tracker.positions:
+                self._holders.setdefault(symbol, set()).add(account)
+        for seq, ts, kind, symbol, qty, price in events:
+            tracker = self._apply(account, tracker, seq, ts, kind, symbol, qty, price)
+        self._trackers[account] = tracker
+        return tracker
+
+    def _apply(self, account, tracker, seq, ts, kind, symbol, qty, price):
+        if kind == "RESET":
+            tracker = Tracker(price, ts)
+        else:
+            tracker.fill(kind, symbol, qty, price, ts)
+            self._holders.setdefault(symbol, set()).add(account)
+        tracker.seq = seq
+        if kind == "RESET" or seq - tracker.saved >= COMPACT_EVERY:
+            self.ledger.save_analytics(account, seq, tracker.dump())
+            tracker.saved = seq
+        return tracker
+
+    def tracker(self, account):
+        with self._lock:
+            return self._trackers.get(account) or self._load(account)
+
+    def on_event(self, account, seq, ts, kind, symbol, qty, price):
+        with self._lock:
+            tracker = self._trackers.get(account)
+            if tracker is None:
+                return                      # folded in when the account is first opened
+            if seq <= tracker.seq:          # delivered out of order: rebuild on next read
+                del self._trackers[account]
+                return
+            self._trackers[account] = self._apply(account, tracker, seq, ts, kind, symbol, qty, price)
+
+    def on_quotes(self, prices, ts=None):
+        ts = ts or time.time()
+        with self._lock:
+            for symbol, price in prices.items():
+                for account in self._holders.get(symbol, ()):
+                    tracker = self._trackers.get(account)
+                    if tracker is not None:
+                        tracker.mark(symbol, price, ts)
+
+    def summary(self, account, marks=None):
+        """Headline analytics, after applying any `marks` ({symbol: price}) just fetched."""
+        with self._lock:
+            tracker = self.tracker(account)
+            if marks:
+                ts = time.time()
+                for symbol, price in marks.items():
+                    tracker.mark(symbol, price, ts)
+            return tracker.summary()
+
+    def attribution(self, account):
+        with self._lock:
+            return self.tracker(account).attribution()
+
+
+performance = Performance()
@@ -0,0 +1,101 @@
+"""
+QUOTE SNAPSHOT // last prices for a set of symbols from one batched request.
+
+Pages that mark positions ask for every symbol they need at once. Symbols
+quoted within MAX_AGE seconds come from memory; the rest are fetched together
+in a single yf.download of today's 1-minute bars (last close per column), so
+a rerun costs at most one round trip however many positions are open.
+
+The network call runs outside the module lock: each batch marks its symbols
+in flight, so concurrent reruns only fetch what nobody is already fetching
+and never queue behind a slow request for other symbols. A rerun that needs
+a symbol it has never been quoted waits for that symbol's batch; otherwise
+it serves the previous quote (flagged stale by its age). Symbols a batch
+failed to price are not re-requested for MAX_AGE. Subscribers (the order
+book) are handed every fresh batch as {symbol: price}.
+"""
+import threading
+import time
+
+from core.panel import download_panel
+
+MAX_AGE = 5.0    # seconds a quote is considered live
+
+_quotes = {}     # symbol -> (price, fetched_at)
+_inflight = {}   # symbol -> threading.Event set when its batch lands
+_failed = {}     # symbol -> time of the last batch that did not price it
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "batches": 0}
+_subscribers = []
+
+
+def _fetch(symbols):
+    close = download_panel(symbols, period="1d", interval="1m", fields=("Close",))["Close"]
+    if close.empty:
+        return {}
+    last = close.ffill().iloc[-1].dropna()
+    return {s: float(p) for s, p in last.items()}
+
+
+def snapshot(symbols, max_age=MAX_AGE):
+    """{symbol: last price} for every symbol we have (or can get) a quote for."""
+    symbols = sorted({s.upper() for s in symbols if s})
+    now = time.time()
+    with _lock:
+        stale = [s for s in symbols if now - _quotes.get(s, (None, 0.0))[1] > max_age
+                 and now - _failed.get(s, 0.0) > max_age]
+        _stats["hits"] += len(symbols) - len(stale)
+        _stats["misses"] += len(stale)
+        # Fetch what nobody is fetching; wait only on in-flight symbols we have no quote for at all
+        mine = [s for s in stale if s not in _inflight]
+        waits = {_inflight[s] for s in stale if s in _inflight and s not in _quotes}
+        done = threading.Event()
+        for s in mine:
+            _inflight[s] = done
+
+    fresh = {}
+    if mine:
+        try:
+            fresh = _fetch(mine)
+        except Exception:
+            fresh = {}
+        stamp = time.time()
+        with _lock:
+            _stats["batches"] += 1
+            for s in mine:
+                if s in fresh:
+                    _quotes[s] = (fresh[s], stamp)
+                    _failed.pop(s, None)
+                else:
+                    _failed[s] = stamp
+                if _inflight.get(s) is done:
+                    del _inflight[s]
+        done.set()
+    for event in waits:
+        event.wait()
+
+    with _lock:
+        out = {s: _quotes[s][0] for s in symbols if s in _quotes}
+    if fresh:
+        for fn in list(_subscribers):
+            fn(fresh)
+    return out
+
+
+def subscribe(fn):
+    """Call fn({symbol: price}) with every freshly fetched batch."""
+    if fn not in _subscribers:
+        _subscribers.append(fn)
+
+
+def price(symbol, max_age=MAX_AGE):
+    return snapshot([symbol], max_age).get(symbol.upper())
+
+
+def age(symbol):
+    q = _quotes.get(symbol.upper())
+    return None if q is None else time.time() - q[1]
+
+
+def stats():
+    return dict(_stats)
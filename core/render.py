@@ -0,0 +1,71 @@
+"""
+PANEL RENDERER // build a whole row-heavy panel as ONE html payload.
+
+One st.markdown per row means one websocket delta and one DOM subtree per
+row. Instead, rows are rendered from precompiled templates into a single
+string and emitted once. Every `{field}` is HTML-escaped unless it is wrapped
+in Raw(...), so feed text and holder names can't inject markup.
+
+Unchanged panels cost almost nothing to re-send: Streamlit caches large
+element messages client-side by content hash and only sends the hash on the
+next rerun. A whole panel is big enough to qualify (see
+global.minCachedMessageSize in .streamlit/config.toml); a single row is not.
+"""
+import html
+from string import Formatter
+
+import streamlit as st
+
+
+class Raw(str):
+    """Trusted markup: inserted into a template without escaping."""
+
+
+def escape(value):
+    return value if isinstance(value, Raw) else html.escape(str(value), quote=True)
+
+
+class Template:
+    """
+    str.format-style template, parsed once per process (pages re-execute on
+    every rerun, so compiled sources are cached on the class).
+
+    Indentation and blank lines are stripped on compile so the output is never
+    mistaken for a markdown code block.
+    """
+    _compiled = {}   # source -> parsed parts, shared across reruns
+
+    def __init__(self, source):
+        parts = self._compiled.get(source)
+        if parts is None:
+            compact = "\n".join(line.strip() for line in source.strip().splitlines() if line.strip())
+            parts = [
+                (literal, field, spec or "", conv)
+                for literal, field, spec, conv in Formatter().parse(compact)
+            ]
+            self._compiled[source] = parts
+        self._parts = parts
+
+    def render(self, **fields):
+        out = []
+        for literal, field, spec, conv in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = fields[field]
+            if conv == "r":
+                value = repr(value)
+            elif conv == "s":
+                value = str(value)
+            text = format(value, spec)
+            out.append(text if isinstance(value, Raw) and not spec else escape(text))
+        return Raw("".join(out))
+
+    def render_rows(self, rows):
+        """Render each mapping in `rows` and concatenate into one Raw string."""
+        return Raw("".join(self.render(**row) for row in rows))
+
+
+def emit(markup, target=None):
+    """Send one finished panel to the frontend as a single element."""
+    (target or st).markdown(markup, unsafe_allow_html=True)
@@ -0,0 +1,167 @@
+"""
+MARKET RISK // VaR and CVaR (expected shortfall), vectorized over return matrices.
+
+Inputs are (days x columns) daily simple-return matrices. A column is one
+position, or a portfolio (R @ w). Every method works on all columns at once.
+
+  historical   empirical quantile of overlapping h-day returns
+  parametric   normal: mu*h + z * sigma*sqrt(h)
+  montecarlo   correlated normal draws from the shrunk covariance, h-day log
+               moves scaled from one set of shocks (common random numbers)
+
+VaR and CVaR are reported as positive loss fractions of exposure.
+backtest() rolls a 1-day VaR forecast through history and runs Kupiec's
+proportion-of-failures test on the exceedances.
+"""
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from core.montecarlo import shrunk_covariance
+
+LEVELS = (0.95, 0.99)
+HORIZONS = (1, 5, 10, 21)
+METHODS = ("historical", "parametric", "montecarlo")
+WINDOW = 250
+
+_N = NormalDist()
+
+
+def _as_matrix(returns):
+    r = np.asarray(returns, dtype=float)
+    return r[:, None] if r.ndim == 1 else r
+
+
+def horizon_returns(returns, h):
+    """Overlapping h-day compounded returns, (days - h + 1, columns)."""
+    r = _as_matrix(returns)
+    if h == 1:
+        return r
+    c = np.vstack([np.zeros((1, r.shape[1])), np.cumsum(np.log1p(r), axis=0)])
+    return np.expm1(c[h:] - c[:-h])
+
+
+def tail_stats(pnl, level):
+    """VaR / CVaR of each column of a (samples, columns) return matrix."""
+    q = np.quantile(pnl, 1 - level, axis=0)
+    tail = pnl <= q
+    return -q, -(np.where(tail, pnl, 0).sum(axis=0) / np.maximum(tail.sum(axis=0), 1))
+
+
+# --- 1. METHODS (each returns VaR, CVaR arrays of shape (columns,)) ---
+def historical(returns, level=0.95, h=1):
+    return tail_stats(horizon_returns(returns, h), level)
+
+
+def parametric(returns, level=0.95, h=1):
+    r = _as_matrix(returns)
+    mu, sd = r.mean(axis=0) * h, r.std(axis=0, ddof=1) * math.sqrt(h)
+    z = _N.inv_cdf(1 - level)
+    var = -(mu + z * sd)
+    cvar = -(mu - sd * _N.pdf(z) / (1 - level))
+    return var, cvar
+
+
+def montecarlo_shocks(returns, paths=10_000, seed=None):
+    """One set of correlated 1-day log shocks (paths, assets) plus the daily log drift."""
+    lr = np.log1p(_as_matrix(returns))
+    cov, _ = shrunk_covariance(lr)
+    chol = np.linalg.cholesky(cov + 1e-12 * np.eye(len(cov)))
+    z = np.random.default_rng(seed).standard_normal((paths, lr.shape[1]))
+    return z @ chol.T, lr.mean(axis=0)
+
+
+def montecarlo_pnl(shocks, weights=None, h=1):
+    """
+    Simulated h-day returns (paths, columns). With `weights`, the assets are
+    aggregated into one portfolio column (per-asset compounding, then weighted).
+    """
+    shock, mu = shocks
+    sim = np.expm1(mu * h + shock * math.sqrt(h))          # (paths, assets)
+    if weights is not None:
+        sim = sim @ np.asarray(weights, dtype=float)[:, None]
+    return sim
+
+
+def montecarlo(returns, weights=None, level=0.95, h=1, paths=10_000, seed=None):
+    return tail_stats(montecarlo_pnl(montecarlo_shocks(returns, paths, seed), weights, h), level)
+
+
+# --- 2. REPORT ---
+def report(returns, weights=None, levels=LEVELS, horizons=HORIZONS, paths=10_000, seed=None):
+    """
+    Long table METHOD / CONF / HORIZON / VAR / CVAR for the portfolio
+    (`weights` given, normalized here) or for a single return series.
+    """
+    r = _as_matrix(returns)
+    if weights is not None:
+        w = np.asarray(weights, dtype=float)
+        w = w / w.sum()
+        port = r @ w
+    else:
+        w, port = None, r[:, 0]
+    shocks = montecarlo_shocks(r, paths, seed)
+    rows = []
+    for h in horizons:
+        hist, sim = horizon_returns(port, h), montecarlo_pnl(shocks, w, h)   # one pass per horizon
+        for level in levels:
+            for method, (var, cvar) in (
+                ("historical", tail_stats(hist, level)),
+                ("parametric", parametric(port, level, h)),
+                ("montecarlo", tail_stats(sim, level)),
+            ):
+                rows.append({"METHOD": method, "CONF": level, "HORIZON": h, "VAR": float(var[0]), "CVAR": float(cvar[0])})
+    return pd.DataFrame(rows).sort_values(["CONF", "HORIZON"], kind="stable", ignore_index=True)
+
+
+def component_var(returns, weights, level=0.95, h=1):
+    """
+    Parametric component VaR per position (sums to the portfolio's
+    zero-mean parametric VaR): w_i * (S w)_i / sigma_p * |z| * sqrt(h).
+    """
+    r = _as_matrix(returns)
+    w = np.asarray(weights, dtype=float)
+    w = w / w.sum()
+    cov = np.cov(r, rowvar=False, ddof=1).reshape(len(w), len(w))
+    sigma_p = math.sqrt(float(w @ cov @ w))
+    z = -_N.inv_cdf(1 - level)
+    return w * (cov @ w) / sigma_p * z * math.sqrt(h)
+
+
+# --- 3. BACKTEST ---
+def kupiec(exceedances, n, level):
+    """Kupiec proportion-of-failures LR statistic and its chi2(1) p-value."""
+    if n == 0:
+        return 0.0, 1.0
+    p, x = 1 - level, exceedances
+
+    def loglik(prob):   # 0 * log(0) taken as 0
+        return ((n - x) * math.log(1 - prob) if n - x else 0.0) + (x * math.log(prob) if x else 0.0)
+
+    lr = max(-2 * (loglik(p) - loglik(x / n)), 0.0)
+    return lr, math.erfc(math.sqrt(lr / 2))
+
+
+def backtest(returns, level=0.99, window=WINDOW, method="historical"):
+    """
+    Roll a 1-day VaR forecast (estimated on the previous `window` days) through
+    history and count days whose realized return fell below -VaR.
+    Returns dict: forecasts, realized, exceed (bool array), x, n, expected, lr, p_value.
+    """
+    r = np.asarray(returns, dtype=float).ravel()
+    if len(r) <= window:
+        raise ValueError(f"need more than {window} returns to backtest")
+    windows = np.lib.stride_tricks.sliding_window_view(r[:-1], window)   # window i forecasts day i + window
+    if method == "parametric":
+        mu, sd = windows.mean(axis=1), windows.std(axis=1, ddof=1)
+        forecasts = -(mu + _N.inv_cdf(1 - level) * sd)
+    else:
+        forecasts = -np.quantile(windows, 1 - level, axis=1)
+    realized = r[window:]
+    exceed = realized < -forecasts
+    x, n = int(exceed.sum()), len(realized)
+    lr, pval = kupiec(x, n, level)
+    return {"forecasts": forecasts, "realized": realized, "exceed": exceed,
+            "x": x, "n": n, "expected": n * (1 - level), "lr": lr, "p_value": pval}
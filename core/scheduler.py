@@ -0,0 +1,129 @@
+"""
+BACKGROUND REFRESHER // keeps hot datasets warm off the render path.
+
+Jobs are registered once per process with a fixed cadence. A daemon thread
+hands each due job to a small worker pool, so a slow job never holds up the
+others, and re-runs each job on that cadence and publishes the result as an immutable
+Snapshot, so a render only ever reads memory. The very first read of a job
+that has never completed blocks once to seed it. A failed refresh keeps the
+last good value but records the error and when it happened on the snapshot.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+# Jobs refreshing at the same time; one job never runs twice concurrently.
+WORKERS = 4
+
+
+class Snapshot(NamedTuple):
+    value: Any
+    fetched_at: float           # last successful fetch (0 if never)
+    error: str = ""             # last refresh error, cleared by the next success
+    error_at: float = 0.0
+
+    @property
+    def age(self):
+        """Seconds since the last successful fetch (None if there never was one)."""
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    @property
+    def error_age(self):
+        return time.time() - self.error_at if self.error else None
+
+
+def freeze(obj):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+class _Job:
+    def __init__(self, name, fn, interval):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.next_due = 0.0
+        self.snapshot = None
+        self.lock = threading.Lock()   # one refresh at a time per job
+        self.queued = False            # handed to the pool, not finished yet
+
+
+class BackgroundRefresher:
+    def __init__(self, tick=1.0, workers=WORKERS):
+        self.tick = tick
+        self.workers = workers
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pool = None
+
+    # --- REGISTRATION ---
+    def register(self, name, fn, interval):
+        """Idempotent: re-registering a name keeps the existing job and snapshot."""
+        with self._lock:
+            if name not in self._jobs:
+                self._jobs[name] = _Job(name, fn, interval)
+            if self._thread is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="yn-refresh")
+                self._thread = threading.Thread(target=self._run, name="yn-refresher", daemon=True)
+                self._thread.start()
+        return self._jobs[name]
+
+    # --- READ PATH ---
+    def get(self, name):
+        """Latest snapshot for `name`; blocks only if it has never been fetched."""
+        job = self._jobs[name]
+        if job.snapshot is None:
+            self._refresh(job)
+        return job.snapshot
+
+    def ages(self):
+        """{name: seconds since last successful publish (None if never)}."""
+        return {
+            name: (None if job.snapshot is None else job.snapshot.age)
+            for name, job in list(self._jobs.items())
+        }
+
+    # --- REFRESH PATH ---
+    def _refresh(self, job):
+        with job.lock:
+            # Another thread may have published while we waited for the lock.
+            if job.snapshot is not None and time.time() < job.next_due:
+                return
+            try:
+                job.snapshot = Snapshot(freeze(job.fn()), time.time())
+            except Exception as e:
+                # Keep serving the last good value, but record what went wrong and when.
+                now = time.time()
+                if job.snapshot is None:
+                    job.snapshot = Snapshot(None, 0.0, str(e), now)
+                else:
+                    job.snapshot = job.snapshot._replace(error=str(e), error_at=now)
+            job.next_due = time.time() + job.interval
+
+    def _dispatch(self, job):
+        try:
+            self._refresh(job)
+        finally:
+            job.queued = False
+
+    def _run(self):
+        while True:
+            now = time.time()
+            for job in list(self._jobs.values()):
+                if now >= job.next_due and not job.queued:
+                    job.queued = True
+                    try:
+                        self._pool.submit(self._dispatch, job)
+                    except RuntimeError:    # pool shut down at interpreter exit
+                        return
+            time.sleep(self.tick)
+
+
+refresher = BackgroundRefresher()
@@ -0,0 +1,226 @@
+"""
+TECHNICAL SCREENER // one condition, thousands of symbols, one matrix pass.
+
+Cached bars for the whole universe are stacked into (days, symbols) matrices
+and every indicator is computed column-wise with the matrix forms in
+core.indicators (same definitions and seeding as the streaming engine), so
+there is no per-symbol pandas work anywhere on the hot path.
+
+Conditions are small boolean expressions over the latest bar, e.g.
+
+    RSI < 30 and MACD_BULL_CROSS
+    CLOSE > SMA200
+    (CLOSE - SMA50) / ATR > 2 or GOLDEN_CROSS
+
+They are parsed with `ast` against a whitelist of node types and evaluated as
+NumPy vector ops; nothing is ever passed to eval().
+"""
+import ast
+import operator
+
+import numpy as np
+import pandas as pd
+
+from core import bars, indicators, workers
+
+DEPTH = 260   # trading days stacked per symbol (SMA200 + MACD warm-up)
+
+PRESETS = {
+    "OVERSOLD + MACD BULL CROSS": "RSI < 30 and MACD_BULL_CROSS",
+    "ABOVE SMA200": "CLOSE > SMA200",
+    "GOLDEN CROSS": "GOLDEN_CROSS",
+    "OVERBOUGHT": "RSI > 70",
+    "BOLLINGER SQUEEZE BREAKOUT": "CLOSE > BB_UPPER and BB_WIDTH < 10",
+    "ATR STRETCH": "(CLOSE - SMA20) / ATR > 2",
+}
+
+# Names a condition may reference (all evaluated on the latest bar)
+FIELDS = ("CLOSE", "CHG", "VOLUME", "RSI", "MACD", "SIGNAL", "HIST", "SMA20", "SMA50", "SMA200",
+          "BB_UPPER", "BB_MID", "BB_LOWER", "BB_WIDTH", "ATR",
+          "MACD_BULL_CROSS", "MACD_BEAR_CROSS", "GOLDEN_CROSS", "DEATH_CROSS")
+
+
+# --- 1. CACHED BARS -> MATRICES ---
+def load_matrices(symbols, interval="1d", depth=DEPTH, store=None, fields=("High", "Low", "Close", "Volume")):
+    """
+    Tail-align the last `depth` cached bars of every symbol (disk only, no
+    network) on one common session: the most common last-bar timestamp in
+    the batch. Bars newer than it (a partial bar on a freshly charted
+    symbol) are left out; symbols that stop short of it are shifted back by
+    the bars they are missing and read NaN there. Symbols with no bars in
+    the window are dropped.
+    Returns (symbols, {field: (depth, n) array, "ts": (depth,) epoch seconds,
+    "lag": (n,) bars behind the common session}), with NaN above the first
+    bar of symbols that have fewer than `depth`.
+    """
+    store = store or bars.store
+    views = [(s, store.bars(s, interval, refresh=False)) for s in symbols]
+    views = [(s, v) for s, v in views if len(v)]
+    if not views:
+        return [], {}
+    lasts, counts = np.unique([v[-1, 0] for _, v in views], return_counts=True)
+    common = lasts[len(counts) - 1 - np.argmax(counts[::-1])]      # ties go to the newer session
+    views = [(s, v[:np.searchsorted(v[:, 0], common, side="right")]) for s, v in views]
+    views = [(s, v) for s, v in views if len(v)]
+    timeline = max((v for _, v in views if v[-1, 0] == common), key=len)[-depth:, 0]
+    lags = [len(timeline) - np.searchsorted(timeline, v[-1, 0], side="right") for _, v in views]
+    keep = [j for j, (lag, (_, v)) in enumerate(zip(lags, views)) if lag < depth and v[-1, 0] >= timeline[0]]
+    views, lags = [views[j] for j in keep], np.array([lags[j] for j in keep], dtype=int)
+
+    # One block copy per symbol of its OHLCV tail
+    cols = [1 + bars.COLUMNS.index(f) for f in fields]
+    lo, hi = min(cols), max(cols) + 1
+    stack = np.full((len(views), depth, hi - lo), np.nan)
+    for j, ((_, v), lag) in enumerate(zip(views, lags)):
+        tail = v[-(depth - lag):, lo:hi]
+        stack[j, depth - lag - len(tail):depth - lag] = tail
+    out = {f: np.ascontiguousarray(stack[:, :, c - lo].T) for f, c in zip(fields, cols)}
+    out["ts"] = np.concatenate([np.full(depth - len(timeline), np.nan), timeline])
+    out["lag"] = lags
+    return [s for s, _ in views], out
+
+
+def current(names, m):
+    """Only the symbols whose last bar is the common session (lag 0)."""
+    keep = np.flatnonzero(m["lag"] == 0)
+    sub = {f: (a if f == "ts" else a[keep] if f == "lag" else a[:, keep]) for f, a in m.items()}
+    return [names[j] for j in keep], sub
+
+
+def warm(symbols, interval="1d"):
+    """Top up the bar store for every symbol on the shared io pool."""
+    def one(s):
+        try:
+            return bars.store.update(s, interval)
+        except Exception:
+            return 0
+    return sum(workers.io_pool.map(one, symbols))
+
+
+# --- 2. FIELDS ---
+def _seeded(fn, first, *arrays):
+    """
+    Run a column-wise recursion once per group of columns that share their
+    first valid row, so a symbol with fewer than DEPTH bars is seeded at its
+    own first bar (as the streaming indicators are) instead of reading NaN.
+    """
+    outs, single = None, False
+    for f in np.unique(first):
+        cols = np.flatnonzero(first == f)
+        res = fn(*(a[f:, cols] for a in arrays))
+        single = isinstance(res, np.ndarray)
+        res = (res,) if single else res
+        if outs is None:
+            outs = [np.full(arrays[0].shape, np.nan) for _ in res]
+        for o, r in zip(outs, res):
+            o[f:, cols] = r
+    return outs[0] if single else tuple(outs)
+
+
+def compute_fields(m):
+    """Latest-bar vectors (one value per symbol) for every name a condition may use."""
+    close, high, low = m["Close"], m["High"], m["Low"]
+    first = np.argmax(np.isfinite(close), axis=0)
+    rsi = _seeded(indicators.wilder_rsi_matrix, first, close)
+    line, sig, hist = _seeded(indicators.macd_matrix, first, close)
+    # Only the last two bars matter here, so SMA / Bollinger read just their windows
+    sma20, sma50, sma200 = (np.vstack([close[-n - 1:-1].mean(axis=0), close[-n:].mean(axis=0)]) for n in (20, 50, 200))
+    mid, sd = sma20[-1], close[-20:].std(axis=0)
+    upper, lower = mid + 2.0 * sd, mid - 2.0 * sd
+    atr = _seeded(indicators.wilder_atr_matrix, first, high, low, close)[-1]
+
+    last, prev = close[-1], close[-2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "CLOSE": last,
+            "CHG": (last / prev - 1) * 100,
+            "VOLUME": m["Volume"][-1],
+            "RSI": rsi[-1],
+            "MACD": line[-1], "SIGNAL": sig[-1], "HIST": hist[-1],
+            "SMA20": sma20[-1], "SMA50": sma50[-1], "SMA200": sma200[-1],
+            "BB_UPPER": upper, "BB_MID": mid, "BB_LOWER": lower,
+            "BB_WIDTH": (upper - lower) / mid * 100,
+            "ATR": atr,
+            "MACD_BULL_CROSS": (hist[-2] <= 0) & (hist[-1] > 0),
+            "MACD_BEAR_CROSS": (hist[-2] >= 0) & (hist[-1] < 0),
+            "GOLDEN_CROSS": (sma50[-2] <= sma200[-2]) & (sma50[-1] > sma200[-1]),
+            "DEATH_CROSS": (sma50[-2] >= sma200[-2]) & (sma50[-1] < sma200[-1]),
+        }
+
+
+# --- 3. CONDITION LANGUAGE ---
+_CMP = {ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+        ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne}
+_BIN = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+
+def _eval(node, fields):
+    if isinstance(node, ast.Expression):
+        return _eval(node.body, fields)
+    if isinstance(node, ast.BoolOp):
+        vals = [np.asarray(_eval(v, fields), dtype=bool) for v in node.values]
+        return np.logical_and.reduce(vals) if isinstance(node.op, ast.And) else np.logical_or.reduce(vals)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return ~np.asarray(_eval(node.operand, fields), dtype=bool)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_eval(node.operand, fields)
+    if isinstance(node, ast.Compare):
+        left, result = _eval(node.left, fields), True
+        for op, comp in zip(node.ops, node.comparators):
+            if type(op) not in _CMP:
+                raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+            right = _eval(comp, fields)
+            with np.errstate(invalid="ignore"):
+                result = result & _CMP[type(op)](left, right)
+            left = right
+        return result
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _BIN[type(node.op)](_eval(node.left, fields), _eval(node.right, fields))
+    if isinstance(node, ast.Name):
+        name = node.id.upper()
+        if name not in fields:
+            raise ValueError(f"Unknown field: {node.id} (try {', '.join(FIELDS)})")
+        return fields[name]
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    raise ValueError(f"Unsupported expression: {ast.dump(node)[:60]}")
+
+
+def evaluate(condition, fields):
+    """Boolean mask over symbols for `condition`."""
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Bad condition: {e.msg}") from None
+    mask = np.asarray(_eval(tree, fields), dtype=bool)
+    return np.broadcast_to(mask, fields["CLOSE"].shape)
+
+
+# --- 4. SCREEN ---
+COLUMNS = ["CLOSE", "CHG", "RSI", "MACD", "HIST", "SMA50", "SMA200", "ATR", "BB_WIDTH"]
+
+
+def screen(condition, symbols, interval="1d", rank_by="RSI", ascending=True, limit=100, store=None):
+    """
+    Ranked DataFrame of the symbols that satisfy `condition` on their latest
+    bar. Symbols without a bar on the common session are not screened; their
+    count is in table.attrs["excluded"].
+    """
+    names, m = load_matrices(symbols, interval, store=store)
+    if names:
+        names, m = current(names, m)
+    if not names:
+        table = pd.DataFrame(columns=COLUMNS)
+    else:
+        table = screen_matrices(condition, names, m, rank_by, ascending, limit)
+    table.attrs["excluded"] = len(set(symbols)) - len(names)
+    return table
+
+
+def screen_matrices(condition, names, m, rank_by="RSI", ascending=True, limit=100):
+    fields = compute_fields(m)
+    hits = np.flatnonzero(evaluate(condition, fields))
+    table = pd.DataFrame({c: fields[c][hits] for c in COLUMNS}, index=pd.Index(np.asarray(names)[hits], name="SYMBOL"))
+    key = rank_by.upper() if rank_by.upper() in table else "RSI"
+    return table.sort_values(key, ascending=ascending).head(limit)
@@ -0,0 +1,65 @@
+"""
+SYMBOL UNIVERSES // S&P 500 constituents for the full-universe panels.
+
+The list is scraped from Wikipedia at most once a day and kept on disk, so a
+cold start with no network still ranks the last known constituents.
+"""
+import json
+import time
+
+from bs4 import BeautifulSoup
+
+from core import cache_path, net
+
+SP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+SP500_TTL = 24 * 3600
+RETRY_AFTER = 600
+
+# Last-resort list when neither the network nor the disk copy is available.
+FALLBACK = ["NVDA", "TSLA", "AMD", "META", "AMZN", "MSFT", "GOOGL", "AAPL", "NFLX", "PLTR", "COIN", "MSTR", "SMCI", "AVGO", "COST"]
+
+_cache = {"symbols": None, "loaded": 0.0}
+
+
+def _scrape_sp500():
+    r = net.get(SP500_URL, retries=net.PAGE_RETRIES)
+    r.raise_for_status()
+    table = BeautifulSoup(r.text, 'html.parser').find("table", id="constituents")
+    symbols = []
+    for row in table.find_all("tr")[1:]:
+        cell = row.find("td")
+        if cell is not None:
+            # Yahoo uses '-' for share classes (BRK.B -> BRK-B)
+            symbols.append(cell.get_text(strip=True).replace(".", "-"))
+    if len(symbols) < 400:
+        raise ValueError(f"constituent table looks truncated ({len(symbols)} rows)")
+    return symbols
+
+
+def sp500():
+    """Current S&P 500 tickers in Yahoo format."""
+    now = time.time()
+    if _cache["symbols"] and now - _cache["loaded"] < SP500_TTL:
+        return _cache["symbols"]
+
+    path = cache_path("universe", "sp500.json")
+    disk = None
+    try:
+        with open(path) as f:
+            disk = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if disk and now - disk.get("fetched", 0) < SP500_TTL:
+        symbols = disk["symbols"]
+    else:
+        try:
+            symbols = _scrape_sp500()
+            with open(path, "w") as f:
+                json.dump({"fetched": now, "symbols": symbols}, f)
+        except Exception:
+            symbols = disk["symbols"] if disk else list(FALLBACK)
+            now -= SP500_TTL - RETRY_AFTER   # try the scrape again soon
+
+    _cache.update(symbols=symbols, loaded=now)
+    return symbols
@@ -0,0 +1,40 @@
+"""
+SHARED WORKER POOLS // process-wide, so pages don't spin up a new pool per rerun.
+
+io_pool is for network-bound calls (Yahoo, scrapes). Tasks must not touch
+`st.*`; Streamlit elements can only be created from the script thread.
+cpu_pool() is a lazily started process pool for heavy NumPy work.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+io_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="yn-io")
+
+
+# cpu_pool is for CPU-bound NumPy work that should use every core. It is
+# created on first use, and its workers come from a clean forkserver process
+# instead of a fork of the threaded Streamlit server. Anything submitted must
+# be a picklable top-level function.
+_cpu_pool = None
+_cpu_guard = threading.Lock()
+
+
+def cpu_pool():
+    global _cpu_pool
+    with _cpu_guard:
+        if _cpu_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2, mp_context=ctx)
+        return _cpu_pool
+
+
+def reset_cpu_pool():
+    """Drop a broken pool (e.g. a worker was OOM-killed) so the next call rebuilds it."""
+    global _cpu_pool
+    with _cpu_guard:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
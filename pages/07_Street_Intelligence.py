@@ -5,6 +5,9 @@ import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 import pytz
+from concurrent.futures import as_completed
+from core import bars, charts, dossier, indicators, memo, render, universe, workers
+from core.fundamentals import get_info
 
 # --- 1. CONFIGURATION ---
 st.set_page_config(layout="wide", page_title="STREET_INTEL_LIVE", initial_sidebar_state="collapsed")
@@ -67,51 +70,110 @@ inject_dossier_css()
 
 # --- 3. REAL DATA ENGINE ---
 class RealIntelEngine:
+    # Raw inputs, fetched concurrently: data key -> loader method
+    LOADERS = {
+        "hist": "_load_hist",
+        "intra": "_load_intra",
+        "info": "_load_info",
+        "holders": "_load_holders",
+    }
+    # Per-component freshness (seconds): intraday bars move every minute,
+    # fundamentals and 13F holders change daily / quarterly.
+    TTL = {"hist": 300, "intra": 60, "info": 6 * 3600, "holders": 24 * 3600}
+    # Empty / failed loads are retried after this long instead of the full TTL
+    RETRY_TTL = 30
+    # Derived steps in dependency order: (data key, inputs, method)
+    DERIVED = [
+        ("flow", ("intra",), "_calc_real_flow"),
+        ("regime_stats", ("hist", "info"), "_calc_real_regime"),
+        ("liq", ("info",), "_calc_real_liquidity"),
+        ("top_holders", ("holders", "info"), "_format_ownership"),
+        ("narrative_text", ("info", "regime_stats", "hist"), "_generate_real_narrative"),
+    ]
+
     def __init__(self, ticker):
         self.ticker = ticker
         self.mode = "CONNECTING..."
         self.data = {}
-        
-    def fetch(self):
+        self.versions = {}
+        self.memo = memo.shared("street_intel")
+
+    # 1. LOADERS (run on the shared io pool; no st.* calls in here)
+    def _load_hist(self):
+        return bars.history(self.ticker, interval="1d", period="1mo")
+
+    def _load_intra(self):
+        intra = bars.history(self.ticker, interval="5m", period="1d")
+        # Fallback for empty intraday (e.g. weekend)
+        if intra.empty: intra = bars.history(self.ticker, interval="1d", period="1mo").tail(5)
+        return intra
+
+    def _load_info(self):
+        return get_info(self.ticker, ("estimates", "short", "ownership", "financials"))
+
+    def _load_holders(self):
         try:
-            t = yf.Ticker(self.ticker)
-            
-            # 1. PRICE HISTORY (Real)
-            hist = t.history(period="1mo", interval="1d") 
-            intra = t.history(period="1d", interval="5m")
-            
-            # FLATTEN COLUMNS (Critical Fix for MultiIndex Error)
-            if isinstance(hist.columns, pd.MultiIndex): hist.columns = hist.columns.get_level_values(0)
-            if isinstance(intra.columns, pd.MultiIndex): intra.columns = intra.columns.get_level_values(0)
-            
-            # Fallback for empty intraday (e.g. weekend)
-            if intra.empty: intra = hist.tail(5)
-            
-            if hist.empty: 
-                self.mode = "NO DATA FOUND"
-                return
+            return yf.Ticker(self.ticker).institutional_holders
+        except:
+            return None
 
-            self.data['hist'] = hist
-            self.data['intra'] = intra
-            
-            # 2. FUNDAMENTAL DATA (Real)
-            self.data['info'] = t.info
-            try:
-                self.data['holders'] = t.institutional_holders
-            except:
-                self.data['holders'] = None
-            
-            # 3. DERIVED METRICS (Real Math)
-            self._calc_real_flow()
-            self._calc_real_regime()
-            self._calc_real_liquidity()
-            self._format_ownership()
-            self._generate_real_narrative()
-            
+    def stream(self):
+        """
+        Issue all four requests at once and yield each data key as soon as it is
+        ready, raw inputs and derived metrics alike, so the page can paint panels
+        progressively. Wall time is roughly the slowest single request.
+        """
+        # Memoized components within their TTL come straight from memory;
+        # only expired ones go to the network.
+        cached, futures = [], {}
+        for key, fn in self.LOADERS.items():
+            hit = self.memo.fresh((self.ticker, key), self.TTL[key])
+            if hit is not None:
+                cached.append((key, hit))
+            else:
+                futures[workers.io_pool.submit(getattr(self, fn))] = key
+
+        def arrivals():
+            for key, hit in cached:
+                yield key, hit
+            for fut in as_completed(futures):
+                key = futures[fut]
+                value = fut.result()
+                failed = value is None or len(value) == 0     # empty frame / {} from a Yahoo hiccup
+                yield key, (value, self.memo.put((self.ticker, key), value, ttl=self.RETRY_TTL if failed else None))
+
+        try:
+            for key, (value, version) in arrivals():
+                self.data[key], self.versions[key] = value, version
+                if key == "hist" and self.data['hist'].empty:
+                    self.mode = "NO DATA FOUND"
+                    return
+                yield key
+                # 3. DERIVED METRICS (Real Math), each as soon as its inputs exist,
+                # recomputed only if one of those inputs was actually reloaded.
+                for out, deps, method in self.DERIVED:
+                    if out not in self.data and all(d in self.data for d in deps):
+                        self._derive(out, deps, method)
+                        yield out
             self.mode = "LIVE UPLINK"
-            
         except Exception as e:
             self.mode = f"API ERROR: {str(e)}"
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    def fetch(self):
+        for _ in self.stream():
+            pass
+
+    def _derive(self, out, deps, method):
+        dep_versions = tuple(self.versions[d] for d in deps)
+        hit = self.memo.matching((self.ticker, out), dep_versions)
+        if hit is not None:
+            self.data[out], self.versions[out] = hit
+            return
+        getattr(self, method)()
+        self.versions[out] = self.memo.put((self.ticker, out), self.data[out], dep_versions)
 
     def _calc_real_flow(self):
         # Buy/Sell Pressure based on Candle Color * Volume
@@ -137,17 +199,15 @@ class RealIntelEngine:
 
     def _calc_real_regime(self):
         # RSI & Trend from Real Price
+        # (Wilder RSI / SMA20 shared with Technical_Analysis via core.indicators)
         df = self.data['hist']
         close = df['Close']
         
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
+        ind = indicators.latest(self.ticker, "1d", refresh=False)
+        rsi = ind['RSI']
         if np.isnan(rsi): rsi = 50
         
-        sma20 = close.rolling(20).mean().iloc[-1]
+        sma20 = ind['SMA20']
         if np.isnan(sma20): sma20 = close.mean()
         
         regime = "NEUTRAL"
@@ -209,87 +269,144 @@ class RealIntelEngine:
         """
 
 # --- 4. RENDER UI ---
+OWNERSHIP_PANEL = render.Template("""
+<div class="panel"><div class="panel-header"><span class="panel-title">INSTITUTIONAL HOLDERS</span><span class="panel-meta">13F / AGGREGATE</span></div>
+<div class="own-row own-header"><span>ENTITY</span><span>SHARES / %</span><span>REPORTED</span></div>
+{rows}
+</div>
+""")
+OWN_ROW = render.Template('<div class="own-row"><span style="color:#ddd; font-weight:600;">{name}</span><span class="mono amber">{shares}</span><span class="mono muted">{date}</span></div>')
+
 with st.sidebar:
     st.markdown("### // INTEL_DESK")
+    desk_mode = st.radio("MODE", ["SINGLE DOSSIER", "WATCHLIST BATCH"], horizontal=True)
     target = st.text_input("TICKER", "NVDA").upper()
+    if desk_mode == "WATCHLIST BATCH":
+        use_sp500 = st.checkbox("FULL S&P 500", value=False)
+        watch_raw = st.text_area("WATCHLIST", "NVDA, TSLA, AMD, META, AMZN, MSFT, GOOGL, AAPL, NFLX, PLTR, COIN, AVGO, COST")
+        with_float = st.checkbox("FLOAT STRUCTURE (per-name info)", value=not use_sp500)
 
-engine = RealIntelEngine(target)
-engine.fetch()
+# --- 4b. WATCHLIST BATCH MODE (vectorized across a symbols-as-columns panel) ---
+@st.cache_data(ttl=300)
+def load_watchlist_dossier(symbols, with_float):
+    return dossier.build(list(symbols), with_float=with_float)
 
-if "API ERROR" in engine.mode or engine.mode == "NO DATA FOUND":
-    st.error(f"CONNECTION FAILURE: {engine.mode}")
-else:
-    # Header
-    c1, c2 = st.columns([3, 1])
-    with c1:
-        st.markdown(f'<div class="header-main">{target} // LIVE DOSSIER</div>', unsafe_allow_html=True)
-        st.markdown('<div class="header-sub">REAL-TIME DATA ONLY • NO SIMULATION</div>', unsafe_allow_html=True)
-    with c2:
-        regime = engine.data['regime_stats']['STATE']
-        color = "#00ff41" if "BULL" in regime else "#ff3b3b" if "BEAR" in regime else "#ffae00"
-        st.markdown(f'<div style="text-align:right; font-family:monospace; color:{color}; border:1px solid {color}; padding:5px;">REGIME: {regime}</div>', unsafe_allow_html=True)
-    st.markdown("---")
-
-    # Main Grid
-    c1, c2 = st.columns([1, 2])
-    
-    with c1:
-        # Liquidity
-        liq = engine.data['liq']
-        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">FLOAT STRUCTURE</span></div>', unsafe_allow_html=True)
-        st.markdown(f"""
-            <div style="display:flex; height:8px; width:100%; background:#222; margin-bottom:5px;">
-                <div style="width:{liq['LOCKED']}%; background:#444;"></div>
-                <div style="width:{liq['FLOAT']}%; background:#00ff41;"></div>
-            </div>
-            <div style="display:flex; justify-content:space-between; font-size:8px; color:#666;">
-                <span>LOCKED/INSIDERS: {liq['LOCKED']}%</span><span>PUBLIC FLOAT: {liq['FLOAT']}%</span>
-            </div>
-        </div>""", unsafe_allow_html=True)
-        
-        # Flow
-        flow = engine.data['flow']
-        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">VOLUME PRESSURE</span><span class="panel-meta">REAL FLOW</span></div>', unsafe_allow_html=True)
-        st.markdown(f"""
-            <div style="font-size:10px; margin-bottom:5px; display:flex; justify-content:space-between;">
-                <span>BUYING PRESSURE</span><span class="pos mono">{flow['BUY']:.1f}%</span>
-            </div>
-            <div class="cp-bar-bg"><div class="cp-bar-fill" style="width:{flow['BUY']}%; background:#00ff41;"></div></div>
-            <div style="font-size:10px; margin-top:10px; margin-bottom:5px; display:flex; justify-content:space-between;">
-                <span>SELLING PRESSURE</span><span class="neg mono">{flow['SELL']:.1f}%</span>
-            </div>
-            <div class="cp-bar-bg"><div class="cp-bar-fill" style="width:{flow['SELL']}%; background:#ff3b3b;"></div></div>
-            <div style="margin-top:15px; border-top:1px dashed #333; padding-top:10px; text-align:center;">
-                <span style="font-size:9px; color:#666;">NET FLOW STATE</span>
-                <div style="font-size:16px; font-weight:bold; color:#fff;">{flow['NET']}</div>
-            </div>
-        </div>""", unsafe_allow_html=True)
-        
-        # Narrative
-        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">TECHNICAL NARRATIVE</span></div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="narrative-text">{engine.data["narrative_text"]}</div>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with c2:
-        # Ownership
-        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">INSTITUTIONAL HOLDERS</span><span class="panel-meta">13F / AGGREGATE</span></div>', unsafe_allow_html=True)
-        st.markdown('<div class="own-row own-header"><span>ENTITY</span><span>SHARES / %</span><span>REPORTED</span></div>', unsafe_allow_html=True)
-        for h in engine.data['top_holders']:
-            name = h.get('Holder', 'N/A')
-            shares = h.get('Shares', 0)
-            if isinstance(shares, (int, float)) and shares > 1e6: share_str = f"{shares/1e6:.1f}M"
-            else: share_str = str(shares)
-            date = h.get('Date Reported', 'N/A')
-            if isinstance(date, (pd.Timestamp, datetime)): date = date.strftime('%Y-%m-%d')
-            st.markdown(f'<div class="own-row"><span style="color:#ddd; font-weight:600;">{name}</span><span class="mono amber">{share_str}</span><span class="mono muted">{date}</span></div>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Chart
-        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">PRICE ACTION</span><span class="panel-meta">1 MONTH</span></div>', unsafe_allow_html=True)
-        fig = go.Figure(data=[go.Candlestick(x=engine.data['hist'].index, open=engine.data['hist']['Open'], high=engine.data['hist']['High'], low=engine.data['hist']['Low'], close=engine.data['hist']['Close'], increasing_line_color='#ffae00', decreasing_line_color='#333')])
+if desk_mode == "WATCHLIST BATCH":
+    symbols = universe.sp500() if use_sp500 else [s for s in watch_raw.replace("\n", ",").split(",") if s.strip()]
+    st.markdown(f'<div class="header-main">WATCHLIST // {len(symbols)} NAMES</div>', unsafe_allow_html=True)
+    st.markdown('<div class="header-sub">BATCH DOSSIER • FLOW / RSI / SMA20 REGIME / FLOAT</div>', unsafe_allow_html=True)
+    with st.spinner("SCANNING WATCHLIST..."):
+        table = load_watchlist_dossier(tuple(symbols), with_float)
+    if table.empty:
+        st.error("CONNECTION FAILURE: NO DATA FOUND")
+    else:
+        st.dataframe(
+            table,
+            column_config={
+                "CHG%": st.column_config.NumberColumn(format="%+.2f%%"),
+                "RSI": st.column_config.ProgressColumn(format="%.1f", min_value=0, max_value=100),
+                "BUY%": st.column_config.NumberColumn(format="%.1f%%"),
+                "SELL%": st.column_config.NumberColumn(format="%.1f%%"),
+                "FLOAT%": st.column_config.NumberColumn(format="%.1f%%"),
+                "LOCKED%": st.column_config.NumberColumn(format="%.1f%%"),
+            },
+            use_container_width=True, height=600,
+        )
+    st.stop()
+
+def render_header(slot):
+    regime = engine.data['regime_stats']['STATE']
+    color = "#00ff41" if "BULL" in regime else "#ff3b3b" if "BEAR" in regime else "#ffae00"
+    with slot.container():
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            st.markdown(f'<div class="header-main">{target} // LIVE DOSSIER</div>', unsafe_allow_html=True)
+            st.markdown('<div class="header-sub">REAL-TIME DATA ONLY • NO SIMULATION</div>', unsafe_allow_html=True)
+        with c2:
+            st.markdown(f'<div style="text-align:right; font-family:monospace; color:{color}; border:1px solid {color}; padding:5px;">REGIME: {regime}</div>', unsafe_allow_html=True)
+        st.markdown("---")
+
+def render_liquidity(slot):
+    liq = engine.data['liq']
+    slot.markdown(f"""<div class="panel"><div class="panel-header"><span class="panel-title">FLOAT STRUCTURE</span></div>
+        <div style="display:flex; height:8px; width:100%; background:#222; margin-bottom:5px;">
+            <div style="width:{liq['LOCKED']}%; background:#444;"></div>
+            <div style="width:{liq['FLOAT']}%; background:#00ff41;"></div>
+        </div>
+        <div style="display:flex; justify-content:space-between; font-size:8px; color:#666;">
+            <span>LOCKED/INSIDERS: {liq['LOCKED']}%</span><span>PUBLIC FLOAT: {liq['FLOAT']}%</span>
+        </div>
+    </div>""", unsafe_allow_html=True)
+
+def render_flow(slot):
+    flow = engine.data['flow']
+    slot.markdown(f"""<div class="panel"><div class="panel-header"><span class="panel-title">VOLUME PRESSURE</span><span class="panel-meta">REAL FLOW</span></div>
+        <div style="font-size:10px; margin-bottom:5px; display:flex; justify-content:space-between;">
+            <span>BUYING PRESSURE</span><span class="pos mono">{flow['BUY']:.1f}%</span>
+        </div>
+        <div class="cp-bar-bg"><div class="cp-bar-fill" style="width:{flow['BUY']}%; background:#00ff41;"></div></div>
+        <div style="font-size:10px; margin-top:10px; margin-bottom:5px; display:flex; justify-content:space-between;">
+            <span>SELLING PRESSURE</span><span class="neg mono">{flow['SELL']:.1f}%</span>
+        </div>
+        <div class="cp-bar-bg"><div class="cp-bar-fill" style="width:{flow['SELL']}%; background:#ff3b3b;"></div></div>
+        <div style="margin-top:15px; border-top:1px dashed #333; padding-top:10px; text-align:center;">
+            <span style="font-size:9px; color:#666;">NET FLOW STATE</span>
+            <div style="font-size:16px; font-weight:bold; color:#fff;">{flow['NET']}</div>
+        </div>
+    </div>""", unsafe_allow_html=True)
+
+def render_narrative(slot):
+    slot.markdown(f'<div class="panel"><div class="panel-header"><span class="panel-title">TECHNICAL NARRATIVE</span></div><div class="narrative-text">{engine.data["narrative_text"]}</div></div>', unsafe_allow_html=True)
+
+def render_ownership(slot):
+    holder_rows = []
+    for h in engine.data['top_holders']:
+        name = h.get('Holder', 'N/A')
+        shares = h.get('Shares', 0)
+        if isinstance(shares, (int, float)) and shares > 1e6: share_str = f"{shares/1e6:.1f}M"
+        else: share_str = str(shares)
+        date = h.get('Date Reported', 'N/A')
+        if isinstance(date, (pd.Timestamp, datetime)): date = date.strftime('%Y-%m-%d')
+        holder_rows.append({"name": name, "shares": share_str, "date": date})
+    render.emit(OWNERSHIP_PANEL.render(rows=OWN_ROW.render_rows(holder_rows)), slot)
+
+def render_chart(slot):
+    hist = engine.data['hist']
+    with slot.container():
+        st.markdown('<div class="panel"><div class="panel-header"><span class="panel-title">PRICE ACTION</span><span class="panel-meta">1 MONTH</span></div></div>', unsafe_allow_html=True)
+        fig = go.Figure(data=[charts.candles(hist, increasing_line_color='#ffae00', decreasing_line_color='#333')])
         fig.update_layout(template="plotly_dark", height=250, margin=dict(l=0,r=40,t=10,b=0), paper_bgcolor='#0b0b0b', plot_bgcolor='#0b0b0b', xaxis_rangeslider_visible=False)
         st.plotly_chart(fig, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+
+# Reserve every panel's slot up front, then paint each one the moment its data lands.
+engine = RealIntelEngine(target)
+header_slot = st.empty()
+c1, c2 = st.columns([1, 2])
+with c1:
+    liq_slot, flow_slot, narrative_slot = st.empty(), st.empty(), st.empty()
+with c2:
+    own_slot, chart_slot = st.empty(), st.empty()
+
+PANELS = {
+    "regime_stats": (render_header, header_slot),
+    "liq": (render_liquidity, liq_slot),
+    "flow": (render_flow, flow_slot),
+    "narrative_text": (render_narrative, narrative_slot),
+    "top_holders": (render_ownership, own_slot),
+    "hist": (render_chart, chart_slot),
+}
+for fn, slot in PANELS.values():
+    slot.markdown('<div class="panel"><span class="panel-title">ACQUIRING…</span></div>', unsafe_allow_html=True)
+
+for key in engine.stream():
+    if key in PANELS:
+        fn, slot = PANELS[key]
+        fn(slot)
+
+if "API ERROR" in engine.mode or engine.mode == "NO DATA FOUND":
+    for fn, slot in PANELS.values():
+        slot.empty()
+    header_slot.error(f"CONNECTION FAILURE: {engine.mode}")
 
 # Footer
 now = datetime.now(pytz.timezone('US/Eastern')).strftime("%H:%M:%S")
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import google.generativeai as genai
+from core import render
 
 # 1. THE 2026 AI BRAIN (Multi-Model Fallback)
 def trigger_oracle(metric, val):
@@ -34,16 +35,31 @@ with st.sidebar:
     st.markdown(f"<div style='border:1px solid #00ff41; padding:15px; border-radius:10px; background:rgba(0,255,65,0.05); color:#fff; font-family:monospace;'>{st.session_state.oracle_msg}</div>", unsafe_allow_html=True)
 
 # 3. DATA VIEW ENGINE
+# All line items go out as one HTML payload; a single picker + DECODE button
+# replaces the per-row button column.
+MATRIX_PANEL = render.Template('''
+<div style="display:grid; grid-template-columns:4fr 2fr; row-gap:4px;">
+{rows}
+</div>
+''')
+MATRIX_ROW = render.Template('''
+<span style="color:#888; font-family:monospace;">{label}</span><span style="color:#00ff41; font-family:Courier; font-weight:bold;">{value}</span>
+''')
+
 df = st.session_state.get('matrix_data')
 if df is not None:
     latest = df.iloc[:, 0]
     # SORT BY IMPORTANCE: Biggest numbers first
     items = sorted(list(latest.items()), key=lambda x: abs(x[1]) if isinstance(x[1], (int, float)) else 0, reverse=True)
+    rows = [
+        {"label": str(k).upper(), "value": f"{v:,.2f}" if isinstance(v, (int, float)) else str(v)}
+        for k, v in items
+    ]
+
+    # DECODE: CALLBACK ENGINE
+    c1, c2 = st.columns([4, 1])
+    pick = c1.selectbox("SIGNAL", range(len(rows)), format_func=lambda i: rows[i]["label"], label_visibility="collapsed")
+    if rows:
+        c2.button("DECODE", on_click=trigger_oracle, args=(items[pick][0], rows[pick]["value"]))
 
-    for i, (k, v) in enumerate(items):
-        display_v = f"{v:,.2f}" if isinstance(v, (int, float)) else str(v)
-        c1, c2, c3 = st.columns([4, 2, 1])
-        c1.markdown(f"<p style='color:#888; font-family:monospace;'>{k.upper()}</p>", unsafe_allow_html=True)
-        c2.markdown(f"<p style='color:#00ff41; font-family:Courier; font-weight:bold;'>{display_v}</p>", unsafe_allow_html=True)
-        # DECODE: CALLBACK ENGINE
-        c3.button("DECODE", key=f"d_{i}", on_click=trigger_oracle, args=(k, display_v))
+    render.emit(MATRIX_PANEL.render(rows=MATRIX_ROW.render_rows(rows)))
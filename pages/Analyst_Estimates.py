@@ -1,5 +1,6 @@
 import streamlit as st
 import yfinance as yf
+from core.fundamentals import get_info
 import pandas as pd
 import plotly.graph_objects as go
 def inject_stark_ui_v2():
@@ -84,7 +85,7 @@ st.markdown("""
 
 ticker = st.session_state.get('ticker', 'NVDA')
 stock = yf.Ticker(ticker)
-info = stock.info
+info = get_info(ticker, ("quote", "estimates"))
 
 st.markdown(f"<h1 style='color:#00ff41; font-family:monospace;'>// ANALYST_ORACLE: {ticker}</h1>", unsafe_allow_html=True)
 
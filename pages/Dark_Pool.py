@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-import requests
+from core import net
 from bs4 import BeautifulSoup
 import streamlit as st
 
@@ -17,8 +17,7 @@ def get_real_dark_pool_ratio(ticker):
     try:
         # We target a high-traffic dashboard that displays public FINRA reports
         url = f"https://chartexchange.com/symbol/nasdaq-{ticker.lower()}/stats/"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers)
+        response = net.get(url, retries=net.PAGE_RETRIES)
         
         # We look for the 'Off-Exchange' or 'Dark Pool' table row
         soup = BeautifulSoup(response.text, 'html.parser')
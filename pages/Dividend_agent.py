@@ -1,5 +1,6 @@
 import streamlit as st
 import yfinance as yf
+from core.fundamentals import get_info
 import pandas as pd
 import plotly.express as px
 
@@ -21,7 +22,7 @@ st.markdown("""
 
 ticker = st.session_state.get('ticker', 'NVDA')
 stock = yf.Ticker(ticker)
-info = stock.info
+info = get_info(ticker, ("dividends",))
 
 st.markdown(f"<h1 style='color:#00ff41; font-family:monospace;'>// DIVIDEND_ENGINE: {ticker}</h1>", unsafe_allow_html=True)
 
@@ -1,5 +1,6 @@
 import streamlit as st
 import yfinance as yf
+from core.fundamentals import get_info
 import plotly.express as px
 import pandas as pd
 
@@ -62,5 +63,5 @@ with tabs[0]: render_blade(stock.income_stmt, "INCOME", "Revenue velocity vs Mar
 with tabs[1]: render_blade(stock.balance_sheet, "BALANCE", "Capital architecture surveillance and liquidity check.")
 with tabs[2]: render_blade(stock.cashflow, "CASH_FLOW", "Operational efficiency and reinvestment logic.")
 with tabs[3]: 
-    combined = {**stock.info, **(stock.sustainability.to_dict() if stock.sustainability is not None else {})}
+    combined = {**get_info(ticker, ("financials",)), **(stock.sustainability.to_dict() if stock.sustainability is not None else {})}
     render_blade(combined, "QUANT_SIGNAL", "ESG risk factors and valuation multiples.")
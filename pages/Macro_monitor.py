@@ -1,5 +1,5 @@
 import streamlit as st
-import yfinance as yf
+from core import bars, charts
 import pandas as pd
 import plotly.graph_objects as go
 
@@ -19,16 +19,17 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-stock = yf.Ticker(ticker)
 
 st.markdown(f"<h1 style='color:#0096ff; font-family:monospace;'>// MACRO_CORRELATION: {ticker}</h1>", unsafe_allow_html=True)
 
 # 2. FETCH MACRO SIGNALS (Treasury Yields & Dollar Index)
-@st.cache_data(ttl=3600)
+# Served from the local bar store; only bars newer than the last stored one hit the network.
+period, interval = charts.window_picker("macro_window", options=("3M", "1Y", "2Y", "10Y"))
+
 def fetch_macro_data():
     # ^TNX = 10-Year Treasury Yield, DX-Y.NYB = US Dollar Index
-    tnx = yf.Ticker("^TNX").history(period="1y")['Close']
-    dxy = yf.Ticker("DX-Y.NYB").history(period="1y")['Close']
+    tnx = bars.history("^TNX", interval=interval, period=period)['Close']
+    dxy = bars.history("DX-Y.NYB", interval=interval, period=period)['Close']
     return tnx, dxy
 
 tnx_data, dxy_data = fetch_macro_data()
@@ -36,14 +37,14 @@ tnx_data, dxy_data = fetch_macro_data()
 # 3. MACD/TICKER CORRELATION CHART
 st.markdown("### // YIELD_SENSITIVITY_ANALYSIS (10Y_TREASURY vs TICKER)")
 
-stock_price = stock.history(period="1y")['Close']
+stock_price = bars.history(ticker, interval=interval, period=period)['Close']
 
 fig = go.Figure()
 # Normalize data for comparison (0 to 100 scale)
 def normalize(s): return (s - s.min()) / (s.max() - s.min()) * 100
 
-fig.add_trace(go.Scatter(x=stock_price.index, y=normalize(stock_price), name=f"{ticker}_PRICE", line=dict(color='#00ff41', width=3)))
-fig.add_trace(go.Scatter(x=tnx_data.index, y=normalize(tnx_data), name="10Y_TREASURY_YIELD", line=dict(color='#0096ff', width=2, dash='dot')))
+fig.add_trace(charts.line(stock_price.index, normalize(stock_price), name=f"{ticker}_PRICE", line=dict(color='#00ff41', width=3)))
+fig.add_trace(charts.line(tnx_data.index, normalize(tnx_data), name="10Y_TREASURY_YIELD", line=dict(color='#0096ff', width=2, dash='dot')))
 
 fig.update_layout(template="plotly_dark", height=500, margin=dict(l=0,r=0,t=0,b=0), legend=dict(orientation="h", yanchor="bottom", y=1.02))
 st.plotly_chart(fig, use_container_width=True)
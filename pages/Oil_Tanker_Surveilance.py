@@ -1,12 +1,12 @@
-import requests
+from bs4 import BeautifulSoup
+from core import net
 
 def get_oil_tanker_locations():
     # The 'SHIPS_CURRENT' datasheet endpoint used by trackers
     # Filter for '8' (Tankers) and 'Cargo'
     url = "https://www.marinetraffic.com/en/ais/index/ships/all/ship_type:8"
     
-    headers = {'User-Agent': 'Mozilla/5.0'} # Impersonate browser
-    response = requests.get(url, headers=headers)
+    response = net.get(url, retries=net.PAGE_RETRIES) # pooled client, browser UA, hard timeout
     
     # Parse the raw HTML table for the 'Exact' Lat/Lon columns
     soup = BeautifulSoup(response.text, 'html.parser')
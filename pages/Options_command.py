@@ -1,7 +1,8 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import time
+from core import chains, greeks, maxpain
 
 # 1. LAYOUT & STYLE
 st.set_page_config(layout="wide", page_title="OPTIONS_COMMAND_2026")
@@ -17,18 +18,25 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-stock = yf.Ticker(ticker)
 
 st.markdown(f"<h1 style='color:#00ff41; font-family:monospace;'>// OPTIONS_COMMAND: {ticker}</h1>", unsafe_allow_html=True)
 
-# 2. SELECT EXPIRATION
-expirations = stock.options
-if expirations:
-    selected_date = st.selectbox("SELECT_EXPIRATION_DATE", expirations)
-    
-    with st.spinner("DECODING_OPTION_CHAIN..."):
-        chain = stock.option_chain(selected_date)
-        calls, puts = chain.calls, chain.puts
+# 2. FULL CHAIN (every expiry fetched concurrently, cached; switching expiry is a local slice)
+with st.sidebar:
+    rate = st.number_input("RISK-FREE RATE (%)", min_value=0.0, max_value=20.0, value=greeks.RATE * 100, step=0.25) / 100
+
+with st.spinner("DECODING_OPTION_CHAIN (ALL EXPIRIES)..."):
+    chain = chains.load(ticker)
+    # IV solved from mids + greeks for every contract (cached per snapshot)
+    priced = chain._replace(frame=greeks.price_chain(chain, rate))
+    # Max pain, P/C ratios and OI walls for every expiry (cached per snapshot)
+    oi = maxpain.analyze(chain)
+
+if chain.expiries:
+    selected_date = st.selectbox("SELECT_EXPIRATION_DATE", chain.expiries)
+    calls, puts = chain.calls_puts(selected_date)
+    st.caption(f"{len(chain.frame):,} CONTRACTS • {len(chain.expiries)} EXPIRIES • SPOT ${chain.spot:,.2f} • "
+               f"SNAPSHOT {time.strftime('%H:%M:%S', time.localtime(chain.fetched))}")
 
     # 3. OPEN INTEREST VISUALIZER
     top_calls = calls.sort_values("openInterest", ascending=False).head(15)
@@ -46,25 +54,122 @@ if expirations:
 
     # 4. THE FIX: STYLING WITHOUT MATPLOTLIB
     st.markdown("### // DEEP_CHAIN_ANALYSIS")
-    calls['Type'], puts['Type'] = 'CALL', 'PUT'
-    combined = pd.concat([calls, puts])
-    liquid_strikes = combined.sort_values("volume", ascending=False).head(20)
+    liquid_strikes = priced.expiry(selected_date).sort_values("volume", ascending=False).head(20)
 
     # We use column_config to create bars instead of background gradients
     st.data_editor(
-        liquid_strikes[['Type', 'strike', 'lastPrice', 'change', 'percentChange', 'volume', 'openInterest', 'impliedVolatility']],
+        liquid_strikes[['type', 'strike', 'lastPrice', 'change', 'percentChange', 'volume', 'openInterest', 'iv',
+                        'delta', 'gamma', 'vega', 'theta']],
         column_config={
+            "type": "Type",
             "volume": st.column_config.ProgressColumn("VOLUME_FLOW", format="%d", min_value=0, max_value=int(liquid_strikes['volume'].max())),
             "openInterest": st.column_config.ProgressColumn("OPEN_INT", format="%d", min_value=0, max_value=int(liquid_strikes['openInterest'].max())),
-            "impliedVolatility": st.column_config.NumberColumn("IV", format="%.2f%%"),
-            "percentChange": st.column_config.NumberColumn("CHG%", format="%.2f%%")
+            "iv": st.column_config.NumberColumn("IV", format="percent"),
+            "percentChange": st.column_config.NumberColumn("CHG%", format="%.2f%%"),
+            "delta": st.column_config.NumberColumn("Δ", format="%.3f"),
+            "gamma": st.column_config.NumberColumn("Γ", format="%.4f"),
+            "vega": st.column_config.NumberColumn("VEGA", format="%.3f"),
+            "theta": st.column_config.NumberColumn("Θ", format="%.3f"),
         },
         use_container_width=True,
         disabled=True, # Keeps it looking like a dataframe
         hide_index=True
     )
 
+    # 4b. IMPLIED VOL SURFACE (OTM wings, strike/spot x tenor)
+    st.markdown("### // IV_SURFACE")
+    surf = chains.surface(priced, iv_col="iv")
+    term = chains.term_structure(priced, iv_col="iv")
+    s1, s2, s3 = st.tabs(["SURFACE", "TERM_STRUCTURE", f"SKEW {selected_date}"])
+    with s1:
+        if surf.empty:
+            st.info("NOT ENOUGH QUOTED STRIKES FOR A SURFACE")
+        else:
+            days = (term["tenor"].reindex(surf.columns) * 365).round(1)
+            fig_surf = go.Figure(go.Surface(x=days.values, y=surf.index, z=surf.values * 100, colorscale="Viridis",
+                                            colorbar=dict(title="IV %")))
+            fig_surf.update_layout(template="plotly_dark", height=550, margin=dict(l=0, r=0, t=30, b=0),
+                                   scene=dict(xaxis_title="DAYS", yaxis_title="STRIKE / SPOT", zaxis_title="IV %"))
+            st.plotly_chart(fig_surf, use_container_width=True)
+    with s2:
+        fig_term = go.Figure()
+        fig_term.add_trace(go.Scatter(x=term.index, y=term["atm_iv"] * 100, name="ATM IV", line=dict(color="#00ff41")))
+        fig_term.add_trace(go.Bar(x=term.index, y=term["skew"] * 100, name="SKEW (90% - 110%)",
+                                  marker_color="#ff4b4b", opacity=0.5, yaxis="y2"))
+        fig_term.update_layout(template="plotly_dark", height=400, yaxis_title="ATM IV %",
+                               yaxis2=dict(title="SKEW (VOL PTS)", overlaying="y", side="right"))
+        st.plotly_chart(fig_term, use_container_width=True)
+    with s3:
+        sm = chains.smile(priced, selected_date, iv_col="iv")
+        fig_skew = px.scatter(sm, x="moneyness", y=sm["iv"] * 100, color="type",
+                              color_discrete_map={"CALL": "#00ff41", "PUT": "#ff4b4b"},
+                              labels={"y": "IV %", "moneyness": "STRIKE / SPOT"}, template="plotly_dark")
+        fig_skew.update_traces(mode="lines+markers")
+        st.plotly_chart(fig_skew, use_container_width=True)
+
+    # 4c. DEALER GAMMA EXPOSURE (all expiries; dealers long calls / short puts)
+    st.markdown("### // GAMMA_EXPOSURE")
+    gex = greeks.gamma_exposure(priced.frame, chain.spot)
+    flip, spots, profile = greeks.zero_gamma(priced.frame, chain.spot, r=rate)
+    g1, g2, g3 = st.columns(3)
+    g1.metric("NET GEX ($M / 1% MOVE)", f"{gex.sum() / 1e6:+,.1f}")
+    g2.metric("ZERO-GAMMA FLIP", f"${flip:,.2f}" if flip else "NONE IN ±20%",
+              f"{flip / chain.spot - 1:+.2%} vs spot" if flip else None, delta_color="off")
+    g3.metric("REGIME", "LONG GAMMA (PINNING)" if gex.sum() > 0 else "SHORT GAMMA (TRENDING)")
+    near = gex[(gex.index > chain.spot * 0.8) & (gex.index < chain.spot * 1.2)]
+    fig_gex = go.Figure(go.Bar(x=near.index, y=near.values / 1e6, marker_color=["#00ff41" if v > 0 else "#ff4b4b" for v in near.values],
+                               name="GEX BY STRIKE"))
+    fig_gex.add_trace(go.Scatter(x=spots, y=profile / 1e6, name="TOTAL GEX VS SPOT", yaxis="y2", line=dict(color="#ffaa00")))
+    fig_gex.add_vline(x=chain.spot, line_dash="dot", line_color="white", annotation_text="SPOT")
+    if flip:
+        fig_gex.add_vline(x=flip, line_dash="dash", line_color="#ffaa00", annotation_text="FLIP")
+    fig_gex.update_layout(template="plotly_dark", height=420, yaxis_title="$M / 1%",
+                          yaxis2=dict(title="TOTAL $M / 1%", overlaying="y", side="right"))
+    st.plotly_chart(fig_gex, use_container_width=True)
+
+    # 4d. MAX PAIN & OI DISTRIBUTION (every expiry, precomputed per snapshot)
+    st.markdown("### // MAX_PAIN")
+    row = oi.summary.loc[selected_date]
+    call_wall = f"${row['call_wall']:,.2f}" if row["call_wall"] == row["call_wall"] else "—"    # NaN: no strikes that side of spot
+    put_wall = f"${row['put_wall']:,.2f}" if row["put_wall"] == row["put_wall"] else "—"
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("MAX PAIN", f"${row['max_pain']:,.2f}", f"{row['max_pain'] / chain.spot - 1:+.2%} vs spot", delta_color="off")
+    m2.metric("P/C OI", f"{row['pc_oi']:.2f}")
+    m3.metric("P/C VOLUME", f"{row['pc_volume']:.2f}")
+    m4.metric("CALL WALL", call_wall)
+    m5.metric("PUT WALL", put_wall)
+    p1, p2 = st.tabs([f"PAYOUT {selected_date}", "ALL_EXPIRIES"])
+    with p1:
+        prof = oi.profile[oi.profile["expiry"] == selected_date]
+        fig_pain = go.Figure(go.Bar(x=prof["strike"], y=prof["payout"] / 1e6, name="HOLDER PAYOUT ($M)",
+                                    marker_color="#ffaa00", opacity=0.6))
+        fig_pain.add_trace(go.Scatter(x=prof["strike"], y=prof["cum_call"], name="CUM CALL OI (≤ K)",
+                                      yaxis="y2", line=dict(color="#00ff41")))
+        fig_pain.add_trace(go.Scatter(x=prof["strike"], y=prof["cum_put"], name="CUM PUT OI (≥ K)",
+                                      yaxis="y2", line=dict(color="#ff4b4b")))
+        fig_pain.add_vline(x=chain.spot, line_dash="dot", line_color="white", annotation_text="SPOT")
+        fig_pain.add_vline(x=row["max_pain"], line_dash="dash", line_color="#ffaa00", annotation_text="MAX PAIN")
+        fig_pain.update_layout(template="plotly_dark", height=420, yaxis_title="PAYOUT $M",
+                               yaxis2=dict(title="CUMULATIVE OI", overlaying="y", side="right"))
+        st.plotly_chart(fig_pain, use_container_width=True)
+    with p2:
+        st.dataframe(
+            oi.summary,
+            column_config={
+                "max_pain": st.column_config.NumberColumn("MAX PAIN", format="$%.2f"),
+                "min_payout": st.column_config.NumberColumn("PAYOUT AT MAX PAIN", format="$%.0f"),
+                "call_oi": st.column_config.NumberColumn("CALL OI", format="%d"),
+                "put_oi": st.column_config.NumberColumn("PUT OI", format="%d"),
+                "pc_oi": st.column_config.NumberColumn("P/C OI", format="%.2f"),
+                "pc_volume": st.column_config.NumberColumn("P/C VOL", format="%.2f"),
+                "call_wall": st.column_config.NumberColumn("CALL WALL", format="$%.2f"),
+                "put_wall": st.column_config.NumberColumn("PUT WALL", format="$%.2f"),
+            },
+            use_container_width=True,
+        )
+
     # 5. ORACLE INSIGHT
-    st.info(f"ORACLE_INSIGHT: The {selected_date} chain shows maximum friction at ${top_calls['strike'].iloc[0]} (Calls) and ${top_puts['strike'].iloc[0]} (Puts).")
+    st.info(f"ORACLE_INSIGHT: The {selected_date} chain pins toward max pain at ${row['max_pain']:,.2f} "
+            f"(P/C OI {row['pc_oi']:.2f}); call wall {call_wall}, put wall {put_wall}.")
 else:
     st.warning("SIGNAL_LOST: No options found.")
@@ -1,8 +1,8 @@
 import streamlit as st
-import yfinance as yf
+from core import bars, holdings, montecarlo, workers
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
+from concurrent.futures.process import BrokenProcessPool
 
 st.set_page_config(layout="wide", page_title="MONTE_CARLO_SIM")
 
@@ -17,35 +17,103 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-df = yf.Ticker(ticker).history(period="1y")
+
+with st.sidebar:
+    scope = st.radio("SCOPE", ["SESSION TICKER", "PORTFOLIO"], horizontal=True)
+    days = st.slider("HORIZON (TRADING DAYS)", 21, 504, 252, step=21)
+    seed = st.number_input("SEED", min_value=0, value=2026, step=1)
+
+# 0. PORTFOLIO MODE (correlated multi-asset paths, chunks spread over a process pool)
+@st.cache_data(ttl=300, show_spinner=False)
+def load_closes(symbols):
+    return holdings.aligned_closes(list(symbols))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def run_portfolio(closes, weights, days, paths, seed):
+    try:
+        return montecarlo.simulate_portfolio(closes, weights, days=days, paths=paths, seed=seed, pool=workers.cpu_pool())
+    except BrokenProcessPool:
+        workers.reset_cpu_pool()
+        return montecarlo.simulate_portfolio(closes, weights, days=days, paths=paths, seed=seed)
+
+if scope == "PORTFOLIO":
+    with st.sidebar:
+        source = st.radio("WEIGHTS FROM", holdings.SOURCES)
+        paths = st.select_slider("PATHS", [50_000, 100_000, 250_000, 500_000], value=250_000)
+    st.markdown("<h1 style='color:#00f0ff; font-family:monospace;'>// PORTFOLIO_MONTE_CARLO</h1>", unsafe_allow_html=True)
+
+    weights = holdings.weights(st.session_state, source)
+    capital = 100_000.0 if source == holdings.SOURCES[0] else sum(weights.values())
+    if not weights:
+        st.info("NO PORTFOLIO IN THIS SESSION YET. Open Beginner_Home or place trades in Trading_Simulator first.")
+        st.stop()
+    capital = st.sidebar.number_input("CAPITAL ($)", min_value=1.0, value=float(round(capital, 2)))
+
+    with st.spinner(f"LOADING {len(weights)} PRICE HISTORIES..."):
+        closes = load_closes(tuple(sorted(weights)))
+    missing = sorted(set(weights) - set(closes.columns))
+    if missing:
+        st.caption(f"NO PRICE HISTORY (weight re-normalized away): {', '.join(missing)}")
+    try:
+        with st.spinner(f"SIMULATING {paths:,} CORRELATED PATHS..."):
+            psim = run_portfolio(closes, weights, days, paths, int(seed))
+    except ValueError as e:
+        st.error(f"SIMULATION ABORTED: {e}")
+        st.stop()
+    stats = montecarlo.portfolio_stats(psim, capital)
+
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("MEDIAN TERMINAL", f"${stats['MEDIAN']:,.0f}", f"{stats['MEDIAN'] / capital - 1:+.1%}")
+    m2.metric("P5 / P95", f"${stats['P5']:,.0f}", f"P95 ${stats['P95']:,.0f}", delta_color="off")
+    m3.metric("P(LOSS)", f"{stats['P(LOSS)']:.1%}")
+    m4.metric("VAR95 / CVAR95", f"${stats['VAR95']:,.0f}", f"CVaR ${stats['CVAR95']:,.0f}", delta_color="off")
+    m5.metric("MEDIAN MAX DRAWDOWN", f"{stats['MEDIAN_DD']:.1%}", f"P95 {stats['P95_DD']:.1%} • P(>20%) {stats['P(DD>20%)']:.1%}", delta_color="off")
+
+    # Histograms are binned here, so the browser gets ~100 bars instead of every path
+    h1, h2 = st.columns(2)
+    tv_counts, tv_edges = np.histogram(psim.terminal * capital, bins=100)
+    dd_counts, dd_edges = np.histogram(psim.max_drawdown * 100, bins=60)
+    for col, counts, edges, title, color in ((h1, tv_counts, tv_edges, "TERMINAL_VALUE ($)", "#00f0ff"),
+                                             (h2, dd_counts, dd_edges, "MAX_DRAWDOWN (%)", "#ff4b4b")):
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / counts.sum(), marker_color=color))
+        fig.update_layout(template="plotly_dark", height=380, bargap=0.02, xaxis_title=title, yaxis_title="PROBABILITY",
+                          margin=dict(l=0,r=0,t=10,b=0))
+        col.plotly_chart(fig, use_container_width=True)
+
+    st.caption(f"{psim.paths:,} PATHS // {len(psim.assets)} ASSETS // BUY-AND-HOLD // "
+               f"LEDOIT-WOLF SHRINKAGE {psim.shrinkage:.2f} // SEED {psim.seed} // {len(closes)} OVERLAPPING DAYS")
+    st.stop()
+
+df = bars.history(ticker, period="1y")
 
 st.markdown(f"<h1 style='color:#00f0ff; font-family:monospace;'>// MONTE_CARLO_PROJECTION: {ticker}</h1>", unsafe_allow_html=True)
 
-# 1. MONTE CARLO MATH
-returns = df['Close'].pct_change()
+with st.sidebar:
+    paths = st.select_slider("PATHS", [10_000, 50_000, 100_000, 250_000, 500_000], value=100_000)
+    model = st.radio("RETURN MODEL", ["GBM", "BOOTSTRAP"], horizontal=True)
+
+# 1. MONTE CARLO MATH (chunked matrix simulation, streaming percentile fan)
+@st.cache_data(ttl=300, show_spinner=False)
+def run_simulation(close, days, paths, model, seed):
+    return montecarlo.simulate(close, days=days, paths=paths, model=model, seed=seed)
+
 last_price = df['Close'].iloc[-1]
-volatility = returns.std()
-days = 252 # 1 Trading Year
-simulations = 50 # Number of paths
-
-# Create price paths
-sim_df = pd.DataFrame()
-for i in range(simulations):
-    daily_returns = np.random.normal(returns.mean(), volatility, days)
-    price_path = last_price * (1 + daily_returns).cumprod()
-    sim_df[i] = price_path
-
-# 2. THE VISUALIZER
+with st.spinner(f"SIMULATING {paths:,} PATHS..."):
+    sim = run_simulation(df['Close'].to_numpy(), days, paths, model.lower(), int(seed))
+
+# 2. THE VISUALIZER (5/25/50/75/95 fan)
+x = list(range(days + 1))
+bands = sim.bands
 fig = go.Figure()
-for i in range(simulations):
-    fig.add_trace(go.Scatter(y=sim_df[i], mode='lines', 
-                             line=dict(width=1), 
-                             opacity=0.3, 
-                             showlegend=False,
-                             hoverinfo='none'))
+fig.add_trace(go.Scatter(x=x, y=bands[95], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+fig.add_trace(go.Scatter(x=x, y=bands[5], mode='lines', line=dict(width=0), fill='tonexty',
+                         fillcolor='rgba(0,240,255,0.12)', name='P5-P95'))
+fig.add_trace(go.Scatter(x=x, y=bands[75], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+fig.add_trace(go.Scatter(x=x, y=bands[25], mode='lines', line=dict(width=0), fill='tonexty',
+                         fillcolor='rgba(0,240,255,0.28)', name='P25-P75'))
 
 # Add the Median Path (Bold)
-fig.add_trace(go.Scatter(y=sim_df.median(axis=1), mode='lines', 
+fig.add_trace(go.Scatter(x=x, y=bands[50], mode='lines', 
                          line=dict(color='#00ff41', width=4), 
                          name='MEDIAN_EXPECTATION'))
 
@@ -54,17 +122,18 @@ fig.update_layout(template="plotly_dark", height=600,
                   margin=dict(l=0,r=0,t=0,b=0))
 
 st.plotly_chart(fig, use_container_width=True)
+st.caption(f"{sim.paths:,} PATHS // {sim.model.upper()} // SEED {sim.seed} // P(FINISH ABOVE ${last_price:.2f}) = {(sim.terminal > last_price).mean():.1%}")
 
 # 3. STATISTICAL OUTCOMES
 c1, c2 = st.columns(2)
 with c1:
     st.markdown("<div class='sim-card'>", unsafe_allow_html=True)
     st.write("BULL_CASE (90th Percentile)")
-    st.markdown(f"<div class='sim-stat'>${sim_df.iloc[-1].quantile(0.90):.2f}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='sim-stat'>${np.percentile(sim.terminal, 90):.2f}</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with c2:
     st.markdown("<div class='sim-card'>", unsafe_allow_html=True)
     st.write("BEAR_CASE (10th Percentile)")
-    st.markdown(f"<div class='sim-stat' style='color:#ff4b4b;'>${sim_df.iloc[-1].quantile(0.10):.2f}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='sim-stat' style='color:#ff4b4b;'>${np.percentile(sim.terminal, 10):.2f}</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
@@ -1,5 +1,10 @@
 import streamlit as st
 import yfinance as yf
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from core import bars, charts, holdings, risk
+from core.fundamentals import get_info
 import google.generativeai as genai
 
 # 1. THE LAYOUT ENGINE
@@ -56,7 +61,7 @@ st.markdown("""
 
 ticker = st.session_state.get('ticker', 'NVDA')
 stock = yf.Ticker(ticker)
-info = stock.info
+info = get_info(ticker, ("financials", "short"))
 
 st.markdown(f"<h1 style='color:#ff4b4b; font-family:monospace;'>// RISK_SURVEILLANCE: {ticker}</h1>", unsafe_allow_html=True)
 
@@ -93,6 +98,85 @@ with c4:
 
 st.markdown("---")
 
+# 4. MARKET RISK ENGINE (historical / parametric / Monte Carlo VaR + CVaR, Kupiec backtest)
+with st.sidebar:
+    st.markdown("### // MARKET_RISK")
+    risk_scope = st.radio("SCOPE", ["SESSION TICKER", "PORTFOLIO"], horizontal=True)
+    if risk_scope == "PORTFOLIO":
+        risk_source = st.radio("WEIGHTS FROM", holdings.SOURCES)
+    exposure = st.number_input("EXPOSURE ($)", min_value=1.0, value=100_000.0, step=10_000.0)
+    levels = st.multiselect("CONFIDENCE", [0.90, 0.95, 0.975, 0.99], default=list(risk.LEVELS))
+    bt_level = st.selectbox("BACKTEST CONFIDENCE", [0.95, 0.99], index=1)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_returns(symbols):
+    if len(symbols) == 1:
+        close = bars.history(symbols[0], period="2y")["Close"].to_frame(symbols[0])
+    else:
+        close = holdings.aligned_closes(list(symbols))
+    return close.pct_change().dropna()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def risk_report(returns, weights, levels):
+    return risk.report(returns.to_numpy(), weights, levels=levels, seed=0)
+
+if risk_scope == "PORTFOLIO":
+    weights_map = holdings.weights(st.session_state, risk_source)
+else:
+    weights_map = {ticker: 1.0}
+
+st.markdown("### // MARKET_RISK: VALUE-AT-RISK / EXPECTED SHORTFALL")
+if not weights_map:
+    st.info("NO PORTFOLIO IN THIS SESSION YET. Open Beginner_Home or place trades in Trading_Simulator first.")
+elif not levels:
+    st.info("Pick at least one confidence level.")
+else:
+    rets = load_returns(tuple(sorted(weights_map)))
+    w = np.array([weights_map[c] for c in rets.columns], dtype=float)
+    if rets.empty or w.sum() <= 0:
+        st.warning("NO OVERLAPPING PRICE HISTORY FOR THIS SCOPE")
+    else:
+        rep = risk_report(rets, tuple(w), tuple(sorted(levels)))
+        rep["VAR $"], rep["CVAR $"] = rep["VAR"] * exposure, rep["CVAR"] * exposure
+        rep["CONF"] = (rep["CONF"] * 100).map("{:g}%".format)
+        rep["HORIZON"] = rep["HORIZON"].map("{}D".format)
+        v1, v2 = st.columns(2)
+        for col, field, title in ((v1, "VAR $", "VaR ($ LOSS)"), (v2, "CVAR $", "CVaR / EXPECTED SHORTFALL ($ LOSS)")):
+            col.markdown(f"**{title}**")
+            col.dataframe(rep.pivot_table(index="METHOD", columns=["CONF", "HORIZON"], values=field, sort=False).round(0),
+                          use_container_width=True)
+
+        port = rets.to_numpy() @ (w / w.sum())
+        try:
+            bt = risk.backtest(port, level=bt_level)
+        except ValueError as e:
+            st.caption(f"BACKTEST SKIPPED: {e}")
+            bt = None
+        if bt is not None:
+            b1, b2, b3 = st.columns(3)
+            b1.metric("EXCEEDANCES", f"{bt['x']} / {bt['n']}", f"expected {bt['expected']:.1f}", delta_color="off")
+            b2.metric("KUPIEC LR", f"{bt['lr']:.2f}", f"p = {bt['p_value']:.3f}", delta_color="off")
+            b3.metric("MODEL VERDICT", "REJECT" if bt["p_value"] < 0.05 else "ACCEPT",
+                      "exceedance rate inconsistent" if bt["p_value"] < 0.05 else "coverage consistent", delta_color="off")
+            days_idx = rets.index[-bt["n"]:]
+            fig = go.Figure()
+            fig.add_trace(charts.line(days_idx, bt["realized"] * 100, name="DAILY RETURN %", line=dict(color="#888", width=1)))
+            fig.add_trace(charts.line(days_idx, -bt["forecasts"] * 100, name=f"-VaR {bt_level:.0%} (ROLLING {risk.WINDOW}D)",
+                                      line=dict(color="#ff4b4b", width=2)))
+            hits = bt["exceed"]
+            fig.add_trace(go.Scatter(x=days_idx[hits], y=bt["realized"][hits] * 100, mode="markers", name="EXCEEDANCE",
+                                     marker=dict(color="#ffae00", size=8, symbol="x")))
+            fig.update_layout(template="plotly_dark", height=320, margin=dict(l=0, r=0, t=10, b=0),
+                              legend=dict(orientation="h", yanchor="bottom", y=1.02))
+            st.plotly_chart(fig, use_container_width=True)
+
+        if len(rets.columns) > 1:
+            comp = pd.Series(risk.component_var(rets.to_numpy(), w, 0.95) * exposure, index=rets.columns, name="COMPONENT VaR95 1D ($)")
+            st.markdown("**TOP RISK CONTRIBUTORS (parametric component VaR, sums to portfolio VaR)**")
+            st.dataframe(comp.sort_values(ascending=False).head(10).round(0).to_frame(), use_container_width=True)
+
+st.markdown("---")
+
 # The AI Bento Card
 with st.spinner("INITIATING_DEEP_AI_SCAN..."):
     audit_finding = run_ai_audit(ticker, info)
@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
-import asyncio
-import json
 import yfinance as yf
-from twikit import Client
+from core import messages
 from streamlit_autorefresh import st_autorefresh
 
 # ---------------- CONFIG ----------------
@@ -86,28 +84,16 @@ style="width:100%; height:500px;" frameborder="0"></iframe>
 """, unsafe_allow_html=True)
 
 # ---------------- X / TWITTER INTEL ----------------
-async def get_shadow_tweets(ticker):
-    client = Client("en-US")
-    with open("cookies.json","r") as f:
-        raw = json.load(f)
-    cookies = {c["name"]: c["value"] for c in raw}
-    client.set_cookies(cookies)
-    tweets = await client.search_tweet(
-        f"${ticker} filter:verified",
-        "Latest",
-        count=8
-    )
-    return tweets
-
+# Read from the local message store; it polls X for ids newer than the last one seen
 st.markdown('<div class="section"><div class="title">𝕏 INTEL FEED</div>', unsafe_allow_html=True)
 
 try:
-    tweets = asyncio.run(get_shadow_tweets(ticker))
+    tweets = messages.feed(ticker, limit=25, sources=("X",))
     for t in tweets:
         st.markdown(f"""
         <div style="border-bottom:1px solid #1f2933; padding:8px 0;">
-        <b>{t.user.name}</b> @{t.user.screen_name}<br>
-        {t.text}
+        <b>{t['user']['name']}</b> @{t['user']['screen_name']}<br>
+        {t['text']}
         </div>
         """, unsafe_allow_html=True)
 except Exception as e:
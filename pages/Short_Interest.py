@@ -1,5 +1,5 @@
 import streamlit as st
-import yfinance as yf
+from core.fundamentals import get_info
 
 # 1. STYLE CONFIG
 st.set_page_config(layout="wide", page_title="SHORT_SURVEILLANCE_2026")
@@ -16,8 +16,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-stock = yf.Ticker(ticker)
-info = stock.info
+info = get_info(ticker, ("short", "estimates", "financials"))
 
 st.markdown(f"<h1 style='color:#ff4b4b; font-family:monospace;'>// SHORT_SURVEILLANCE: {ticker}</h1>", unsafe_allow_html=True)
 
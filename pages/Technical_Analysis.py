@@ -1,8 +1,5 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import pandas_ta as ta
-import plotly.graph_objects as go
+from core import bars, charts, indicators, screener, universe
 from plotly.subplots import make_subplots
 
 # 1. SETUP & STYLE
@@ -20,21 +17,85 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-stock = yf.Ticker(ticker)
+
+with st.sidebar:
+    ta_mode = st.radio("MODE", ["SINGLE TICKER", "SCREENER"], horizontal=True)
+
+# 1b. SCREENER MODE (one matrix pass over cached bars for the whole universe)
+if ta_mode == "SCREENER":
+    st.markdown("<h1 style='color:#00ff41; font-family:monospace;'>// TECH_SCREENER</h1>", unsafe_allow_html=True)
+    with st.sidebar:
+        use_sp500 = st.checkbox("FULL S&P 500", value=True)
+        watch_raw = st.text_area("WATCHLIST", "NVDA, TSLA, AMD, META, AMZN, MSFT, GOOGL, AAPL, NFLX, PLTR, COIN, AVGO, COST", disabled=use_sp500)
+    symbols = universe.sp500() if use_sp500 else [s.strip().upper() for s in watch_raw.replace("\n", ",").split(",") if s.strip()]
+
+    s1, s2, s3 = st.columns([2, 3, 1])
+    preset = s1.selectbox("PRESET", list(screener.PRESETS))
+    condition = s2.text_input("CONDITION", screener.PRESETS[preset], key=f"cond_{preset}")
+    rank_by = s3.selectbox("RANK BY", screener.COLUMNS, index=screener.COLUMNS.index("RSI"))
+    st.caption("FIELDS: " + " · ".join(screener.FIELDS))
+
+    if st.button(f"WARM BAR CACHE ({len(symbols)} NAMES)"):
+        with st.spinner("TOPPING UP BAR STORE..."):
+            screener.warm(symbols)
+
+    try:
+        hits = screener.screen(condition, symbols, rank_by=rank_by, ascending=rank_by in ("RSI", "CHG"))
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    st.markdown(f"**{len(hits)} HITS** // `{condition}`")
+    if hits.attrs.get("excluded"):
+        st.caption(f"{hits.attrs['excluded']} NAMES NOT SCREENED (no cached bars, or behind the latest session): warm the cache")
+    if hits.empty:
+        st.info("NO MATCHES IN CACHED BARS (warm the bar cache if this universe is new)")
+    else:
+        st.dataframe(
+            hits,
+            column_config={
+                "CHG": st.column_config.NumberColumn("CHG%", format="%+.2f%%"),
+                "RSI": st.column_config.ProgressColumn(format="%.1f", min_value=0, max_value=100),
+                "BB_WIDTH": st.column_config.NumberColumn(format="%.1f%%"),
+            },
+            use_container_width=True, height=600,
+        )
+    st.stop()
 
 st.markdown(f"<h1 style='color:#00ff41; font-family:monospace;'>// TECH_ANALYSIS: {ticker}</h1>", unsafe_allow_html=True)
 
+# Zooming in re-fetches at a finer interval; the chart layer decimates whatever comes back.
+# Box-select a range on the chart to zoom into it (plotly's own zoom never reaches Python).
+period, interval = charts.window_picker("ta_window")
+chart_key = f"ta_chart_{st.session_state.ta_window}_{st.session_state.get('ta_zoom_reset', 0)}"
+zoom = charts.zoom_range(chart_key)
+if zoom:
+    period, interval = charts.zoom_window(*zoom)
+    z1, z2 = st.columns([5, 1])
+    z1.caption(f"ZOOM // {zoom[0]:%Y-%m-%d %H:%M} → {zoom[1]:%Y-%m-%d %H:%M} @ {interval} BARS")
+    if z2.button("RESET ZOOM"):
+        st.session_state.ta_zoom_reset = st.session_state.get("ta_zoom_reset", 0) + 1
+        st.rerun()
+
 # 2. DATA ACQUISITION & QUANT CALCS
 with st.spinner("CALCULATING_MOMENTUM_SIGNALS..."):
-    # Fetch 1 year of data for context
-    df = stock.history(period="1y")
-    
-    # Calculate RSI (14-period standard)
-    df['RSI'] = ta.rsi(df['Close'], length=14)
+    # Visible window from the local bar store (incremental top-up only)
+    if zoom:
+        bars.store.backfill(ticker, interval, period)     # the zoomed range may predate the stored bootstrap
+    df = bars.history(ticker, interval=interval, period=period)
     
-    # Calculate MACD
-    macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-    df = pd.concat([df, macd], axis=1)
+    # Wilder RSI(14) + MACD(12,26,9) from the streaming indicator state
+    # (only bars newer than the last checkpoint are folded in)
+    ind = indicators.frame(ticker, interval, period=period, refresh=False)
+    df['RSI'] = ind['RSI']
+    df['MACD_12_26_9'] = ind['MACD']
+    df['MACDs_12_26_9'] = ind['MACD_SIGNAL']
+    df['MACDh_12_26_9'] = ind['MACD_HIST']
+    if zoom:
+        lo, hi = (t.tz_localize(df.index.tz) if t.tzinfo is None else t.tz_convert(df.index.tz) for t in zoom)
+        df = df[(df.index >= lo) & (df.index <= hi)]
+if df.empty:
+    st.warning("NO BARS IN THIS RANGE: reset the zoom or pick another window")
+    st.stop()
 
 # 3. MAJESTIC MULTI-PANE CHART
 # Row 1: Price | Row 2: MACD | Row 3: RSI
@@ -43,21 +104,21 @@ fig = make_subplots(rows=3, cols=1, shared_xaxes=True,
                     row_heights=[0.5, 0.25, 0.25])
 
 # Pane 1: Candlesticks
-fig.add_trace(go.Candlestick(x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name='Price'), row=1, col=1)
+fig.add_trace(charts.candles(df, name='Price'), row=1, col=1)
 
 # Pane 2: MACD
-fig.add_trace(go.Bar(x=df.index, y=df['MACDh_12_26_9'], name='Histogram', marker_color='grey', opacity=0.5), row=2, col=1)
-fig.add_trace(go.Scatter(x=df.index, y=df['MACD_12_26_9'], name='MACD', line=dict(color='#00f0ff', width=2)), row=2, col=1)
-fig.add_trace(go.Scatter(x=df.index, y=df['MACDs_12_26_9'], name='Signal', line=dict(color='#ff4b4b', width=2)), row=2, col=1)
+fig.add_trace(charts.bars(df.index, df['MACDh_12_26_9'], name='Histogram', marker_color='grey', opacity=0.5), row=2, col=1)
+fig.add_trace(charts.line(df.index, df['MACD_12_26_9'], name='MACD', line=dict(color='#00f0ff', width=2)), row=2, col=1)
+fig.add_trace(charts.line(df.index, df['MACDs_12_26_9'], name='Signal', line=dict(color='#ff4b4b', width=2)), row=2, col=1)
 
 # Pane 3: RSI
-fig.add_trace(go.Scatter(x=df.index, y=df['RSI'], name='RSI', line=dict(color='#00ff41', width=2)), row=3, col=1)
+fig.add_trace(charts.line(df.index, df['RSI'], name='RSI', line=dict(color='#00ff41', width=2)), row=3, col=1)
 fig.add_hline(y=70, line_dash="dot", line_color="red", annotation_text="OVERBOUGHT", row=3, col=1)
 fig.add_hline(y=30, line_dash="dot", line_color="green", annotation_text="OVERSOLD", row=3, col=1)
 
 fig.update_layout(template="plotly_dark", height=800, showlegend=False, 
-                  xaxis_rangeslider_visible=False, margin=dict(l=10,r=10,t=10,b=10))
-st.plotly_chart(fig, use_container_width=True)
+                  xaxis_rangeslider_visible=False, margin=dict(l=10,r=10,t=10,b=10), dragmode="select")
+st.plotly_chart(fig, use_container_width=True, key=chart_key, on_select="rerun", selection_mode="box")
 
 # 4. THE AI INTERPRETATION (Metric Cards)
 c1, c2, c3 = st.columns(3)
@@ -1,21 +1,14 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+import plotly.graph_objects as go
+from core import backtest, charts, quotes, screener, universe
+from core.ledger import ledger
+from core.orderbook import book
+from core.performance import performance
 import streamlit.components.v1 as components
 import json
-from datetime import datetime
-
-# 1. INITIALIZE SESSION STATE (Persistent User Data)
-if 'balance' not in st.session_state:
-    st.session_state.balance = 100000.0  # Customizable start
-if 'portfolio' not in st.session_state:
-    st.session_state.portfolio = {}  # {ticker: {qty, avg_price}}
-if 'markers' not in st.session_state:
-    st.session_state.markers = []  # Chart arrows
-if 'trade_log' not in st.session_state:
-    st.session_state.trade_log = []
-
-# 2. APP CONFIGURATION
+
+# 1. APP CONFIGURATION
 st.set_page_config(layout="wide", page_title="YN_TRADING_SIM")
 ticker = st.session_state.get('ticker', 'NVDA')
 
@@ -29,15 +22,98 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+with st.sidebar:
+    desk_mode = st.radio("MODE", ["LIVE DESK", "BACKTEST"], horizontal=True)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def run_backtest(entry, exit, symbols, days, capital, cost_bps):
+    return backtest.run(entry, exit, list(symbols), days=days, capital=capital, cost_bps=cost_bps)
+
+
+# 2b. BACKTEST MODE (cached bars replayed through the same cash / avg-cost accounting)
+if desk_mode == "BACKTEST":
+    st.title("⏪ BACKTEST DESK")
+    with st.sidebar:
+        bt_universe = st.radio("UNIVERSE", ["ACTIVE TICKER", "WATCHLIST", "FULL S&P 500"])
+        watch_raw = st.text_area("WATCHLIST", "NVDA, TSLA, AMD, META, AMZN, MSFT, GOOGL, AAPL, NFLX, AVGO, COST",
+                                 disabled=bt_universe != "WATCHLIST")
+        bt_period = st.select_slider("LOOKBACK", list(backtest.PERIODS), value="5Y")
+        bt_capital = st.number_input("Starting Capital ($)", min_value=1.0, value=100000.0, key="bt_capital")
+        bt_cost = st.number_input("COMMISSION (bps / side)", min_value=0.0, value=5.0, step=1.0)
+    if bt_universe == "ACTIVE TICKER":
+        symbols = [ticker.upper()]
+    elif bt_universe == "WATCHLIST":
+        symbols = [s.strip().upper() for s in watch_raw.replace("\n", ",").split(",") if s.strip()]
+    else:
+        symbols = universe.sp500()
+
+    r1, r2, r3 = st.columns([2, 2, 2])
+    rule = r1.selectbox("RULE", list(backtest.RULES))
+    entry_rule = r2.text_input("ENTRY", backtest.RULES[rule][0], key=f"bt_entry_{rule}")
+    exit_rule = r3.text_input("EXIT", backtest.RULES[rule][1], key=f"bt_exit_{rule}")
+    st.caption("FIELDS: " + " · ".join(screener.FIELDS) + " • signals on the close fill at the next open")
+
+    if st.button(f"WARM {bt_period} OF DAILY BARS ({len(symbols)} NAMES)"):
+        with st.spinner("BACKFILLING BAR STORE..."):
+            backtest.warm(symbols, "10y" if bt_period in ("5Y", "10Y") else "2y")
+
+    try:
+        with st.spinner("REPLAYING..."):
+            res = run_backtest(entry_rule, exit_rule, tuple(symbols), backtest.PERIODS[bt_period], bt_capital, bt_cost)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    s = res.stats
+    m = st.columns(6)
+    m[0].metric("FINAL EQUITY", f"${res.equity['STRATEGY'].iloc[-1]:,.0f}", f"{s['TOTAL_RETURN']:+.1%}")
+    m[1].metric("CAGR", f"{s['CAGR']:+.1%}")
+    m[2].metric("SHARPE", f"{s['SHARPE']:.2f}", f"SORTINO {s['SORTINO']:.2f}", delta_color="off")
+    m[3].metric("MAX DRAWDOWN", f"{s['MAX_DD']:.1%}")
+    m[4].metric("TRADES", f"{s['TRADES']:,}", f"WIN {s['WIN_RATE']:.0%}", delta_color="off")
+    m[5].metric("EXPOSURE", f"{s['EXPOSURE']:.0%}", f"PF {s['PROFIT_FACTOR']:.2f}", delta_color="off")
+
+    fig = go.Figure([
+        charts.line(res.equity.index, res.equity["STRATEGY"], name="STRATEGY", line=dict(color="#0088ff", width=2)),
+        charts.line(res.equity.index, res.equity["BUY_HOLD"], name="BUY & HOLD", line=dict(color="#888888", dash="dot")),
+    ])
+    fig.update_layout(template="plotly_dark", height=450, margin=dict(l=0, r=0, t=30, b=0),
+                      title=f"EQUITY // {len(res.symbols)} SLEEVES, {bt_period}")
+    st.plotly_chart(fig, use_container_width=True)
+    if s["DAYS"] < backtest.PERIODS[bt_period]:
+        st.caption(f"ONLY {s['YEARS']:.1f} YEARS ({s['DAYS']:,} BARS) CACHED: stats cover that span; "
+                   f"warm {bt_period} of daily bars to replay the full lookback")
+    if len(res.symbols) < len(symbols):
+        st.caption(f"{len(symbols) - len(res.symbols)} NAMES SKIPPED (no cached bars, or stale): warm the cache")
+
+    t1, t2 = st.tabs(["ROUND TRIPS", "FILLS"])
+    t1.dataframe(res.trades.sort_values("ENTRY", ascending=False),
+                 column_config={"RETURN": st.column_config.NumberColumn(format="percent")},
+                 use_container_width=True, height=400)
+    t2.dataframe(res.fills.sort_values("DATE", ascending=False), use_container_width=True, height=400)
+    st.stop()
+
+# 2. ACCOUNT STATE (materialized from the durable trade ledger, so it survives reloads)
+account = st.session_state.get('account', 'default')
+# One batched quote snapshot (active ticker, open positions, symbols with resting orders).
+# Resting orders are matched inside it, so the account is read after their fills.
+held = [t for t, d in ledger.state(account)['positions'].items() if d['qty'] > 0]
+quotes_now = quotes.snapshot([ticker] + held + book.symbols())
+curr_price = quotes_now.get(ticker.upper(), 0.0)
+acct = ledger.state(account)
+st.session_state.balance = acct['cash']
+st.session_state.portfolio = acct['positions']  # {ticker: {qty, avg_price}}
+st.session_state.markers = ledger.markers(account)  # Chart arrows
+
 # 3. SIDEBAR: CUSTOM SETTINGS
 with st.sidebar:
     st.header("⚙️ SETTINGS")
+    st.text_input("ACCOUNT", value=account, key="account")
     # Custom starting balance
-    cust_bal = st.number_input("Starting Capital ($)", min_value=1.0, value=st.session_state.balance)
+    cust_bal = st.number_input("Starting Capital ($)", min_value=1.0, value=acct['start'])
     if st.button("RESET ACCOUNT"):
-        st.session_state.balance = cust_bal
-        st.session_state.portfolio = {}
-        st.session_state.markers = []
+        ledger.reset(account, cust_bal)
         st.rerun()
     
     # Persistent Trade Quantity
@@ -75,12 +151,6 @@ components.html(f"""
 # 5. EXECUTION & P&L TRACKING
 col_info, col_buy, col_sell = st.columns([1, 1, 1])
 
-try:
-    # Use fast_info to avoid rate limits
-    curr_price = yf.Ticker(ticker).fast_info['last_price']
-except:
-    curr_price = 0.0
-
 with col_info:
     st.metric("MARKET PRICE", f"${curr_price:.2f}")
 
@@ -88,58 +158,91 @@ with col_info:
 with col_buy:
     st.markdown('<div class="buy-btn">', unsafe_allow_html=True)
     if st.button(f"BUY {st.session_state.preset_qty} {ticker}"):
-        cost = curr_price * st.session_state.preset_qty
-        if st.session_state.balance >= cost:
-            st.session_state.balance -= cost
-            # Update Portfolio
-            pos = st.session_state.portfolio.get(ticker, {'qty': 0, 'avg_price': 0})
-            new_qty = pos['qty'] + st.session_state.preset_qty
-            new_avg = ((pos['avg_price'] * pos['qty']) + cost) / new_qty
-            st.session_state.portfolio[ticker] = {'qty': new_qty, 'avg_price': new_avg}
-            
-            # Add Blue Arrow Marker
-            st.session_state.markers.append({
-                "time": datetime.now().strftime('%Y-%m-%d'),
-                "position": "belowBar", "color": "#0088ff", "shape": "arrowUp", "text": "BUY"
-            })
+        # Appended to the ledger; cash, position and the blue arrow all derive from it
+        try:
+            ledger.buy(account, ticker, st.session_state.preset_qty, curr_price)
             st.rerun()
+        except ValueError as e:
+            st.warning(f"ORDER REJECTED: {e}")
     st.markdown('</div>', unsafe_allow_html=True)
 
 # SELL LOGIC
 with col_sell:
     st.markdown('<div class="sell-btn">', unsafe_allow_html=True)
     if st.button(f"SELL {st.session_state.preset_qty} {ticker}"):
-        pos = st.session_state.portfolio.get(ticker, {'qty': 0})
-        if pos['qty'] >= st.session_state.preset_qty:
-            st.session_state.balance += (curr_price * st.session_state.preset_qty)
-            st.session_state.portfolio[ticker]['qty'] -= st.session_state.preset_qty
-            
-            # Add Red Arrow Marker
-            st.session_state.markers.append({
-                "time": datetime.now().strftime('%Y-%m-%d'),
-                "position": "aboveBar", "color": "#ff4b4b", "shape": "arrowDown", "text": "SELL"
-            })
+        try:
+            ledger.sell(account, ticker, st.session_state.preset_qty, curr_price)
             st.rerun()
+        except ValueError as e:
+            st.warning(f"ORDER REJECTED: {e}")
     st.markdown('</div>', unsafe_allow_html=True)
 
-# 6. P&L PERFORMANCE DASHBOARD
+# 5b. RESTING ORDERS (limit / stop / bracket, matched on every fresh quote)
+with st.expander("📋 ORDER TICKET // LIMIT • STOP • BRACKET", expanded=bool(book.open_orders(account))):
+    o1, o2, o3, o4, o5 = st.columns(5)
+    o_type = o1.selectbox("TYPE", ["LIMIT", "STOP", "BRACKET"])
+    o_side = o2.selectbox("SIDE", ["BUY", "SELL"], disabled=o_type == "BRACKET")
+    ref = curr_price or 1.0
+    o_price = o3.number_input("ENTRY / TRIGGER", min_value=0.01, value=round(ref, 2), key=f"o_px_{ticker}")
+    o_tp = o4.number_input("TAKE PROFIT", min_value=0.01, value=round(ref * 1.05, 2), disabled=o_type != "BRACKET", key=f"o_tp_{ticker}")
+    o_sl = o5.number_input("STOP LOSS", min_value=0.01, value=round(ref * 0.95, 2), disabled=o_type != "BRACKET", key=f"o_sl_{ticker}")
+    if st.button(f"PLACE {o_type} {st.session_state.preset_qty} {ticker}"):
+        try:
+            if o_type == "BRACKET":
+                book.bracket(account, ticker, st.session_state.preset_qty, o_price, o_tp, o_sl)
+            else:
+                book.place(account, ticker, o_side, o_type, st.session_state.preset_qty, o_price)
+            st.rerun()
+        except ValueError as e:
+            st.warning(f"ORDER REJECTED: {e}")
+
+    live_orders = book.open_orders(account)
+    if live_orders:
+        st.dataframe(pd.DataFrame([o.row() for o in live_orders]).set_index("ID"), use_container_width=True)
+        c1, c2 = st.columns([3, 1])
+        to_cancel = c1.selectbox("CANCEL ORDER", [o.id for o in live_orders],
+                                 format_func=lambda i: f"#{i} " + next(f"{o.side} {o.kind} {o.symbol} @ {o.price:.2f}" for o in live_orders if o.id == i))
+        if c2.button("CANCEL"):
+            book.cancel(to_cancel)
+            st.rerun()
+    done = book.recent(account, 20)
+    if done:
+        st.caption("RECENT ORDER EVENTS")
+        st.dataframe(pd.DataFrame([o.row() for o in done]).set_index("ID"), use_container_width=True)
+
+# 6. P&L PERFORMANCE DASHBOARD (running analytics, updated per fill and per mark)
 st.markdown("---")
 st.subheader("💼 PERFORMANCE_AUDIT")
 
-if st.session_state.portfolio:
-    total_unrealized = 0
-    p_data = []
-    for t, d in st.session_state.portfolio.items():
-        if d['qty'] > 0:
-            c_p = yf.Ticker(t).fast_info['last_price']
-            pnl = (c_p - d['avg_price']) * d['qty']
-            total_unrealized += pnl
-            p_data.append({
-                "Ticker": t, "Qty": d['qty'], "Avg Cost": f"${d['avg_price']:.2f}",
-                "Market Value": f"${(c_p * d['qty']):,.2f}", "P&L": f"${pnl:,.2f}"
-            })
-    
-    st.table(pd.DataFrame(p_data))
-    st.metric("TOTAL UNREALIZED P&L", f"${total_unrealized:,.2f}", delta=f"{total_unrealized:,.2f}")
-else:
+perf = performance.summary(account, quotes_now)
+k = st.columns(4)
+k[0].metric("ACCOUNT EQUITY", f"${perf['EQUITY']:,.2f}", f"{perf['RETURN']:+.2%}")
+k[1].metric("TOTAL UNREALIZED P&L", f"${perf['UNREALIZED']:,.2f}", delta=f"{perf['UNREALIZED']:,.2f}")
+k[2].metric("REALIZED P&L", f"${perf['REALIZED']:,.2f}", delta=f"{perf['REALIZED']:,.2f}")
+k[3].metric("MAX DRAWDOWN", f"{perf['MAX_DD']:.2%}")
+k = st.columns(4)
+k[0].metric("TWR (INVESTED)", f"{perf['TWR']:+.2%}")
+k[1].metric("MWR (MOD. DIETZ)", f"{perf['MWR']:+.2%}")
+k[2].metric("SHARPE", f"{perf['SHARPE']:.2f}", f"{perf['DAYS']} DAILY RETURNS", delta_color="off")
+k[3].metric("SORTINO", f"{perf['SORTINO']:.2f}")
+
+attribution = pd.DataFrame(performance.attribution(account))
+if attribution.empty:
     st.info("No open positions. Use the Execution Desk to begin.")
+else:
+    st.dataframe(
+        attribution.set_index("SYMBOL"),
+        column_config={
+            "AVG_PRICE": st.column_config.NumberColumn(format="$%.2f"),
+            "MARK": st.column_config.NumberColumn(format="$%.2f"),
+            "MARKET_VALUE": st.column_config.NumberColumn(format="$%,.2f"),
+            "REALIZED": st.column_config.NumberColumn(format="$%,.2f"),
+            "UNREALIZED": st.column_config.NumberColumn(format="$%,.2f"),
+            "TOTAL": st.column_config.NumberColumn(format="$%,.2f"),
+            "CONTRIB": st.column_config.NumberColumn(format="percent"),
+        },
+        use_container_width=True,
+    )
+    unquoted = [t for t in held if t.upper() not in quotes_now]
+    st.caption(f"MARKED FROM ONE BATCHED QUOTE SNAPSHOT (≤{quotes.MAX_AGE:.0f}s OLD)"
+               + (f" • NO QUOTE, MARKED AT LAST FILL: {', '.join(unquoted)}" if unquoted else ""))
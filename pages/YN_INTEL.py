@@ -1,5 +1,5 @@
 import streamlit as st
-import yfinance as yf
+from core.fundamentals import get_info
 import pandas as pd
 import google.generativeai as genai
 
@@ -17,7 +17,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 ticker = st.session_state.get('ticker', 'NVDA')
-stock = yf.Ticker(ticker)
 
 st.markdown(f"<h1 style='color:#fffd00; font-family:monospace;'>// SOVEREIGN_INTELLIGENCE: {ticker}</h1>", unsafe_allow_html=True)
 
@@ -38,7 +37,7 @@ def calculate_geo_risk(ticker, info):
 
 # 3. DASHBOARD RENDER
 with st.spinner("AUDITING_GLOBAL_STRESS_POINTS..."):
-    risk_score = calculate_geo_risk(ticker, stock.info)
+    risk_score = calculate_geo_risk(ticker, get_info(ticker, ("profile", "financials")))
     
 c1, c2 = st.columns([1, 2])
 
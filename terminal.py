@@ -1,15 +1,9 @@
 import streamlit as st
-import pandas as pd
-import asyncio
-import json
-import yfinance as yf
-from twikit import Client
 from streamlit_autorefresh import st_autorefresh
-import os
 import streamlit.components.v1 as components
-import requests
 import random
 from datetime import datetime
+from core import fundamentals, market, messages, render
 
 # ---------------- CONFIG ----------------
 st.set_page_config(
@@ -187,35 +181,53 @@ with st.sidebar:
     st.markdown("### // TARGET SELECTOR")
     ticker = st.text_input("SYMBOL", "NVDA").upper()
     st.caption("J.A.R.V.I.S. PROTOCOL ENGAGED")
+    info_stats = fundamentals.stats()
+    st.caption(f"INFO CACHE // {info_stats['hit_rate']:.0%} HIT · {info_stats['misses']} MISS · {info_stats['stale_served']} STALE-SERVED")
 
-# ---------------- DATA ENGINE ----------------
-@st.cache_data(ttl=60)
-def fetch_global_scan():
-    symbols = {
-        "ES_FUT": "ES=F", "NQ_FUT": "NQ=F", "10Y_YIELD": "^TNX", 
-        "VIX": "^VIX", "DXY": "DX-Y.NYB", "OIL": "CL=F", 
-        "GOLD": "GC=F", "EURO": "EURUSD=X", "BTC": "BTC-USD", "ETH": "ETH-USD"
-    }
-    data = {}
-    try:
-        tickers_list = list(symbols.values())
-        df = yf.download(tickers_list, period="5d", interval="1d", progress=False)
-        closes = df['Close'] if isinstance(df.columns, pd.MultiIndex) else df
-        
-        for k, v in symbols.items():
-            if v in closes.columns:
-                series = closes[v].dropna()
-                curr = series.iloc[-1]
-                prev = series.iloc[-2]
-                chg = ((curr - prev) / prev) * 100
-                fmt = f"{curr:,.0f}" if "BTC" in k or "ETH" in k else f"{curr:,.2f}"
-                data[k] = {"price": fmt, "chg": chg}
-            else: data[k] = {"price": "N/A", "chg": 0.0}
-    except:
-        data = {k: {"price": "OFFLINE", "chg": 0.0} for k in symbols}
-    return data
+# ---------------- PANEL TEMPLATES ----------------
+# Row-heavy panels are rendered into one payload each (core.render); fields are escaped.
+RANK_PANEL = render.Template("""
+<div class="section">
+<div class="title-glitch"><span>S&P 500 MOMENTUM</span><span style="font-size:12px; color:#555;">SNAPSHOT {age}</span></div>
+{rows}
+</div>
+""")
+RANK_ROW = render.Template("""
+<div class="rank-row">
+<div style="font-family:'Orbitron'; color:#555; width:30px; font-size:10px;">{pos:02d}</div>
+<div style="font-family:'Rajdhani'; font-weight:bold; color:#fff; width:60px; font-size:16px;">{sym}</div>
+<div class="rank-bar-bg"><div class="rank-bar-fill" style="width:{bar_w}%; background:{fill}; color:{fill};"></div></div>
+<div style="width:70px; text-align:right; font-family:'Rajdhani'; font-weight:bold; color:{fill};">{chg:+.2f}%</div>
+</div>
+""")
+FEED_PANEL = render.Template("""
+<div class="section">
+<div class="title-glitch">INTEL STREAM</div>
+{cards}
+</div>
+""")
+TWEET_CARD = render.Template("""
+<div class="tweet-card">
+<div class="tweet-header">
+<div class="avatar">{avatar}</div>
+<div style="margin-left:5px;">
+<div class="name-row">
+<div class="name">{name}</div>
+<div class="verified">☑</div>
+</div>
+<div class="handle">@{handle}</div>
+</div>
+</div>
+<div class="tweet-text">{text}</div>
+</div>
+""")
+AVATAR_IMG = render.Template('<img src="{src}">')
 
-scan_data = fetch_global_scan()
+# ---------------- DATA ENGINE ----------------
+# HUD + momentum datasets are refreshed by a background thread (core.market);
+# the render path only reads the latest snapshot.
+scan_snap = market.global_scan()
+scan_data = scan_snap.value or {k: {"price": "OFFLINE", "chg": 0.0} for k in market.GLOBAL_SYMBOLS}
 
 # ---------------- HUD GRID ----------------
 keys = list(scan_data.keys())
@@ -233,6 +245,10 @@ for col, k in zip([c1,c2,c3,c4,c5,c6,c7,c8,c9,c10], keys):
     </div>
     """, unsafe_allow_html=True)
 
+hud_age = "NEVER FETCHED" if scan_snap.age is None else f"{scan_snap.age:.0f}s OLD"
+st.caption(f"HUD SNAPSHOT // {hud_age}"
+           + (f" · LAST ERROR {scan_snap.error_age:.0f}s AGO: {scan_snap.error}" if scan_snap.error else ""))
+
 # ---------------- MAIN DASHBOARD ----------------
 col_main, col_side = st.columns([2, 1])
 
@@ -266,129 +282,41 @@ with col_main:
     components.html(html_chart, height=560)
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # RANKER
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown('<div class="title-glitch">S&P 500 MOMENTUM</div>', unsafe_allow_html=True)
-    
-    @st.cache_data(ttl=300)
-    def get_alpha_ranks():
-        targets = ["NVDA", "TSLA", "AMD", "META", "AMZN", "MSFT", "GOOGL", "AAPL", "NFLX", "PLTR", "COIN", "MSTR", "SMCI", "AVGO", "COST"]
-        data = yf.download(targets, period="5d", interval="1d", progress=False)['Close']
-        if isinstance(data.columns, pd.MultiIndex): data.columns = data.columns.get_level_values(1)
-        
-        ranks = []
-        for t in targets:
-            try:
-                chg = ((data[t].iloc[-1] - data[t].iloc[-2])/data[t].iloc[-2])*100
-                vol = data[t].pct_change().std() * 100
-                ranks.append({"sym": t, "chg": chg, "vol": vol, "score": abs(chg)*vol})
-            except: continue
-        return sorted(ranks, key=lambda x: x['score'], reverse=True)
-
-    ranks = get_alpha_ranks()
-    
+    # RANKER (one payload for the whole panel)
+    ranks_snap = market.alpha_ranks()
+    ranks = ranks_snap.value or ()
+    rank_rows = []
     for i, r in enumerate(ranks[:10]):
-        bar_w = min(abs(r['chg']) * 20, 100)
-        fill_color = "#00ff41" if r['chg'] > 0 else "#ff3b3b"
-        st.markdown(f"""
-        <div class="rank-row">
-            <div style="font-family:'Orbitron'; color:#555; width:30px; font-size:10px;">0{i+1}</div>
-            <div style="font-family:'Rajdhani'; font-weight:bold; color:#fff; width:60px; font-size:16px;">{r['sym']}</div>
-            <div class="rank-bar-bg"><div class="rank-bar-fill" style="width:{bar_w}%; background:{fill_color}; color:{fill_color};"></div></div>
-            <div style="width:70px; text-align:right; font-family:'Rajdhani'; font-weight:bold; color:{fill_color};">{r['chg']:+.2f}%</div>
-        </div>
-        """, unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+        rank_rows.append({
+            "pos": i + 1, "sym": r['sym'], "chg": r['chg'],
+            "bar_w": min(abs(r['chg']) * 20, 100),
+            "fill": "#00ff41" if r['chg'] > 0 else "#ff3b3b",
+        })
+    rank_age = "NEVER FETCHED" if ranks_snap.age is None else f"{ranks_snap.age:.0f}s OLD"
+    if ranks_snap.error:
+        rank_age += f" · ERROR {ranks_snap.error_age:.0f}s AGO"
+    render.emit(RANK_PANEL.render(age=rank_age, rows=RANK_ROW.render_rows(rank_rows)))
 
 # --- RIGHT: INTEL FEED ---
 with col_side:
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown('<div class="title-glitch">INTEL STREAM</div>', unsafe_allow_html=True)
-    
-    # FETCH LOGIC (TRIPLE REDUNDANCY)
-    def fetch_yahoo_news(symbol):
-        try:
-            news = yf.Ticker(symbol).news
-            tweets = []
-            handles = ["@MarketWire", "@Bloomberg", "@Reuters", "@CNBC", "@WSJ"]
-            for i, n in enumerate(news[:10]):
-                tweets.append({
-                    "user": {"name": handles[i%5], "screen_name": handles[i%5].replace("@","")},
-                    "text": n['title'],
-                    "source": "News Wire"
-                })
-            return tweets
-        except: return []
-
-    def fetch_stocktwits(symbol):
-        url = f"https://api.stocktwits.com/api/2/streams/symbol/{symbol}.json"
-        try:
-            r = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if r.status_code == 200:
-                data = r.json()
-                tweets = []
-                for msg in data['messages'][:10]:
-                    tweets.append({
-                        "user": {"name": msg['user']['username'], "screen_name": msg['user']['username'], "profile_image_url_https": msg['user']['avatar_url']},
-                        "text": msg['body'],
-                        "source": "Stocktwits"
-                    })
-                return tweets
-            return []
-        except: return []
-
-    async def get_feed():
-        try:
-            if os.path.exists("cookies.json"):
-                client = Client("en-US")
-                with open("cookies.json", "r") as f:
-                    raw = json.load(f)
-                cookies = {c["name"]: c["value"] for c in raw} if isinstance(raw, list) else raw
-                client.set_cookies(cookies)
-                return await client.search_tweet(f"${ticker} filter:verified", "Latest", count=10)
-        except: pass
-        
-        st_data = fetch_stocktwits(ticker)
-        if st_data: return st_data
-        
-        return fetch_yahoo_news(ticker)
-
-    # EXECUTE
+    # FETCH LOGIC (TRIPLE REDUNDANCY, INCREMENTAL)
+    # core.messages polls X / Stocktwits / Yahoo news for messages newer than the
+    # last seen id (hedged on core.feeds' background loop) and we render from the store.
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        feed_data = loop.run_until_complete(get_feed())
-        
-        for item in feed_data:
-            if isinstance(item, dict):
-                name = item['user']['name']
-                handle = item['user']['screen_name']
-                text = item['text']
-                img = item['user'].get('profile_image_url_https', '')
-            else:
-                name = item.user.name
-                handle = item.user.screen_name
-                text = item.text
-                img = ""
+        feed_data = messages.feed(ticker, limit=20)
 
-            avatar_html = f'<img src="{img}">' if img else f'{name[0]}'
+        cards = []
+        for item in feed_data:
+            name = item['user']['name'] or "?"
+            img = item['user'].get('profile_image_url_https', '')
+            cards.append({
+                "avatar": AVATAR_IMG.render(src=img) if img else name[0],
+                "name": name,
+                "handle": item['user']['screen_name'],
+                "text": item['text'],
+            })
+        render.emit(FEED_PANEL.render(cards=TWEET_CARD.render_rows(cards)))
 
-            st.markdown(f"""
-            <div class="tweet-card">
-                <div class="tweet-header">
-                    <div class="avatar">{avatar_html}</div>
-                    <div style="margin-left:5px;">
-                        <div class="name-row">
-                            <div class="name">{name}</div>
-                            <div class="verified">☑</div>
-                        </div>
-                        <div class="handle">@{handle}</div>
-                    </div>
-                </div>
-                <div class="tweet-text">{text}</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
     except Exception as e:
         st.error(f"FEED SYSTEM ERROR: {e}")
 
@@ -410,7 +338,6 @@ with col_side:
         """,
         height=320,
     )
-    st.markdown('</div>', unsafe_allow_html=True)
 
 # ---------------- BOTTOM AD ----------------
 components.html(